@@ -1,9 +1,8 @@
-import json
+import logging
 import os
-import requests
+import orjson
 import time
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List
 import sys
 import os
 import re
@@ -11,97 +10,52 @@ import re
 # Add the parent directory to the path so we can import config
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import config
+from semantic_cache import SemanticCache
+from parser_common import (
+    GROQ_API_URL, LazySession, LRUMemo, is_quota_error, retry_after, write_cache_file
+)
 
-def determine_job_level(job_title: str, experience_required: str) -> str:
-    """
-    Determine job level based on job title and experience requirements
-    
-    Args:
-        job_title: The job title
-        experience_required: The experience requirements text
-        
-    Returns:
-        Job level as a string
-    """
-    # Combine title and experience for analysis
-    combined_text = f"{job_title} {experience_required}".lower()
-    
-    # Check for internship keywords
-    internship_keywords = ["internship", "intern", "entry level", "internship program"]
-    for keyword in internship_keywords:
-        if keyword in combined_text:
-            return "Internship"
-    
-    # Check for associate keywords
-    associate_keywords = ["associate", "assistant", "trainee"]
-    for keyword in associate_keywords:
-        if keyword in combined_text:
-            return "Associate"
-    
-    # Check for junior keywords
-    junior_keywords = ["junior", "jr", "1-2 years", "1 to 2 years", "entry", "beginner"]
-    for keyword in junior_keywords:
-        if keyword in combined_text:
-            return "Junior"
-    
-    # Check for mid-level keywords
-    mid_level_keywords = ["mid-level", "mid level", "3-5 years", "3 to 5 years", "intermediate"]
-    for keyword in mid_level_keywords:
-        if keyword in combined_text:
-            return "Junior"  # Mid-level is still considered Junior in our hierarchy
-    
-    # Check for senior keywords
-    senior_keywords = ["senior", "sr", "lead", "6+ years", "6 years", "7 years", "8 years", "9 years", "10 years"]
-    for keyword in senior_keywords:
-        if keyword in combined_text:
-            return "Senior"
-    
-    # Check for expert keywords
-    expert_keywords = ["expert", "principal", "staff", "architect", "fellow", "10+ years"]
-    for keyword in expert_keywords:
-        if keyword in combined_text:
-            return "Expert"
-    
-    # Default to junior if it's in the title
-    if "junior" in job_title.lower():
-        return "Junior"
-    
-    # Default to not specified
-    return "Not specified"
+log = logging.getLogger(__name__)
 
-def process_job_description_with_llm(job_description_text: str) -> Dict[str, Any]:
-    """
-    Process job description text with Groq's LLM to structure it into JSON format
-    
-    Args:
-        job_description_text: Plain text job description
-        
-    Returns:
-        Structured job description data as a dictionary
-    """
-    # Check cache first - create hash of input text for cache key
-    import hashlib
-    cache_key = hashlib.md5(job_description_text.encode()).hexdigest()
-    cache_dir = os.path.join("temp", "cache")
-    
-    # Only use cache if temp directory exists
-    cache_file = os.path.join(cache_dir, f"job_{cache_key}.json")
-    if os.path.exists(cache_file):
-        print("Using cached job description result...")
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    # Get API key from config file
-    try:
-        api_key = config.get_current_api_key()
-    except ValueError as e:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
-    
-    if not api_key:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
-    
-    # System message to define the task for the LLM
-    system_message = """
+# Near-duplicate job descriptions reuse an earlier structured result (opt-in, see config.JD_SEMANTIC_CACHE)
+_JD_SEMANTIC_CACHE = SemanticCache("job_requirements")
+
+# Start of the requirements / skills part of a job description (the part that decides the parsed
+# skills and level); the semantic cache embeds the title and the text from here on
+REQUIREMENTS_HEADING_RE = re.compile(
+    r'^\W*(?:requirements|skills|qualifications?|must[ -]have|what you.ll need|what we.re looking for)\b',
+    re.IGNORECASE | re.MULTILINE)
+
+# Matches a JSON object wrapped in a markdown code fence in the LLM response
+FENCED_JSON_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# Job description files larger than this are truncated when read,
+# and shorter ones are rejected as invalid input
+MAX_JD_CHARS = 1 << 20
+MIN_JD_CHARS = 32
+
+# Pooled session so repeated calls reuse the TCP/TLS connection
+REQUEST_TIMEOUT = (3, 60)  # (connect, read) seconds
+MAX_RETRIES = 5
+# Connection errors and transient 5xx responses are retried by the adapter with capped
+# exponential backoff. 429s are not: they are handled by rotating the API key.
+_SESSION = LazySession(
+    pool_connections=4, pool_maxsize=16,
+    total=MAX_RETRIES,
+    backoff_factor=1.0,
+    backoff_max=20,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# API key last used by this module. Refreshed only on rotation; if another module
+# rotated the shared key meanwhile, cycle_api_key(failed_key) hands back the new one.
+_CURRENT_API_KEY = None
+
+# System message to define the task for the LLM (built once at import)
+_SYSTEM_MESSAGE = """
     You are a job description parsing assistant. Your task is to extract and structure information from a job description into a clean, structured JSON format.
     
     Important: Do NOT add any inferences or additional content. Only extract information that is explicitly present in the job description.
@@ -152,6 +106,127 @@ def process_job_description_with_llm(job_description_text: str) -> Dict[str, Any
     9. Avoid obscure tools like Gulp, Grunt, etc. unless explicitly mentioned.
     10. Provide your response as a valid JSON object only, with no additional text.
     """
+
+# Request payload fields that are the same for every call
+_BASE_PAYLOAD = {
+    "model": config.MODEL_NAME,
+    "temperature": config.TEMPERATURE
+}
+
+# Job level keyword tiers, built once at import. Tiers are checked in order and the
+# first tier with a matching keyword wins, so the order encodes the level hierarchy.
+JOB_LEVEL_KEYWORDS = (
+    ("Internship", ("internship", "intern", "entry level", "internship program")),
+    ("Associate", ("associate", "assistant", "trainee")),
+    ("Junior", ("junior", "jr", "1-2 years", "1 to 2 years", "entry", "beginner")),
+    # Mid-level is still considered Junior in our hierarchy
+    ("Junior", ("mid-level", "mid level", "3-5 years", "3 to 5 years", "intermediate")),
+    ("Senior", ("senior", "sr", "lead", "6+ years", "6 years", "7 years", "8 years", "9 years", "10 years")),
+    ("Expert", ("expert", "principal", "staff", "architect", "fellow", "10+ years")),
+)
+
+# One precompiled alternation per tier so each tier is a single C-level scan
+JOB_LEVEL_PATTERNS = tuple(
+    (level, re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE))
+    for level, keywords in JOB_LEVEL_KEYWORDS
+)
+
+# In-process LRU memo in front of the disk cache, keyed by the raw job description text
+JD_MEMO_SIZE = 256
+_JD_MEMO = LRUMemo(JD_MEMO_SIZE)
+
+def determine_job_level(job_title: str, experience_required: str) -> str:
+    """
+    Determine job level based on job title and experience requirements
+    
+    Args:
+        job_title: The job title
+        experience_required: The experience requirements text
+        
+    Returns:
+        Job level as a string
+    """
+    # Combine title and experience for analysis (patterns are case-insensitive)
+    combined_text = f"{job_title} {experience_required}"
+    
+    # Check each keyword tier in hierarchy order
+    for level, pattern in JOB_LEVEL_PATTERNS:
+        if pattern.search(combined_text):
+            return level
+    
+    # Default to junior if it's in the title
+    if "junior" in job_title.lower():
+        return "Junior"
+    
+    # Default to not specified
+    return "Not specified"
+
+def _semantic_embedding(job_description_text: str):
+    """
+    Embed a job description for the semantic cache, or return None if it is disabled
+    
+    Only the first two non-empty lines (usually the title, which drives the level) and the text
+    from the first requirements / skills heading on are embedded, lower-cased with whitespace
+    collapsed, so postings that share a company blurb but ask for different skills don't look alike
+    """
+    if not config.JD_SEMANTIC_CACHE:
+        return None
+    text = job_description_text.strip()
+    title = "\n".join([line for line in text.splitlines() if line.strip()][:2])
+    heading = REQUIREMENTS_HEADING_RE.search(text)
+    if heading:
+        text = f"{title}\n{text[heading.start():]}"
+    return _JD_SEMANTIC_CACHE.embed(" ".join(text.lower().split()))
+
+def process_job_description_with_llm(job_description_text: str) -> Dict[str, Any]:
+    """
+    Process job description text with Groq's LLM to structure it into JSON format
+    
+    Args:
+        job_description_text: Plain text job description
+        
+    Returns:
+        Structured job description data as a dictionary
+    """
+    # Check the in-process memo first - avoids hashing, stat and JSON decoding for repeated inputs
+    job_data = _JD_MEMO.get(job_description_text)
+    if job_data is not None:
+        return job_data
+    
+    # Then the disk cache - only hash the input when the cache is enabled (temp directory exists)
+    cache_dir = os.path.join("temp", "cache")
+    cache_file = None
+    if os.path.isdir("temp"):
+        import hashlib
+        # BLAKE2b is faster than MD5 in CPython; a 16-byte digest is plenty for a cache key
+        cache_key = hashlib.blake2b(job_description_text.encode("utf-8"), digest_size=16).hexdigest()
+        # Shard by the first two hex chars so no single cache directory grows too large
+        cache_dir = os.path.join(cache_dir, cache_key[:2])
+        cache_file = os.path.join(cache_dir, f"job_{cache_key}.json")
+        if os.path.exists(cache_file):
+            log.info("Using cached job description result")
+            with open(cache_file, 'rb') as f:
+                job_data = orjson.loads(f.read())
+            _JD_MEMO.put(job_description_text, job_data)
+            return job_data
+    
+    # Then the semantic cache (opt-in) - catches job descriptions that differ only in boilerplate
+    embedding = _semantic_embedding(job_description_text)
+    job_data = _JD_SEMANTIC_CACHE.lookup(embedding)
+    if job_data is not None:
+        log.info("Using semantically similar cached job description result")
+        _JD_MEMO.put(job_description_text, job_data)
+        return job_data
+    
+    # Get API key - reuse the key this module last used, only asking config when unset
+    global _CURRENT_API_KEY
+    try:
+        api_key = _CURRENT_API_KEY or config.get_current_api_key()
+    except ValueError as e:
+        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
+    
+    if not api_key:
+        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
     
     # Prepare the request
     headers = {
@@ -159,96 +234,96 @@ def process_job_description_with_llm(job_description_text: str) -> Dict[str, Any
         "Content-Type": "application/json"
     }
     
-    # Prepare the request payload
+    # Prepare the request payload - the constant system message comes first so the
+    # prompt prefix is identical across calls
     payload = {
+        **_BASE_PAYLOAD,
         "messages": [
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": _SYSTEM_MESSAGE},
             {"role": "user", "content": job_description_text}
-        ],
-        "model": config.MODEL_NAME,
-        "temperature": config.TEMPERATURE
+        ]
     }
     
-    # Make the API request with retry logic
-    max_retries = 5
-    base_delay = 2  # base delay in seconds
+    # Deferred import - only needed when we actually call the API
+    import requests
+    session = _SESSION.get()
     
-    for attempt in range(max_retries):
+    # Make the API request. Transient failures are retried by the session's Retry policy,
+    # so this loop only rotates API keys when one is rate limited or out of quota.
+    for attempt in range(MAX_RETRIES):
+        log.debug("Processing job description (attempt %d/%d)", attempt + 1, MAX_RETRIES)
+        
         try:
-            print(f"Processing job description (attempt {attempt + 1}/{max_retries})...")
-            
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
+            response = session.post(
+                GROQ_API_URL,
                 headers=headers,
-                json=payload
+                json=payload,
+                timeout=REQUEST_TIMEOUT
             )
-            
-            # If successful, no need to retry
-            if response.status_code == 200:
-                break
-                
-            # If rate limited or quota exceeded, try next API key
-            if response.status_code == 429 or "quota" in response.text.lower():
-                print(f"API key quota exceeded. Trying next API key...")
-                api_key = config.cycle_api_key()
-                headers["Authorization"] = f"Bearer {api_key}"
-                continue
-                
-            # For other errors, raise exception
-            response.raise_for_status()
-            
         except requests.exceptions.RequestException as e:
-            # If last attempt, raise the exception
-            if attempt == max_retries - 1:
-                raise Exception(f"Error in Groq API request after {max_retries} attempts: {str(e)}")
+            raise Exception(f"Error in Groq API request after {MAX_RETRIES} retries: {str(e)}")
+        
+        # If successful, no need to retry
+        if response.status_code == 200:
+            break
             
-            # Otherwise, wait and retry
-            delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
-            print(f"Request failed. Retrying in {delay:.2f} seconds...")
-            time.sleep(delay)
+        # If rate limited or quota exceeded, try next API key
+        if is_quota_error(response):
+            log.warning("API key quota exceeded. Trying next API key")
+            api_key = _CURRENT_API_KEY = config.cycle_api_key(api_key)
+            headers["Authorization"] = f"Bearer {api_key}"
+            # Honor a server-dictated wait, if any, before trying again
+            delay = retry_after(response)
+            if delay and attempt < MAX_RETRIES - 1:
+                time.sleep(delay)
+            continue
+            
+        # Other errors are not retryable, fail fast
+        response.raise_for_status()
+    else:
+        raise Exception(f"Groq API rate limit or quota exceeded on {MAX_RETRIES} attempts across API keys")
     
     # Process the response
     try:
-        result = response.json()
+        result = orjson.loads(response.content)
         
         # Extract content from the response
-        content = result["choices"][0]["message"]["content"]
+        content = result["choices"][0]["message"]["content"].strip()
         
         # Extract JSON from the content
         try:
             # Try to parse the response as JSON directly
-            job_data = json.loads(content)
-        except json.JSONDecodeError:
+            job_data = orjson.loads(content)
+        except orjson.JSONDecodeError:
             # If direct parsing fails, try to extract JSON from markdown code blocks
-            import re
-            json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', content, re.DOTALL)
+            json_match = FENCED_JSON_RE.search(content)
             if json_match:
-                job_data = json.loads(json_match.group(1))
+                job_data = orjson.loads(json_match.group(1))
             else:
                 # If all else fails, raise an error with the content for debugging
                 raise Exception(f"Could not parse JSON from LLM response. Content: {content[:500]}...")
         
         # Add the determined job level if not already present
-        if "experience_required" not in job_data:
-            job_data["experience_required"] = {}
-        
-        if "level" not in job_data["experience_required"]:
-            level = determine_job_level(
+        experience = job_data.setdefault("experience_required", {})
+        if "level" not in experience:
+            years = experience.get("years_of_experience", "")
+            experience["level"] = determine_job_level(
                 job_data.get("job_title", ""), 
-                str(job_data.get("experience_required", {}).get("years_of_experience", ""))
+                years if isinstance(years, str) else str(years)
             )
-            job_data["experience_required"]["level"] = level
         
         # Cache the result only if temp directory exists
-        if os.path.exists("temp"):
-            os.makedirs(cache_dir, exist_ok=True)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(job_data, f, indent=2, ensure_ascii=False)
-            
+        if cache_file:
+            write_cache_file(cache_file, orjson.dumps(job_data))
+        _JD_SEMANTIC_CACHE.add(embedding, job_data)
+        
+        _JD_MEMO.put(job_description_text, job_data)
+        log.info("Processed job description '%s' (level: %s, attempts: %d)",
+                 job_data.get("job_title", "Not specified"), experience["level"], attempt + 1)
         return job_data
         
     except Exception as e:
-        print(f"Error processing LLM response: {str(e)}")
+        log.error("Error processing LLM response: %s", e)
         raise
 
 def convert_job_description_to_json(job_file_path: str) -> Dict[str, Any]:
@@ -269,6 +344,28 @@ def convert_job_description_to_json(job_file_path: str) -> Dict[str, Any]:
     
     return structured_job
 
+def convert_many_job_descriptions_to_json(job_file_paths: List[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+    """
+    Convert several job description text files to structured JSON data concurrently
+    
+    The work is network-bound on the Groq API, so a thread pool gives near-linear
+    speedup up to the per-key rate limit. Rate-limited keys are rotated safely
+    across threads by config.cycle_api_key.
+    
+    Args:
+        job_file_paths: Paths to the job description text files
+        max_workers: Maximum number of concurrent requests
+        
+    Returns:
+        Structured job description data for each file, in the same order as job_file_paths
+    """
+    if not job_file_paths:
+        return []
+    
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(job_file_paths))) as executor:
+        return list(executor.map(convert_job_description_to_json, job_file_paths))
+
 def process_job_description(job_file_path: str, output_json_path: str = None) -> Dict[str, Any]:
     """
     Process a job description from text file to structured JSON (deprecated - use convert_job_description_to_json instead)
@@ -289,8 +386,8 @@ def process_job_description(job_file_path: str, output_json_path: str = None) ->
     # Save to file if output path is provided
     if output_json_path:
         os.makedirs(os.path.dirname(output_json_path) or '.', exist_ok=True)
-        with open(output_json_path, 'w', encoding='utf-8') as f:
-            json.dump(structured_job, f, indent=2, ensure_ascii=False)
+        with open(output_json_path, 'wb') as f:
+            f.write(orjson.dumps(structured_job, option=orjson.OPT_INDENT_2))
     
     return structured_job
 
@@ -304,10 +401,18 @@ def read_job_description(file_path: str) -> str:
     Returns:
         Job description text as a string
     """
-    if not os.path.exists(file_path):
+    # Open directly instead of checking existence first, and cap the read size
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='strict', buffering=1 << 16) as f:
+            text = f.read(MAX_JD_CHARS)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Job description file not found at: {file_path}")
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Job description file is not valid UTF-8 text: {file_path} ({e})")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        text = f.read()
+    # Reject empty or trivially short input before it is hashed or sent to the LLM
+    text = text.strip()
+    if len(text) < MIN_JD_CHARS:
+        raise ValueError(f"Job description is too short ({len(text)} characters, minimum {MIN_JD_CHARS}): {file_path}")
     
     return text
\ No newline at end of file
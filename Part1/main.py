@@ -1,80 +1,136 @@
 import argparse
+import functools
+import hashlib
+import logging
 import os
-import json
-import datetime
+import shutil
+import orjson
 import sys
-import resume
-import job_parser
-import resume_match
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from types import SimpleNamespace
+
+# Add the parent directory to the path so we can import config
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import config
+from parser_common import write_cache_file
+
+# Keys of the structured resume used in the summary
+(_K_NAME, _K_CONTACT, _K_EMAIL, _K_EXPERIENCE, _K_TOTAL_YEARS, _K_SKILLS,
+ _K_FRAUD, _K_FRAUD_TYPE, _K_RED_FLAGS) = map(sys.intern, (
+    'Name', 'Contact', 'Email', 'Experience', 'Total Years', 'Skills',
+    'is_fraudulent', 'fraud_type', 'red_flags'))
+
+# CLI commands, in the order they are listed in help output, and as a set for the legacy-format check
+_SUBCOMMAND_NAMES = ('resume', 'job', 'both', 'match', 'all')
+_SUBCOMMANDS = frozenset(_SUBCOMMAND_NAMES)
+
+# Directories already created by this process
+_made_dirs = set()
+
+def _mkdir(path):
+    """Create a directory (and its parents) unless this process already did"""
+    if path not in _made_dirs:
+        os.makedirs(path, exist_ok=True)
+        _made_dirs.add(path)
+
+def _stat_or_none(path):
+    """os.stat(path), or None if the path can't be stat'ed (e.g. it doesn't exist)"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+# Parsed JSON input files, keyed by path, with the mtime they were read at
+_json_cache = {}
+
+def _load_json_cached(path):
+    """Load a JSON file, reusing the parsed data if the file hasn't changed since it was last read"""
+    mtime = os.stat(path).st_mtime_ns
+    hit = _json_cache.get(path)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read())
+    _json_cache[path] = (mtime, data)
+    return data
+
+def _json_bytes(data, pretty=False):
+    """Serialize data as UTF-8 JSON, indented only if it is meant to be read by a person"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
 
-def save_resume_json(resume_data, pdf_path, output_folder="temp"):
+def _dump_json(path, data, pretty=False):
+    """Write data to path as UTF-8 JSON"""
+    with open(path, 'wb') as f:
+        f.write(_json_bytes(data, pretty))
+
+def _stem(path):
+    """File name of path without its directory or extension"""
+    base = path.rpartition(os.sep)[2] or path
+    stem, _, _ = base.rpartition('.')
+    return stem or base
+
+def _save_json(data, src_path, output_folder="temp", pretty=False):
     """
-    Save resume data as JSON in the temp folder
+    Save structured data as JSON in the output folder, named after the source file
+    and a hash of the content
     
     Args:
-        resume_data: The structured resume data
-        pdf_path: Path to the original PDF resume
+        data: The structured resume or job description data
+        src_path: Path to the original resume / job description file
         output_folder: Folder to save the JSON output
+        pretty: Indent the JSON (for files that are also handed to the user)
         
     Returns:
         Path to the saved JSON file
     """
-    # Create output folder if it doesn't exist
-    os.makedirs(output_folder, exist_ok=True)
-    
-    # Generate timestamp for the filename
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    resume_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    # Name the file after a hash of its content, so identical results map to the same file
+    payload = _json_bytes(data, pretty)
+    digest = hashlib.blake2b(payload, digest_size=8).hexdigest()
+    json_file = os.path.join(output_folder, f"{_stem(src_path)}_{digest}.json")
     
-    # Create JSON filename
-    json_file = os.path.join(output_folder, f"{resume_name}_{timestamp}.json")
-    
-    # Save the JSON data
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(resume_data, f, indent=2, ensure_ascii=False)
+    # Save the JSON data unless an earlier run already wrote the same content. The write is atomic
+    # (and creates the folder), so a crash can't leave a truncated file under the content's name
+    if _stat_or_none(json_file) is None:
+        write_cache_file(json_file, payload)
     
     return json_file
 
-def save_job_json(job_data, job_path, output_folder="temp"):
+def _copy_output(json_file, output_path):
     """
-    Save job description data as JSON in the temp folder
+    Place an already-written JSON file at a second path without serializing it again
     
-    Args:
-        job_data: The structured job description data
-        job_path: Path to the original job description file
-        output_folder: Folder to save the JSON output
-        
-    Returns:
-        Path to the saved JSON file
+    output_path gets its own copy (never a hard link), so editing it can't change the hashed
+    file. The copy is made under a temporary name and renamed over output_path, so an existing
+    output_path is replaced rather than written through
     """
-    # Create output folder if it doesn't exist
-    os.makedirs(output_folder, exist_ok=True)
-    
-    # Generate timestamp for the filename
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    job_name = os.path.splitext(os.path.basename(job_path))[0]
-    
-    # Create JSON filename
-    json_file = os.path.join(output_folder, f"{job_name}_{timestamp}.json")
-    
-    # Save the JSON data
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(job_data, f, indent=2, ensure_ascii=False)
-    
-    return json_file
+    output_dir = os.path.dirname(output_path) or '.'
+    _mkdir(output_dir)
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copyfile(json_file, tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if _stat_or_none(tmp_path) is not None:
+            os.unlink(tmp_path)
+        raise
 
 def parse_resume(args):
     """Process and structure a resume"""
+    # Imported here so that other commands don't pay for the resume parsing stack
+    import resume
+    
     # Validate PDF path
     resume_path = args.resume
-    if not os.path.exists(resume_path):
+    if _stat_or_none(resume_path) is None:
         print(f"Error: Resume file not found at {resume_path}")
         return
     
     # Validate job description path
     job_path = args.job
-    if not os.path.exists(job_path):
+    if _stat_or_none(job_path) is None:
         print(f"Warning: Job description file not found at {job_path}. Proceeding without job description.")
         job_path = None
     
@@ -89,44 +145,44 @@ def parse_resume(args):
         # Convert resume PDF to JSON data
         structured_resume = resume.convert_resume_to_json(resume_path, job_path)
         
-        # Save JSON to the output folder with timestamp
-        json_file = save_resume_json(structured_resume, resume_path, args.output_dir)
+        # Save JSON to the output folder
+        json_file = _save_json(structured_resume, resume_path, args.output_dir, pretty=bool(output_path))
         
         # Also save to the user-specified output path if provided
         if output_path:
-            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(structured_resume, f, indent=2, ensure_ascii=False)
+            _copy_output(json_file, output_path)
             print(f"Saved resume to user-specified path: {output_path}")
         
         print(f"Structured data saved to: {json_file}")
         
-        # Print a summary
-        print("\nResume Summary:")
-        print(f"Name: {structured_resume.get('Name', 'Not found')}")
+        # Print a summary in a single buffered write
+        lines = []
+        lines.append("\nResume Summary:\n")
+        lines.append(f"Name: {structured_resume.get(_K_NAME, 'Not found')}\n")
         
-        contact = structured_resume.get('Contact', {})
-        print(f"Email: {contact.get('Email', 'Not found')}")
+        contact = structured_resume.get(_K_CONTACT, {})
+        lines.append(f"Email: {contact.get(_K_EMAIL, 'Not found')}\n")
         
-        experience = structured_resume.get('Experience', {})
-        print(f"Total Experience: {experience.get('Total Years', 0)} years")
+        experience = structured_resume.get(_K_EXPERIENCE, {})
+        lines.append(f"Total Experience: {experience.get(_K_TOTAL_YEARS, 0)} years\n")
         
-        skills = structured_resume.get('Skills', [])
-        print(f"Skills: {', '.join(skills[:5])}{'...' if len(skills) > 5 else ''}")
+        skills = structured_resume.get(_K_SKILLS, [])
+        lines.append(f"Skills: {', '.join(islice(skills, 5))}{'...' if len(skills) > 5 else ''}\n")
         
         # Check for fraud detection
-        is_fraudulent = structured_resume.get('is_fraudulent', False)
+        is_fraudulent = structured_resume.get(_K_FRAUD, False)
         
         if is_fraudulent:
-            print("\n⚠️ FRAUD ALERT ⚠️")
-            print(f"Fraud Type: {structured_resume.get('fraud_type', 'Unknown')}")
-            print("\nRed Flags:")
-            for flag in structured_resume.get('red_flags', []):
-                print(f"- {flag}")
+            lines.append("\n⚠️ FRAUD ALERT ⚠️\n")
+            lines.append(f"Fraud Type: {structured_resume.get(_K_FRAUD_TYPE, 'Unknown')}\n")
+            lines.append("\nRed Flags:\n")
+            for flag in structured_resume.get(_K_RED_FLAGS, []):
+                lines.append(f"- {flag}\n")
         
         # Print inferred skills information
-        print("\nNote: The Skills section includes both explicitly mentioned skills and intelligently inferred skills")
-        print("based on the resume content and the job description requirements.")
+        lines.append("\nNote: The Skills section includes both explicitly mentioned skills and intelligently inferred skills\n")
+        lines.append("based on the resume content and the job description requirements.\n")
+        sys.stdout.write("".join(lines))
         
         return structured_resume
         
@@ -136,9 +192,11 @@ def parse_resume(args):
 
 def parse_job(args):
     """Process and structure a job description"""
+    import job_parser
+    
     # Validate job description path
     job_path = args.job
-    if not os.path.exists(job_path):
+    if _stat_or_none(job_path) is None:
         print(f"Error: Job description file not found at {job_path}")
         return
     
@@ -151,31 +209,31 @@ def parse_job(args):
         # Convert job description to JSON data
         structured_job = job_parser.convert_job_description_to_json(job_path)
         
-        # Save to output folder with timestamp
-        json_file = save_job_json(structured_job, job_path, args.output_dir)
+        # Save to output folder
+        json_file = _save_json(structured_job, job_path, args.output_dir, pretty=bool(output_path))
         
         # Also save to the user-specified output path if provided
         if output_path:
-            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(structured_job, f, indent=2, ensure_ascii=False)
+            _copy_output(json_file, output_path)
             print(f"Saved job description to user-specified path: {output_path}")
         
         print(f"Structured data saved to: {json_file}")
         
-        # Print a summary
-        print("\nJob Description Summary:")
-        print(f"Title: {structured_job.get('job_title', 'Not specified')}")
+        # Print a summary in a single buffered write
+        lines = []
+        lines.append("\nJob Description Summary:\n")
+        lines.append(f"Title: {structured_job.get('job_title', 'Not specified')}\n")
         
         experience = structured_job.get('experience_required', {})
-        print(f"Experience Required: {experience.get('years_of_experience', 'Not specified')}")
+        lines.append(f"Experience Required: {experience.get('years_of_experience', 'Not specified')}\n")
         
         skills_required = structured_job.get('skills_required', {})
         technical_skills = skills_required.get('technical_skills', [])
-        print(f"Technical Skills: {', '.join(technical_skills[:5])}{'...' if len(technical_skills) > 5 else ''}")
+        lines.append(f"Technical Skills: {', '.join(islice(technical_skills, 5))}{'...' if len(technical_skills) > 5 else ''}\n")
         
         responsibilities = structured_job.get('job_responsibilities', [])
-        print(f"Responsibilities: {len(responsibilities)} items")
+        lines.append(f"Responsibilities: {len(responsibilities)} items\n")
+        sys.stdout.write("".join(lines))
         
         return structured_job
         
@@ -183,10 +241,54 @@ def parse_job(args):
         print(f"Error processing job description: {str(e)}")
         return None
 
+def _print_match_summary(evaluation):
+    """Print the match evaluation summary in a single buffered write"""
+    lines = []
+    lines.append("\nMatch Evaluation Summary:\n")
+    lines.append(f"Overall Match Score: {evaluation.get('match_score', 'N/A')}/100\n")
+    lines.append(f"Skill Match Score: {evaluation.get('skill_match_score', 'N/A')}/100\n")
+    lines.append(f"Experience Match Score: {evaluation.get('experience_match_score', 'N/A')}/100\n")
+    
+    # Print pass/fail result
+    pass_fail = evaluation.get('pass_fail', {})
+    status = pass_fail.get('status', 'UNKNOWN')
+    
+    # Use symbols for the status
+    if status == 'PASS':
+        lines.append(f"\n✅ RESULT: {status}\n")
+    else:
+        lines.append(f"\n❌ RESULT: {status}\n")
+    
+        # Print failed criteria
+        if 'failed_criteria' in pass_fail:
+            lines.append("\nFailed Criteria:\n")
+            for criterion in pass_fail['failed_criteria']:
+                lines.append(f"- {criterion}\n")
+    
+    # Print the feedback message
+    if 'feedback_message' in pass_fail:
+        lines.append("\nFeedback Message:\n")
+        lines.append(f"{pass_fail['feedback_message']}\n")
+    
+    lines.append("\nComments:\n")
+    for comment in evaluation.get('comments', []):
+        lines.append(f"- {comment}\n")
+    
+    lines.append("\nMissing Skills:\n")
+    for skill in evaluation.get('missing_skills', []):
+        lines.append(f"- {skill}\n")
+    
+    lines.append("\nOverqualified In:\n")
+    for area in evaluation.get('overqualified_in', []):
+        lines.append(f"- {area}\n")
+    sys.stdout.write("".join(lines))
+
 def match_resume_job_from_json(resume_data: dict, job_data: dict, output_file: str = None,
                               overall_threshold: int = 70, skill_threshold: int = 65, 
                               experience_threshold: int = 60):
     """Compare a resume with a job description and evaluate the match using JSON data"""
+    import resume_match
+    
     try:
         print("Evaluating match using JSON data...")
         
@@ -201,49 +303,12 @@ def match_resume_job_from_json(resume_data: dict, job_data: dict, output_file: s
         
         # Save to file if output path is provided
         if output_file:
-            os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(evaluation, f, indent=2, ensure_ascii=False)
+            _mkdir(os.path.dirname(output_file) or '.')
+            _dump_json(output_file, evaluation, pretty=True)
             print(f"Match evaluation saved to: {output_file}")
         
         # Print a summary
-        print("\nMatch Evaluation Summary:")
-        print(f"Overall Match Score: {evaluation.get('match_score', 'N/A')}/100")
-        print(f"Skill Match Score: {evaluation.get('skill_match_score', 'N/A')}/100")
-        print(f"Experience Match Score: {evaluation.get('experience_match_score', 'N/A')}/100")
-        
-        # Print pass/fail result
-        pass_fail = evaluation.get('pass_fail', {})
-        status = pass_fail.get('status', 'UNKNOWN')
-        
-        # Use symbols for the status
-        if status == 'PASS':
-            print(f"\n✅ RESULT: {status}")
-        else:
-            print(f"\n❌ RESULT: {status}")
-            
-            # Print failed criteria
-            if 'failed_criteria' in pass_fail:
-                print("\nFailed Criteria:")
-                for criterion in pass_fail['failed_criteria']:
-                    print(f"- {criterion}")
-        
-        # Print the feedback message
-        if 'feedback_message' in pass_fail:
-            print("\nFeedback Message:")
-            print(pass_fail['feedback_message'])
-        
-        print("\nComments:")
-        for comment in evaluation.get('comments', []):
-            print(f"- {comment}")
-        
-        print("\nMissing Skills:")
-        for skill in evaluation.get('missing_skills', []):
-            print(f"- {skill}")
-        
-        print("\nOverqualified In:")
-        for area in evaluation.get('overqualified_in', []):
-            print(f"- {area}")
+        _print_match_summary(evaluation)
         
         return evaluation
         
@@ -253,15 +318,17 @@ def match_resume_job_from_json(resume_data: dict, job_data: dict, output_file: s
 
 def match_resume_job(args):
     """Compare a resume with a job description and evaluate the match"""
+    import resume_match
+    
     # Validate resume JSON path
     resume_file = args.resume
-    if not os.path.exists(resume_file):
+    if _stat_or_none(resume_file) is None:
         print(f"Error: Resume JSON file not found at {resume_file}")
         return
     
     # Validate job description JSON path
     job_file = args.job
-    if not os.path.exists(job_file):
+    if _stat_or_none(job_file) is None:
         print(f"Error: Job description JSON file not found at {job_file}")
         return
     
@@ -269,56 +336,25 @@ def match_resume_job(args):
         print(f"Loading resume from: {resume_file}")
         print(f"Loading job description from: {job_file}")
         
+        resume_data = _load_json_cached(resume_file)
+        job_data = _load_json_cached(job_file)
+        
         # Evaluate the match with thresholds
-        evaluation = resume_match.evaluate_match(
-            resume_file, 
-            job_file, 
-            args.output,
+        evaluation = resume_match.evaluate_match_from_json(
+            resume_data, 
+            job_data, 
             args.overall_threshold,
             args.skill_threshold,
             args.experience_threshold
         )
         
-        print(f"Match evaluation saved to: {args.output}")
+        if args.output:
+            _mkdir(os.path.dirname(args.output) or '.')
+            _dump_json(args.output, evaluation, pretty=True)
+            print(f"Match evaluation saved to: {args.output}")
         
         # Print a summary
-        print("\nMatch Evaluation Summary:")
-        print(f"Overall Match Score: {evaluation.get('match_score', 'N/A')}/100")
-        print(f"Skill Match Score: {evaluation.get('skill_match_score', 'N/A')}/100")
-        print(f"Experience Match Score: {evaluation.get('experience_match_score', 'N/A')}/100")
-        
-        # Print pass/fail result
-        pass_fail = evaluation.get('pass_fail', {})
-        status = pass_fail.get('status', 'UNKNOWN')
-        
-        # Use symbols for the status
-        if status == 'PASS':
-            print(f"\n✅ RESULT: {status}")
-        else:
-            print(f"\n❌ RESULT: {status}")
-            
-            # Print failed criteria
-            if 'failed_criteria' in pass_fail:
-                print("\nFailed Criteria:")
-                for criterion in pass_fail['failed_criteria']:
-                    print(f"- {criterion}")
-        
-        # Print the feedback message
-        if 'feedback_message' in pass_fail:
-            print("\nFeedback Message:")
-            print(pass_fail['feedback_message'])
-        
-        print("\nComments:")
-        for comment in evaluation.get('comments', []):
-            print(f"- {comment}")
-        
-        print("\nMissing Skills:")
-        for skill in evaluation.get('missing_skills', []):
-            print(f"- {skill}")
-        
-        print("\nOverqualified In:")
-        for area in evaluation.get('overqualified_in', []):
-            print(f"- {area}")
+        _print_match_summary(evaluation)
         
         return evaluation
         
@@ -328,28 +364,17 @@ def match_resume_job(args):
 
 def process_both(resume_path, job_path, output_dir="output"):
     """Process both resume and job description"""
-    # Create args object for resume parsing
-    class Args:
-        pass
-    
-    resume_args = Args()
-    resume_args.resume = resume_path
-    resume_args.job = job_path
-    resume_args.output = None
-    resume_args.output_dir = output_dir
-    
-    # Create args object for job parsing
-    job_args = Args()
-    job_args.job = job_path
-    job_args.output = None
-    job_args.output_dir = output_dir
+    # Create args objects for resume and job parsing
+    resume_args = SimpleNamespace(resume=resume_path, job=job_path, output=None, output_dir=output_dir)
+    job_args = SimpleNamespace(job=job_path, output=None, output_dir=output_dir)
     
-    # Process both
-    print("\n========== PROCESSING RESUME ==========")
-    resume_data = parse_resume(resume_args)
-    
-    print("\n========== PROCESSING JOB DESCRIPTION ==========")
-    job_data = parse_job(job_args)
+    # Process both concurrently: each parse is dominated by its LLM round-trip
+    print("\n========== PROCESSING RESUME AND JOB DESCRIPTION ==========")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        resume_future = executor.submit(parse_resume, resume_args)
+        job_future = executor.submit(parse_job, job_args)
+        resume_data = resume_future.result()
+        job_data = job_future.result()
     
     print("\n========== PROCESSING COMPLETE ==========")
     print("Both resume and job description processed successfully")
@@ -364,54 +389,105 @@ def process_all(resume_path, job_path, output_dir="output",
     
     if resume_data and job_data:
         # Ensure output directory exists
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Save resume and job data to files for matching in the output directory
-        resume_file = os.path.join(output_dir, "latest_resume.json")
-        job_file = os.path.join(output_dir, "latest_job.json")
+        _mkdir(output_dir)
         
-        with open(resume_file, 'w', encoding='utf-8') as f:
-            json.dump(resume_data, f, indent=2, ensure_ascii=False)
+        # Keep copies of the latest resume and job data in the output directory
+        # (e.g. as input for the Part2 quiz generator)
+        _dump_json(os.path.join(output_dir, "latest_resume.json"), resume_data)
+        _dump_json(os.path.join(output_dir, "latest_job.json"), job_data)
         
-        with open(job_file, 'w', encoding='utf-8') as f:
-            json.dump(job_data, f, indent=2, ensure_ascii=False)
-        
-        # Create args object for match evaluation
-        class Args:
-            pass
-        
-        match_args = Args()
-        match_args.resume = resume_file
-        match_args.job = job_file
-        match_args.output = os.path.join(output_dir, "match_evaluation.json")
-        match_args.overall_threshold = overall_threshold
-        match_args.skill_threshold = skill_threshold
-        match_args.experience_threshold = experience_threshold
-        
-        # Evaluate the match
+        # Evaluate the match from the in-memory data rather than re-reading those files
         print("\n========== EVALUATING MATCH ==========")
-        evaluation = match_resume_job(match_args)
+        evaluation = match_resume_job_from_json(
+            resume_data,
+            job_data,
+            os.path.join(output_dir, "match_evaluation.json"),
+            overall_threshold,
+            skill_threshold,
+            experience_threshold
+        )
         
         return resume_data, job_data, evaluation
     
     return resume_data, job_data, None
 
+@functools.lru_cache(maxsize=1)
+def _build_legacy_parser():
+    """Build the legacy-mode argument parser (once per process)"""
+    parser = argparse.ArgumentParser(description="Process resumes and job descriptions using LLM (Legacy Mode)")
+    parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file or JSON file (default: {config.DEFAULT_RESUME_PATH})", 
+                    default=config.DEFAULT_RESUME_PATH)
+    parser.add_argument("-j", "--job", help=f"Path to the job description file or JSON file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
+                    default=config.DEFAULT_JOB_DESCRIPTION_PATH)
+    parser.add_argument("-o", "--output", help="Output path for the JSON file (default: output in same directory with same name)")
+    parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files ('temp') or final match files ('output')", default="temp")
+    parser.add_argument("-m", "--mode", help="Processing mode: resume, job, both, match, or all (default: resume)", 
+                       choices=_SUBCOMMAND_NAMES, default='resume')
+    parser.add_argument("--overall-threshold", type=int, default=70, help="Minimum required overall match score (default: 70)")
+    parser.add_argument("--skill-threshold", type=int, default=65, help="Minimum required skill match score (default: 65)")
+    parser.add_argument("--experience-threshold", type=int, default=60, help="Minimum required experience match score (default: 60)")
+    return parser
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the subcommand argument parser (once per process)"""
+    parser = argparse.ArgumentParser(description="Process resumes and job descriptions using LLM")
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+
+    # Resume parsing command
+    resume_parser = subparsers.add_parser("resume", help="Parse and structure a resume")
+    resume_parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file (default: {config.DEFAULT_RESUME_PATH})", 
+                        default=config.DEFAULT_RESUME_PATH)
+    resume_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
+                        default=config.DEFAULT_JOB_DESCRIPTION_PATH)
+    resume_parser.add_argument("-o", "--output", help="Output path for the JSON file (default: output in same directory with same name)")
+    resume_parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files (default: temp)", default="temp")
+
+    # Job description parsing command
+    job_parser = subparsers.add_parser("job", help="Parse and structure a job description")
+    job_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
+                        default=config.DEFAULT_JOB_DESCRIPTION_PATH)
+    job_parser.add_argument("-o", "--output", help="Output path for the JSON file (default: output in same directory with same name)")
+    job_parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files (default: temp)", default="temp")
+
+    # Process both resume and job description command
+    both_parser = subparsers.add_parser("both", help="Parse and structure both a resume and a job description")
+    both_parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file (default: {config.DEFAULT_RESUME_PATH})", 
+                        default=config.DEFAULT_RESUME_PATH)
+    both_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
+                        default=config.DEFAULT_JOB_DESCRIPTION_PATH)
+    both_parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files (default: temp)", default="temp")
+
+    # Match resume and job description command
+    match_parser = subparsers.add_parser("match", help="Compare a resume with a job description and evaluate the match")
+    match_parser.add_argument("resume", help="Path to the resume JSON file")
+    match_parser.add_argument("job", help="Path to the job description JSON file")
+    match_parser.add_argument("-o", "--output", help="Output path for the evaluation JSON file (default: output/match_evaluation.json)",
+                          default="output/match_evaluation.json")
+    match_parser.add_argument("--overall-threshold", type=int, default=70, help="Minimum required overall match score (default: 70)")
+    match_parser.add_argument("--skill-threshold", type=int, default=65, help="Minimum required skill match score (default: 65)")
+    match_parser.add_argument("--experience-threshold", type=int, default=60, help="Minimum required experience match score (default: 60)")
+
+    # Process everything (resume, job, and match) command
+    all_parser = subparsers.add_parser("all", help="Process a resume and job description, then evaluate the match")
+    all_parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file (default: {config.DEFAULT_RESUME_PATH})", 
+                        default=config.DEFAULT_RESUME_PATH)
+    all_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
+                        default=config.DEFAULT_JOB_DESCRIPTION_PATH)
+    all_parser.add_argument("-d", "--output-dir", help="Output directory for final match files (intermediate files go to temp folder) (default: output)", default="output")
+    all_parser.add_argument("--overall-threshold", type=int, default=70, help="Minimum required overall match score (default: 70)")
+    all_parser.add_argument("--skill-threshold", type=int, default=65, help="Minimum required skill match score (default: 65)")
+    all_parser.add_argument("--experience-threshold", type=int, default=60, help="Minimum required experience match score (default: 60)")
+    return parser
+
 def main():
+    # Show progress messages from the parsing modules on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Check for the legacy format
-    if len(sys.argv) > 1 and sys.argv[1] not in ['resume', 'job', 'both', 'match', 'all']:
+    if len(sys.argv) > 1 and sys.argv[1] not in _SUBCOMMANDS:
         # Legacy format detected, convert to new format
-        parser = argparse.ArgumentParser(description="Process resumes and job descriptions using LLM (Legacy Mode)")
-        parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file or JSON file (default: {config.DEFAULT_RESUME_PATH})", 
-                        default=config.DEFAULT_RESUME_PATH)
-        parser.add_argument("-j", "--job", help=f"Path to the job description file or JSON file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
-                        default=config.DEFAULT_JOB_DESCRIPTION_PATH)
-        parser.add_argument("-o", "--output", help="Output path for the JSON file (default: output in same directory with same name)")
-        parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files ('temp') or final match files ('output')", default="temp")
-        parser.add_argument("-m", "--mode", help="Processing mode: resume, job, both, match, or all (default: resume)", 
-                           choices=['resume', 'job', 'both', 'match', 'all'], default='resume')
-        parser.add_argument("--overall-threshold", type=int, default=70, help="Minimum required overall match score (default: 70)")
-        parser.add_argument("--skill-threshold", type=int, default=65, help="Minimum required skill match score (default: 65)")
-        parser.add_argument("--experience-threshold", type=int, default=60, help="Minimum required experience match score (default: 60)")
+        parser = _build_legacy_parser()
         
         args = parser.parse_args()
         
@@ -423,14 +499,15 @@ def main():
             process_both(args.resume, args.job, args.output_dir)
         elif args.mode == 'match':
             # Create args object for match evaluation
-            class MatchArgs:
-                pass
-            
-            match_args = MatchArgs()
-            match_args.resume = args.resume
-            match_args.job = args.job
-            # Always use 'output' directory for match results
-            match_args.output = os.path.join("output", "match_evaluation.json") if not args.output else args.output
+            match_args = SimpleNamespace(
+                resume=args.resume,
+                job=args.job,
+                # Always use 'output' directory for match results
+                output=os.path.join("output", "match_evaluation.json") if not args.output else args.output,
+                overall_threshold=args.overall_threshold,
+                skill_threshold=args.skill_threshold,
+                experience_threshold=args.experience_threshold
+            )
             
             match_resume_job(match_args)
         elif args.mode == 'all':
@@ -446,53 +523,7 @@ def main():
             
     else:
         # New format with subcommands
-        parser = argparse.ArgumentParser(description="Process resumes and job descriptions using LLM")
-        subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-        
-        # Resume parsing command
-        resume_parser = subparsers.add_parser("resume", help="Parse and structure a resume")
-        resume_parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file (default: {config.DEFAULT_RESUME_PATH})", 
-                            default=config.DEFAULT_RESUME_PATH)
-        resume_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
-                            default=config.DEFAULT_JOB_DESCRIPTION_PATH)
-        resume_parser.add_argument("-o", "--output", help="Output path for the JSON file (default: output in same directory with same name)")
-        resume_parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files (default: temp)", default="temp")
-        
-        # Job description parsing command
-        job_parser = subparsers.add_parser("job", help="Parse and structure a job description")
-        job_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
-                            default=config.DEFAULT_JOB_DESCRIPTION_PATH)
-        job_parser.add_argument("-o", "--output", help="Output path for the JSON file (default: output in same directory with same name)")
-        job_parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files (default: temp)", default="temp")
-        
-        # Process both resume and job description command
-        both_parser = subparsers.add_parser("both", help="Parse and structure both a resume and a job description")
-        both_parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file (default: {config.DEFAULT_RESUME_PATH})", 
-                            default=config.DEFAULT_RESUME_PATH)
-        both_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
-                            default=config.DEFAULT_JOB_DESCRIPTION_PATH)
-        both_parser.add_argument("-d", "--output-dir", help="Output directory for the intermediate JSON files (default: temp)", default="temp")
-        
-        # Match resume and job description command
-        match_parser = subparsers.add_parser("match", help="Compare a resume with a job description and evaluate the match")
-        match_parser.add_argument("resume", help="Path to the resume JSON file")
-        match_parser.add_argument("job", help="Path to the job description JSON file")
-        match_parser.add_argument("-o", "--output", help="Output path for the evaluation JSON file (default: output/match_evaluation.json)",
-                              default="output/match_evaluation.json")
-        match_parser.add_argument("--overall-threshold", type=int, default=70, help="Minimum required overall match score (default: 70)")
-        match_parser.add_argument("--skill-threshold", type=int, default=65, help="Minimum required skill match score (default: 65)")
-        match_parser.add_argument("--experience-threshold", type=int, default=60, help="Minimum required experience match score (default: 60)")
-        
-        # Process everything (resume, job, and match) command
-        all_parser = subparsers.add_parser("all", help="Process a resume and job description, then evaluate the match")
-        all_parser.add_argument("-r", "--resume", help=f"Path to the resume PDF file (default: {config.DEFAULT_RESUME_PATH})", 
-                            default=config.DEFAULT_RESUME_PATH)
-        all_parser.add_argument("-j", "--job", help=f"Path to the job description file (default: {config.DEFAULT_JOB_DESCRIPTION_PATH})", 
-                            default=config.DEFAULT_JOB_DESCRIPTION_PATH)
-        all_parser.add_argument("-d", "--output-dir", help="Output directory for final match files (intermediate files go to temp folder) (default: output)", default="output")
-        all_parser.add_argument("--overall-threshold", type=int, default=70, help="Minimum required overall match score (default: 70)")
-        all_parser.add_argument("--skill-threshold", type=int, default=65, help="Minimum required skill match score (default: 65)")
-        all_parser.add_argument("--experience-threshold", type=int, default=60, help="Minimum required experience match score (default: 60)")
+        parser = _build_parser()
         
         # Parse arguments
         args = parser.parse_args()
@@ -0,0 +1,146 @@
+"""
+HTTP, retry and cache helpers shared by the resume parser (resume.py) and the job description parser (job_parser.py)
+"""
+
+import copy
+import os
+import random
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import orjson
+
+# Groq chat completions endpoint, called directly over HTTP by both parsers
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+class LazySession:
+    """
+    A pooled requests session shared by all calls of a module, created on first use.
+    requests is imported only then, to keep import time low for callers that never hit the API.
+    """
+
+    def __init__(self, pool_connections: int, pool_maxsize: int, **retry_options):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.retry_options = retry_options  # urllib3 Retry arguments for the adapter
+        self._session = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from urllib3.util.retry import Retry
+                    session = requests.Session()
+                    session.mount("https://", requests.adapters.HTTPAdapter(
+                        pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                        max_retries=Retry(**self.retry_options)
+                    ))
+                    self._session = session
+        return self._session
+
+# Groq error codes meaning the key is out of quota. Besides 429 they can come with another 4xx
+# status, so small error bodies are parsed for them (large bodies are not worth decoding).
+QUOTA_ERROR_CODES = frozenset({"rate_limit_exceeded", "insufficient_quota"})
+MAX_ERROR_BODY = 2048
+
+def is_quota_error(response) -> bool:
+    """
+    Whether a response means the API key is rate limited or out of quota
+    """
+    if response.status_code == 429:
+        return True
+    if not 400 <= response.status_code < 500 or len(response.content) > MAX_ERROR_BODY:
+        return False
+    try:
+        error = orjson.loads(response.content).get("error")
+    except (orjson.JSONDecodeError, AttributeError):
+        return False
+    return isinstance(error, dict) and (error.get("code") in QUOTA_ERROR_CODES or
+                                        error.get("type") in QUOTA_ERROR_CODES)
+
+# Longest Retry-After wait honored before trying again
+MAX_RETRY_AFTER = 30
+# Exponential backoff between retries when the server gives no Retry-After (seconds)
+BASE_DELAY = 2
+MAX_BACKOFF = 30
+
+def retry_after(response) -> float:
+    """
+    Seconds the server asked us to wait (Retry-After header), capped at MAX_RETRY_AFTER; 0 if not given
+    """
+    try:
+        return max(0.0, min(float(response.headers.get("Retry-After", 0)), MAX_RETRY_AFTER))
+    except ValueError:
+        # HTTP-date form, not worth parsing here
+        return 0
+
+def retry_delay(attempt: int, response=None) -> float:
+    """
+    Seconds to wait before the next attempt: the server's (capped) Retry-After if it sent one,
+    otherwise exponential backoff with full jitter (uniform between 0 and the capped backoff),
+    which spreads concurrent clients out instead of retrying in lockstep
+    """
+    if response is not None:
+        delay = retry_after(response)
+        if delay > 0:
+            return delay
+    return random.uniform(0, min(MAX_BACKOFF, BASE_DELAY * (2 ** attempt)))
+
+class LRUMemo:
+    """
+    In-process LRU memo of parsed results; values are copied in and out, so callers can modify them
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the memoized result for this key, or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Memoize a copy of the result, evicting the least recently used entry when full"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+# Cache directories already created by this process
+_CACHE_DIRS_MADE = set()
+
+def ensure_cache_dir(cache_dir: str) -> None:
+    """
+    Create the cache directory the first time this process writes to it
+    """
+    if cache_dir not in _CACHE_DIRS_MADE:
+        os.makedirs(cache_dir, exist_ok=True)
+        _CACHE_DIRS_MADE.add(cache_dir)
+
+def write_cache_file(cache_file: str, data: bytes) -> None:
+    """
+    Atomically write a cache file: write a temp sibling, then rename it into place,
+    so a crash or concurrent writer can never leave a truncated file behind
+    """
+    cache_dir = os.path.dirname(cache_file)
+    ensure_cache_dir(cache_dir)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -1,75 +1,39 @@
+import hashlib
 import json
 import os
-import requests
+import orjson
+import re
+import threading
 import time
-import random
+from pathlib import Path
 from typing import Dict, Any, List
 import sys
-import fitz  # PyMuPDF
 
 # Add the parent directory to the path so we can import config
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import config
+from semantic_cache import SemanticCache
+from parser_common import (
+    GROQ_API_URL, LazySession, LRUMemo, is_quota_error, retry_delay, write_cache_file
+)
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """
-    Extract text from a PDF file using PyMuPDF
-    
-    Args:
-        pdf_path: Path to the PDF file
-        
-    Returns:
-        Extracted text as a string
-    """
-    try:
-        # Open the PDF file
-        pdf_document = fitz.open(pdf_path)
-        text = ""
-        
-        # Extract text from each page
-        for page_num in range(len(pdf_document)):
-            page = pdf_document[page_num]
-            text += page.get_text()
-        
-        pdf_document.close()
-        return text
-    except Exception as e:
-        raise Exception(f"Error extracting text from PDF: {str(e)}")
+# Pooled session so retries and repeated calls reuse the TCP/TLS connection.
+# Retries stay in process_resume_with_llm's loop (with key rotation), so the adapter doesn't retry.
+REQUEST_TIMEOUT = (3.05, 60)  # (connect, read) seconds
+_SESSION = LazySession(pool_connections=8, pool_maxsize=32, total=0)
 
-def process_resume_with_llm(resume_text: str, job_description: str = None) -> Dict[str, Any]:
+MAX_RETRIES = 5
+
+def _new_async_client():
     """
-    Process resume text with Groq's LLM to structure it into JSON format
-    
-    Args:
-        resume_text: Plain text resume
-        job_description: Optional job description to tailor skills extraction
-        
-    Returns:
-        Structured resume data as a dictionary
+    Create an httpx.AsyncClient for the Groq API (httpx is imported here as only the async API needs it)
     """
-    # Check cache first - create hash of input text for cache key
-    import hashlib
-    cache_key = hashlib.md5(resume_text.encode()).hexdigest()
-    cache_dir = os.path.join("temp", "cache")
-    
-    # Only use cache if temp directory exists
-    cache_file = os.path.join(cache_dir, f"resume_{cache_key}.json")
-    if os.path.exists(cache_file):
-        print("Using cached resume result...")
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    # Get API key from config file
-    try:
-        api_key = config.get_current_api_key()
-    except ValueError as e:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
-    
-    if not api_key:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
-    
-    # System message to define the task for the LLM
-    system_message = """
+    import httpx
+    return httpx.AsyncClient(timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]))
+
+# System message to define the task for the LLM. Runs of whitespace (indentation of the
+# schema, blank lines) are collapsed once at import, which cuts the prompt's token count
+_SYSTEM_MESSAGE = """
     You are a resume parsing assistant. Your task is to extract and structure information from a resume into a clean, structured JSON format.
     
     Important: Do NOT add any inferences or additional content. Only extract information that is explicitly present in the resume.
@@ -131,68 +95,366 @@ def process_resume_with_llm(resume_text: str, job_description: str = None) -> Di
     6. Avoid obscure tools like Gulp, Grunt, etc. unless explicitly mentioned.
     7. Provide your response as a valid JSON object only, with no additional text.
     """
+_SYSTEM_MESSAGE = re.sub(r"\s+", " ", _SYSTEM_MESSAGE).strip()
+
+# In-process LRU memo in front of the disk cache, keyed by cache file path (i.e. the text digest)
+RESUME_MEMO_SIZE = 128
+_RESUME_MEMO = LRUMemo(RESUME_MEMO_SIZE)
+
+# Near-duplicate resumes reuse an earlier structured result (opt-in, see config.RESUME_SEMANTIC_CACHE).
+# The threshold is stricter than for job descriptions since resumes of different people can be very similar.
+_RESUME_SEMANTIC_CACHE = SemanticCache("resume", threshold=config.RESUME_SEMANTIC_CACHE_THRESHOLD)
+RESUME_EMBED_CHARS = 8192
+
+# Resumes longer than this are trimmed to their relevant sections before being sent to the LLM
+MAX_RESUME_CHARS = 15000
+
+# A short line that may be a section heading, e.g. "EXPERIENCE", "Technical Skills:", "Hobbies:"
+RESUME_HEADING_RE = re.compile(r"^[ \t]*([A-Z][A-Za-z &/]{2,40})(:?)[ \t]*$", re.MULTILINE)
+
+# Headings of the sections the LLM extracts from
+RESUME_SECTION_RE = re.compile(
+    r"(?:work |professional |technical |key |academic )?"
+    r"(?:experience|employment|education|skills|projects|certifications|summary|objective|profile)",
+    re.IGNORECASE
+)
+
+# PyMuPDF is a large C extension, so it is only imported (by _fitz) when a PDF is actually read
+fitz = None
+
+# Plain text extraction flags: keep ligatures and whitespace as they are and clip to the page,
+# without dehyphenation, image or span reconstruction passes. Blocks are not re-sorted.
+# Set by _fitz() since the flag values come from PyMuPDF.
+TEXT_FLAGS = None
+
+def _fitz():
+    """
+    Import PyMuPDF on first use and return it
+    """
+    global fitz, TEXT_FLAGS
+    if fitz is None:
+        import fitz as _f  # PyMuPDF
+        TEXT_FLAGS = _f.TEXT_PRESERVE_LIGATURES | _f.TEXT_PRESERVE_WHITESPACE | _f.TEXT_MEDIABOX_CLIP
+        fitz = _f
+    return fitz
+
+# PDFs with fewer pages than this are extracted in-process; below it the
+# cost of starting worker processes outweighs the parallel speedup
+PARALLEL_PDF_MIN_PAGES = 20
+
+# Worker processes for large PDFs, shared by all extractions and started on first use. They are
+# started with forkserver (spawn where that isn't available), never fork: the API extracts PDFs
+# from its worker threads, and forking a multithreaded process can deadlock the child
+PDF_POOL_WORKERS = min(os.cpu_count() or 1, 4)
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+
+def _pdf_pool():
+    """
+    Return the shared PDF extraction process pool, creating it on first use
+    """
+    global _PDF_POOL
+    if _PDF_POOL is None:
+        with _PDF_POOL_LOCK:
+            if _PDF_POOL is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _PDF_POOL = ProcessPoolExecutor(max_workers=PDF_POOL_WORKERS,
+                                                mp_context=multiprocessing.get_context(method))
+    return _PDF_POOL
+
+# Decodes a JSON object embedded in surrounding text in a single forward pass (see _decode_embedded_json)
+_JSON_DECODER = json.JSONDecoder()
+
+# Matches a JSON object wrapped in a markdown code fence in the LLM response
+FENCED_JSON_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# API key last used by this module. Refreshed only on rotation; if another module
+# rotated the shared key meanwhile, cycle_api_key(failed_key) hands back the new one.
+_CURRENT_API_KEY = None
+
+# Keywords indicating unrealistic claims, with the red flag each one raises
+FRAUD_CHECKS = (
+    ("15+ years", "Unrealistic experience claim"),
+    ("20+ years", "Unrealistic experience claim"),
+    ("expert in all", "Overstated expertise claim"),
+    ("master of all", "Overstated expertise claim"),
+    ("perfect GPA", "Unrealistic academic claim")
+)
+
+# All fraud keywords in one precompiled case-insensitive alternation, matched as whole words.
+# Each keyword gets a named group (k0, k1, ...) so a match maps straight back to its table entry.
+FRAUD_CHECK_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<k{i}>{re.escape(keyword)})" for i, (keyword, _) in enumerate(FRAUD_CHECKS)) + r")\b",
+    re.IGNORECASE
+)
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> str:
+    """
+    Extract the text of pages [start, stop) of a PDF (runs in a worker process)
+    """
+    with _fitz().open(pdf_path) as pdf_document:
+        return "".join(pdf_document[page_num].get_text("text", flags=TEXT_FLAGS, sort=False)
+                       for page_num in range(start, stop))
+
+class ResumePDF:
+    """
+    A resume PDF opened once for text extraction, page count and metadata
     
-    # Prepare the request
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+    Usage:
+        with ResumePDF(resume_path) as pdf:
+            text = pdf.text()
+    """
     
-    # Prepare the request payload
-    user_message = f"Resume:\n{resume_text}"
-    if job_description:
-        user_message += f"\n\nJob Description for context:\n{job_description}"
+    def __init__(self, pdf_path: str, num_workers: int = None):
+        """
+        Args:
+            pdf_path: Path to the PDF file
+            num_workers: Number of page ranges a large PDF is split into for the shared worker pool
+                         (default: CPU count, at most 4; 1 disables parallel extraction)
+        """
+        self.pdf_path = pdf_path
+        self.num_workers = min(os.cpu_count() or 1, 4) if num_workers is None else num_workers
+        self.document = None
+        self._text = None
+    
+    def __enter__(self):
+        try:
+            # Read the file in one call and hand MuPDF the bytes, rather than letting it
+            # issue many small reads (slow on network-mounted storage)
+            with open(self.pdf_path, 'rb') as f:
+                self.document = _fitz().open(stream=f.read(), filetype="pdf")
+        except Exception as e:
+            raise Exception(f"Error extracting text from PDF: {str(e)}")
+        return self
     
-    payload = {
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.document.close()
+        self.document = None
+    
+    @property
+    def page_count(self) -> int:
+        return self.document.page_count
+    
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Document metadata (title, author, creation date, ...)
+        """
+        return dict(self.document.metadata or {})
+    
+    def iter_text(self):
+        """
+        Yield the text of the PDF in page order, one page (or page range) at a time
+        """
+        try:
+            page_count = self.page_count
+            if self.num_workers <= 1 or page_count < PARALLEL_PDF_MIN_PAGES:
+                for page in self.document:
+                    yield page.get_text("text", flags=TEXT_FLAGS, sort=False)
+                return
+            
+            # Large PDF: each worker reopens the file and extracts one contiguous range of pages
+            chunk_size = -(-page_count // self.num_workers)
+            starts = range(0, page_count, chunk_size)
+            # map yields results in submission order, so the page order is preserved
+            yield from _pdf_pool().map(
+                _extract_page_range,
+                [self.pdf_path] * len(starts),
+                starts,
+                [min(start + chunk_size, page_count) for start in starts]
+            )
+        except Exception as e:
+            raise Exception(f"Error extracting text from PDF: {str(e)}")
+    
+    def text(self) -> str:
+        """
+        The text of the whole PDF (extracted on first call)
+        """
+        if self._text is None:
+            # Join once at the end
+            self._text = "".join(self.iter_text())
+        return self._text
+
+def extract_text_from_pdf(pdf_path: str, num_workers: int = None, out=None):
+    """
+    Extract text from a PDF file using PyMuPDF
+    
+    Args:
+        pdf_path: Path to the PDF file
+        num_workers: Number of worker processes for large PDFs
+                     (default: CPU count, at most 4; 1 disables parallel extraction)
+        out: Optional binary file object; if given, the UTF-8 text is streamed into it
+             page by page instead of being returned, so it is never held in memory at once
+        
+    Returns:
+        Extracted text as a string, or the number of bytes written if out is given
+    """
+    with ResumePDF(pdf_path, num_workers) as pdf:
+        if out is None:
+            return pdf.text()
+        return _write_pdf_text(pdf, out)
+
+def _write_pdf_text(pdf: ResumePDF, out) -> int:
+    """
+    Stream the UTF-8 text of an open PDF into a binary file object, returning the bytes written
+    """
+    written = 0
+    for text in pdf.iter_text():
+        written += out.write(text.encode("utf-8"))
+    return written
+
+def _resume_cache_file(resume_text: str) -> str:
+    """
+    Path of the cache file for a resume text
+    """
+    # BLAKE2b is faster than MD5 in CPython; a 16-byte digest is plenty for a cache key
+    cache_key = hashlib.blake2b(resume_text.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join("temp", "cache", f"resume_{cache_key}.json")
+
+def _load_cached_resume(cache_file: str):
+    """
+    Return the cached structured resume, or None if there is none
+    (the in-process memo is checked before the cache file on disk)
+    """
+    resume_data = _RESUME_MEMO.get(cache_file)
+    if resume_data is not None:
+        return resume_data
+    
+    if os.path.exists(cache_file):
+        print("Using cached resume result...")
+        with open(cache_file, 'rb') as f:
+            resume_data = orjson.loads(f.read())
+        _RESUME_MEMO.put(cache_file, resume_data)
+        return resume_data
+    return None
+
+def _embed_resume(resume_text: str):
+    """
+    Embed the start of a resume for the semantic cache, or return None if it is disabled
+    """
+    if not config.RESUME_SEMANTIC_CACHE:
+        return None
+    return _RESUME_SEMANTIC_CACHE.embed(resume_text[:RESUME_EMBED_CHARS])
+
+def _semantic_lookup(embedding, cache_file: str):
+    """
+    Return the cached result for a near-duplicate resume, or None
+    """
+    resume_data = _RESUME_SEMANTIC_CACHE.lookup(embedding)
+    if resume_data is not None:
+        print("Using semantically similar cached resume result...")
+        _RESUME_MEMO.put(cache_file, resume_data)
+    return resume_data
+
+def _get_api_key() -> str:
+    """
+    Get the Groq API key - the key this module last used, only asking config when unset
+    """
+    try:
+        api_key = _CURRENT_API_KEY or config.get_current_api_key()
+    except ValueError as e:
+        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
+    
+    if not api_key:
+        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
+    
+    return api_key
+
+def _trim_resume(resume_text: str) -> str:
+    """
+    Trim a very long resume down to the text before its first heading (name, contact details)
+    and the sections the LLM extracts from, falling back to the first MAX_RESUME_CHARS characters
+    
+    Args:
+        resume_text: Plain text resume
+        
+    Returns:
+        The resume text, trimmed if it is longer than MAX_RESUME_CHARS
+    """
+    if len(resume_text) <= MAX_RESUME_CHARS:
+        return resume_text
+    
+    # Title-case short lines are often names or job titles, so only all-caps lines,
+    # lines ending in a colon and known section names count as headings
+    headings = [
+        match for match in RESUME_HEADING_RE.finditer(resume_text)
+        if match.group(2) or match.group(1).isupper() or RESUME_SECTION_RE.fullmatch(match.group(1).strip())
+    ]
+    if not headings:
+        return resume_text[:MAX_RESUME_CHARS]
+    
+    # Each section runs from its heading to the next heading
+    parts = [resume_text[:headings[0].start()]]
+    ends = [heading.start() for heading in headings[1:]] + [len(resume_text)]
+    for heading, end in zip(headings, ends):
+        if RESUME_SECTION_RE.fullmatch(heading.group(1).strip()):
+            parts.append(resume_text[heading.start():end])
+    
+    return "".join(parts)[:MAX_RESUME_CHARS]
+
+def _rotate_api_key(failed_key: str) -> str:
+    """
+    Switch to the next API key after failed_key was rate limited or ran out of quota
+    """
+    global _CURRENT_API_KEY
+    _CURRENT_API_KEY = config.cycle_api_key(failed_key)
+    return _CURRENT_API_KEY
+
+def _build_payload(resume_text: str, job_description: str = None) -> Dict[str, Any]:
+    """
+    Build the chat completion request payload for a resume
+    """
+    # Less input means faster prefill. The cache key is computed from the untrimmed text,
+    # which is sound since trimming is deterministic.
+    resume_text = _trim_resume(resume_text)
+    
+    # The variable resume goes last so requests share the longest possible identical prefix
+    # (system message, then the job description or a fixed placeholder), which lets the
+    # provider reuse its prompt prefix cache
+    user_message = f"Job Description for context:\n{job_description or 'N/A'}\n\nResume:\n{resume_text}"
+    
+    return {
         "messages": [
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": _SYSTEM_MESSAGE},
             {"role": "user", "content": user_message}
         ],
         "model": config.MODEL_NAME,
         "temperature": config.TEMPERATURE
     }
+
+def _decode_embedded_json(content: str):
+    """
+    Decode the JSON object starting at the first '{' in content, ignoring any text after it
     
-    # Make the API request with retry logic
-    max_retries = 5
-    base_delay = 2  # base delay in seconds
-    
-    for attempt in range(max_retries):
-        try:
-            print(f"Processing resume (attempt {attempt + 1}/{max_retries})...")
-            
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            
-            # If successful, no need to retry
-            if response.status_code == 200:
-                break
-                
-            # If rate limited or quota exceeded, try next API key
-            if response.status_code == 429 or "quota" in response.text.lower():
-                print(f"API key quota exceeded. Trying next API key...")
-                api_key = config.cycle_api_key()
-                headers["Authorization"] = f"Bearer {api_key}"
-                continue
-                
-            # For other errors, raise exception
-            response.raise_for_status()
-            
-        except requests.exceptions.RequestException as e:
-            # If last attempt, raise the exception
-            if attempt == max_retries - 1:
-                raise Exception(f"Error in Groq API request after {max_retries} attempts: {str(e)}")
-            
-            # Otherwise, wait and retry
-            delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
-            print(f"Request failed. Retrying in {delay:.2f} seconds...")
-            time.sleep(delay)
+    Returns:
+        The decoded object, or None if there is no valid JSON object at that position
+    """
+    start = content.find('{')
+    if start == -1:
+        return None
+    try:
+        data, _ = _JSON_DECODER.raw_decode(content, start)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def _structure_resume_response(response, resume_text: str, cache_file: str,
+                               embedding=None) -> Dict[str, Any]:
+    """
+    Turn a successful LLM response into structured resume data, add fraud detection and cache it
     
-    # Process the response
+    Args:
+        response: The HTTP response (requests or httpx) from the Groq API
+        resume_text: The resume text that was sent
+        cache_file: Path of the cache file for this resume text
+        embedding: Semantic cache embedding of the resume text, if the semantic cache is enabled
+        
+    Returns:
+        Structured resume data as a dictionary
+    """
     try:
-        result = response.json()
+        result = orjson.loads(response.content)
         
         # Extract content from the response
         content = result["choices"][0]["message"]["content"]
@@ -200,34 +462,28 @@ def process_resume_with_llm(resume_text: str, job_description: str = None) -> Di
         # Extract JSON from the content
         try:
             # Try to parse the response as JSON directly
-            resume_data = json.loads(content)
-        except json.JSONDecodeError:
-            # If direct parsing fails, try to extract JSON from markdown code blocks
-            import re
-            json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', content, re.DOTALL)
-            if json_match:
-                resume_data = json.loads(json_match.group(1))
-            else:
-                # If all else fails, raise an error with the content for debugging
-                raise Exception(f"Could not parse JSON from LLM response. Content: {content[:500]}...")
+            resume_data = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # If direct parsing fails, decode the JSON object embedded in the surrounding prose
+            # or code fence; the fence regex is only a last resort
+            resume_data = _decode_embedded_json(content)
+            if resume_data is None:
+                json_match = FENCED_JSON_RE.search(content)
+                if json_match:
+                    resume_data = orjson.loads(json_match.group(1))
+                else:
+                    # If all else fails, raise an error with the content for debugging
+                    raise Exception(f"Could not parse JSON from LLM response. Content: {content[:500]}...")
         
         # Add fraud detection
         resume_data["is_fraudulent"] = False
         resume_data["fraud_type"] = "None"
         resume_data["red_flags"] = []
         
-        # Simple fraud detection based on unrealistic claims
-        fraud_checks = [
-            ("15+ years", "Unrealistic experience claim"),
-            ("20+ years", "Unrealistic experience claim"),
-            ("expert in all", "Overstated expertise claim"),
-            ("master of all", "Overstated expertise claim"),
-            ("perfect GPA", "Unrealistic academic claim")
-        ]
-        
-        resume_text_lower = resume_text.lower()
-        for keyword, flag in fraud_checks:
-            if keyword in resume_text_lower:
+        # Simple fraud detection based on unrealistic claims - one scan finds all keywords
+        found = {match.lastgroup for match in FRAUD_CHECK_RE.finditer(resume_text)}
+        for i, (keyword, flag) in enumerate(FRAUD_CHECKS):
+            if f"k{i}" in found:
                 resume_data["is_fraudulent"] = True
                 resume_data["fraud_type"] = "Unrealistic Claims"
                 if flag not in resume_data["red_flags"]:
@@ -235,16 +491,178 @@ def process_resume_with_llm(resume_text: str, job_description: str = None) -> Di
         
         # Cache the result only if temp directory exists
         if os.path.exists("temp"):
-            os.makedirs(cache_dir, exist_ok=True)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(resume_data, f, indent=2, ensure_ascii=False)
-            
+            write_cache_file(cache_file, orjson.dumps(resume_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        _RESUME_SEMANTIC_CACHE.add(embedding, resume_data)
+        
+        _RESUME_MEMO.put(cache_file, resume_data)
         return resume_data
         
     except Exception as e:
         print(f"Error processing LLM response: {str(e)}")
         raise
 
+def process_resume_with_llm(resume_text: str, job_description: str = None) -> Dict[str, Any]:
+    """
+    Process resume text with Groq's LLM to structure it into JSON format
+    
+    Args:
+        resume_text: Plain text resume
+        job_description: Optional job description to tailor skills extraction
+        
+    Returns:
+        Structured resume data as a dictionary
+    """
+    # Check cache first
+    cache_file = _resume_cache_file(resume_text)
+    cached = _load_cached_resume(cache_file)
+    if cached is not None:
+        return cached
+    
+    # Then the semantic cache (opt-in) - catches near-duplicate uploads of the same resume
+    embedding = _embed_resume(resume_text)
+    cached = _semantic_lookup(embedding, cache_file)
+    if cached is not None:
+        return cached
+    
+    # Get API key from config file
+    api_key = _get_api_key()
+    
+    # Prepare the request
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    
+    # Prepare the request payload
+    # Serialized once - retries and key rotations only change the Authorization header
+    body = orjson.dumps(_build_payload(resume_text, job_description))
+    
+    # Deferred import - only needed when we actually call the API
+    import requests
+    session = _SESSION.get()
+    
+    # Make the API request with retry logic
+    for attempt in range(MAX_RETRIES):
+        try:
+            print(f"Processing resume (attempt {attempt + 1}/{MAX_RETRIES})...")
+            
+            response = session.post(
+                GROQ_API_URL,
+                headers=headers,
+                data=body,
+                timeout=REQUEST_TIMEOUT
+            )
+            
+            # If successful, no need to retry
+            if response.status_code == 200:
+                break
+                
+            # If rate limited or quota exceeded, try next API key
+            if is_quota_error(response):
+                print(f"API key quota exceeded. Trying next API key...")
+                # Rotate before backing off, so the wait is spent on the new key's budget
+                api_key = _rotate_api_key(api_key)
+                headers["Authorization"] = f"Bearer {api_key}"
+                if attempt < MAX_RETRIES - 1:
+                    time.sleep(retry_delay(attempt, response))
+                continue
+                
+            # For other errors, raise exception
+            response.raise_for_status()
+            
+        except requests.exceptions.RequestException as e:
+            # If last attempt, raise the exception
+            if attempt == MAX_RETRIES - 1:
+                raise Exception(f"Error in Groq API request after {MAX_RETRIES} attempts: {str(e)}")
+            
+            # Otherwise, wait and retry
+            delay = retry_delay(attempt)
+            print(f"Request failed. Retrying in {delay:.2f} seconds...")
+            time.sleep(delay)
+    
+    # Process the response
+    return _structure_resume_response(response, resume_text, cache_file, embedding)
+
+async def process_resume_with_llm_async(resume_text: str, job_description: str = None,
+                                        client=None) -> Dict[str, Any]:
+    """
+    Async version of process_resume_with_llm, so several resumes can wait on the API concurrently
+    
+    Args:
+        resume_text: Plain text resume
+        job_description: Optional job description to tailor skills extraction
+        client: Optional httpx.AsyncClient to share between calls (one is created if not given)
+        
+    Returns:
+        Structured resume data as a dictionary
+    """
+    import asyncio
+    import httpx
+    
+    # Check cache first
+    cache_file = _resume_cache_file(resume_text)
+    cached = _load_cached_resume(cache_file)
+    if cached is not None:
+        return cached
+    
+    # Embedding is CPU-bound, so keep it off the event loop
+    embedding = await asyncio.to_thread(_embed_resume, resume_text)
+    cached = _semantic_lookup(embedding, cache_file)
+    if cached is not None:
+        return cached
+    
+    api_key = _get_api_key()
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    # Serialized once - retries and key rotations only change the Authorization header
+    body = orjson.dumps(_build_payload(resume_text, job_description))
+    
+    owns_client = client is None
+    if owns_client:
+        client = _new_async_client()
+    try:
+        # Make the API request with the same retry and key rotation logic as the sync version
+        for attempt in range(MAX_RETRIES):
+            try:
+                print(f"Processing resume (attempt {attempt + 1}/{MAX_RETRIES})...")
+                
+                response = await client.post(GROQ_API_URL, headers=headers, content=body)
+                
+                # If successful, no need to retry
+                if response.status_code == 200:
+                    break
+                    
+                # If rate limited or quota exceeded, try next API key
+                if is_quota_error(response):
+                    print(f"API key quota exceeded. Trying next API key...")
+                    # Rotate before backing off, so the wait is spent on the new key's budget
+                    api_key = _rotate_api_key(api_key)
+                    headers["Authorization"] = f"Bearer {api_key}"
+                    if attempt < MAX_RETRIES - 1:
+                        await asyncio.sleep(retry_delay(attempt, response))
+                    continue
+                    
+                # For other errors, raise exception
+                response.raise_for_status()
+                
+            except httpx.HTTPError as e:
+                # If last attempt, raise the exception
+                if attempt == MAX_RETRIES - 1:
+                    raise Exception(f"Error in Groq API request after {MAX_RETRIES} attempts: {str(e)}")
+                
+                # Otherwise, wait and retry
+                delay = retry_delay(attempt)
+                print(f"Request failed. Retrying in {delay:.2f} seconds...")
+                await asyncio.sleep(delay)
+    finally:
+        if owns_client:
+            await client.aclose()
+    
+    # Process the response
+    return _structure_resume_response(response, resume_text, cache_file, embedding)
+
 def convert_resume_to_json(resume_path: str, job_path: str = None) -> Dict[str, Any]:
     """
     Convert a resume PDF file to structured JSON data
@@ -257,19 +675,64 @@ def convert_resume_to_json(resume_path: str, job_path: str = None) -> Dict[str,
         Structured resume data as a dictionary
     """
     # Extract text from PDF
-    resume_text = extract_text_from_pdf(resume_path)
+    with ResumePDF(resume_path) as pdf:
+        resume_text = pdf.text()
     
     # Read job description if provided
-    job_description = None
-    if job_path:
-        with open(job_path, 'r', encoding='utf-8') as f:
-            job_description = f.read()
+    job_description = Path(job_path).read_text(encoding="utf-8") if job_path else None
     
     # Process with LLM
     structured_resume = process_resume_with_llm(resume_text, job_description)
     
     return structured_resume
 
+async def convert_resume_to_json_async(resume_path: str, job_path: str = None,
+                                       client=None) -> Dict[str, Any]:
+    """
+    Async version of convert_resume_to_json (text extraction runs in a worker thread)
+    
+    Args:
+        resume_path: Path to the resume PDF file
+        job_path: Optional path to job description text file
+        client: Optional httpx.AsyncClient to share between calls
+        
+    Returns:
+        Structured resume data as a dictionary
+    """
+    import asyncio
+    
+    # Extract text from PDF without blocking the event loop
+    resume_text = await asyncio.to_thread(extract_text_from_pdf, resume_path)
+    
+    # Read job description if provided
+    job_description = Path(job_path).read_text(encoding="utf-8") if job_path else None
+    
+    # Process with LLM
+    return await process_resume_with_llm_async(resume_text, job_description, client)
+
+async def convert_many_resumes_to_json_async(resume_paths: List[str], job_path: str = None,
+                                             max_concurrency: int = 8) -> List[Dict[str, Any]]:
+    """
+    Convert several resume PDF files to structured JSON data, overlapping the API calls
+    
+    Args:
+        resume_paths: Paths to the resume PDF files
+        job_path: Optional path to job description text file used for all resumes
+        max_concurrency: Maximum number of resumes processed at the same time
+        
+    Returns:
+        Structured resume data for each file, in the same order as resume_paths
+    """
+    import asyncio
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with _new_async_client() as client:
+        async def convert(resume_path):
+            async with semaphore:
+                return await convert_resume_to_json_async(resume_path, job_path, client)
+        
+        return await asyncio.gather(*(convert(resume_path) for resume_path in resume_paths))
+
 def process_resume(resume_path: str, job_path: str = None, output_json_path: str = None) -> Dict[str, Any]:
     """
     Process a resume from PDF to structured JSON (deprecated - use convert_resume_to_json instead)
@@ -283,13 +746,11 @@ def process_resume(resume_path: str, job_path: str = None, output_json_path: str
         Structured resume data as a dictionary
     """
     # Extract text from PDF
-    resume_text = extract_text_from_pdf(resume_path)
+    with ResumePDF(resume_path) as pdf:
+        resume_text = pdf.text()
     
     # Read job description if provided
-    job_description = None
-    if job_path:
-        with open(job_path, 'r', encoding='utf-8') as f:
-            job_description = f.read()
+    job_description = Path(job_path).read_text(encoding="utf-8") if job_path else None
     
     # Process with LLM
     structured_resume = process_resume_with_llm(resume_text, job_description)
@@ -297,7 +758,7 @@ def process_resume(resume_path: str, job_path: str = None, output_json_path: str
     # Save to file if output path is provided
     if output_json_path:
         os.makedirs(os.path.dirname(output_json_path) or '.', exist_ok=True)
-        with open(output_json_path, 'w', encoding='utf-8') as f:
-            json.dump(structured_resume, f, indent=2, ensure_ascii=False)
+        with open(output_json_path, 'wb') as f:
+            f.write(orjson.dumps(structured_resume, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     return structured_resume
\ No newline at end of file
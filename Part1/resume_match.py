@@ -1,21 +1,275 @@
+import copy
+import functools
+import re
+import hashlib
 import json
+import orjson
 import os
+import shelve
+import tempfile
 import sys
-import requests
-import argparse
+import threading
 import time
-import random
-from typing import Dict, Any
+import uuid
+import argparse
+import atexit
+import importlib.util
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple, Callable, Optional
 import sys
 import os
 
 # Add the parent directory to the path so we can import config
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import config
+from semantic_cache import SemanticCache
+
+def _as_text(value) -> str:
+    if isinstance(value, dict):
+        return " ".join(_as_text(v) for v in value.values())
+    if isinstance(value, list):
+        return ", ".join(_as_text(v) for v in value)
+    return "" if value is None else str(value)
+
+# Fields of a structured job description / resume that decide a match score, most decisive first
+JOB_PROFILE_FIELDS = ("job_title", "experience_required", "skills_required", "preferred_skills",
+                      "job_responsibilities")
+RESUME_PROFILE_FIELDS = ("Skills", "Experience", "Education", "Certifications", "Projects")
+
+def _profile_text(data: Dict[str, Any]) -> str:
+    """
+    Text of the score-driving fields of a structured job description or resume, for embedding
+    """
+    fields = JOB_PROFILE_FIELDS if "job_title" in data else RESUME_PROFILE_FIELDS
+    return "\n".join(f"{field}: {_as_text(data.get(field))}" for field in fields)
+
+class SemanticMatchCache:
+    """
+    Semantic cache of match evaluations, keyed on the (resume, job description) pair
+    
+    The resume and the job description are embedded separately, each from the fields that drive
+    the score (skills, experience, education / requirements, responsibilities), and the two
+    normalized embeddings are concatenated (scaled by 1/sqrt(2)), so the cosine similarity of two
+    pairs is the mean of the resume similarity and the job similarity. Requiring that mean to reach
+    (1 + threshold) / 2 guarantees that each part's embedding on its own reaches threshold. It is
+    still an approximation of "same inputs", so the cache is opt-in (config.MATCH_SEMANTIC_CACHE).
+    
+    Entries are segmented by normalized job title (job descriptions without a title share
+    one global segment), and each segment tunes its own threshold: every window of lookups,
+    the threshold moves 0.01 towards the target hit rate, within the configured range.
+    """
+    
+    def __init__(self, threshold: float = None):
+        self.base_threshold = config.MATCH_SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.min_threshold, self.max_threshold = config.MATCH_SEMANTIC_CACHE_THRESHOLD_RANGE
+        self._segments: Dict[str, SemanticCache] = {}
+        self._stats: Dict[str, List[int]] = {}  # segment -> [lookups, hits] in the current window
+        self._thresholds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _segment_name(job_data: Dict[str, Any]) -> str:
+        title = job_data.get("job_title") or ""
+        slug = re.sub(r"[^a-z0-9]+", "_", str(title).lower()).strip("_")[:64]
+        return slug or "_global"
+    
+    def _segment(self, name: str) -> SemanticCache:
+        with self._lock:
+            cache = self._segments.get(name)
+            if cache is None:
+                threshold = self._thresholds.setdefault(name, self.base_threshold)
+                cache = SemanticCache(os.path.join("match_profile", name), threshold=(1 + threshold) / 2)
+                self._segments[name] = cache
+            return cache
+    
+    def _record(self, name: str, hit: bool) -> None:
+        """
+        Count a lookup and adjust the segment threshold at the end of each window
+        """
+        with self._lock:
+            stats = self._stats.setdefault(name, [0, 0])
+            stats[0] += 1
+            stats[1] += hit
+            if stats[0] < config.MATCH_SEMANTIC_CACHE_WINDOW:
+                return
+            hit_rate = stats[1] / stats[0]
+            self._stats[name] = [0, 0]
+            
+            threshold = self._thresholds[name]
+            if hit_rate < config.MATCH_SEMANTIC_CACHE_TARGET_HIT_RATE:
+                threshold = max(self.min_threshold, threshold - 0.01)
+            elif hit_rate > config.MATCH_SEMANTIC_CACHE_TARGET_HIT_RATE:
+                threshold = min(self.max_threshold, threshold + 0.01)
+            self._thresholds[name] = threshold
+            self._segments[name].threshold = (1 + threshold) / 2
+    
+    def embed(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]):
+        """
+        Embed a (resume, job description) pair
+        
+        Returns:
+            (segment name, embedding) to pass to lookup/add, or None if the cache is disabled
+        """
+        if not config.MATCH_SEMANTIC_CACHE:
+            return None
+        name = self._segment_name(job_data)
+        cache = self._segment(name)
+        resume_embedding = cache.embed(_profile_text(resume_data))
+        if resume_embedding is None:
+            return None
+        import numpy as np
+        job_embedding = cache.embed(_profile_text(job_data))
+        return name, np.concatenate([resume_embedding, job_embedding]) / np.float32(np.sqrt(2))
+    
+    def lookup(self, embedding) -> Dict[str, Any]:
+        if embedding is None:
+            return None
+        name, vector = embedding
+        match_result = self._segment(name).lookup(vector)
+        self._record(name, match_result is not None)
+        return match_result
+    
+    def add(self, embedding, match_result: Dict[str, Any]) -> None:
+        if embedding is None:
+            return
+        name, vector = embedding
+        self._segment(name).add(vector, match_result)
+
+# Groq client shared by all calls so requests reuse its HTTP connection pool (created on first use)
+MAX_RETRIES = 5
+# Evaluation calls disable the SDK's own retries (which would retry a 429 on the same key) and
+# handle rate limits by rotating keys; connection errors and 5xx responses are retried on the
+# same key after RETRY_BACKOFF_BASE * 2**attempt seconds
+RETRY_BACKOFF_BASE = 0.5
+_GROQ_CLIENT = None
+_GROQ_CLIENT_LOCK = threading.Lock()
+
+# Connection pool for the Groq clients. HTTP/2 (one multiplexed connection for concurrent
+# requests) is used when the h2 package is installed; httpx falls back to HTTP/1.1 otherwise.
+HTTP_TIMEOUT = 30.0
+HTTP_MAX_CONNECTIONS = 32
+HTTP_MAX_KEEPALIVE = 16
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def _http_client_options() -> Dict[str, Any]:
+    import httpx
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "limits": httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+        "timeout": httpx.Timeout(HTTP_TIMEOUT),
+    }
+
+def _get_groq_client():
+    """
+    Return the shared Groq client, creating it on first use
+    """
+    global _GROQ_CLIENT
+    if _GROQ_CLIENT is None:
+        with _GROQ_CLIENT_LOCK:
+            if _GROQ_CLIENT is None:
+                import httpx
+                from groq import Groq
+                http_client = httpx.Client(**_http_client_options())
+                atexit.register(http_client.close)
+                _GROQ_CLIENT = Groq(api_key=config.get_current_api_key(), max_retries=MAX_RETRIES,
+                                    http_client=http_client)
+    return _GROQ_CLIENT
+
+def _new_async_groq_client():
+    """
+    Create an AsyncGroq client with the same connection pool settings (bound to the running event loop)
+    """
+    import httpx
+    from groq import AsyncGroq
+    return AsyncGroq(api_key=_get_api_key(), max_retries=MAX_RETRIES,
+                     http_client=httpx.AsyncClient(**_http_client_options()))
+
+# Re-screening the same candidate (or a slightly edited resume) reuses an earlier evaluation
+_MATCH_SEMANTIC_CACHE = SemanticMatchCache()
+
+# Exact-match cache of evaluations: an in-process LRU backed by a shelve database on disk
+# (the disk part is only used if the temp directory exists)
+MATCH_CACHE_SIZE = 1024
+MATCH_CACHE_DB = os.path.join("temp", "cache", "match_cache")
+_EXACT_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_EXACT_CACHE_LOCK = threading.Lock()
+# The shelve database is opened once and kept open; dbm handles aren't thread-safe, so disk reads and
+# writes take their own lock, and in-memory hits never wait on disk I/O
+_EXACT_CACHE_DB = None
+_EXACT_CACHE_DB_LOCK = threading.Lock()
+
+def _match_cache_key(resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> str:
+    """
+    Cache key for an evaluation: a digest of the canonical JSON of both inputs and the model settings
+    """
+    canonical = json.dumps(
+        {"r": resume_data, "j": job_data, "m": config.MODEL_NAME, "t": config.TEMPERATURE},
+        sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+def _exact_cache_db():
+    """
+    Return the open shelve database, opening it on first use (call with _EXACT_CACHE_DB_LOCK held)
+    """
+    global _EXACT_CACHE_DB
+    if _EXACT_CACHE_DB is None:
+        os.makedirs(os.path.dirname(MATCH_CACHE_DB), exist_ok=True)
+        _EXACT_CACHE_DB = shelve.open(MATCH_CACHE_DB)
+        atexit.register(_EXACT_CACHE_DB.close)
+    return _EXACT_CACHE_DB
+
+def _exact_cache_get(cache_key: str):
+    """
+    Return a copy of the cached evaluation for this key, or None
+    """
+    with _EXACT_CACHE_LOCK:
+        match_result = _EXACT_CACHE.get(cache_key)
+        if match_result is not None:
+            _EXACT_CACHE.move_to_end(cache_key)
+            return copy.deepcopy(match_result)
+    
+    if not os.path.isdir("temp"):
+        return None
+    # A broken or locked database counts as a miss rather than failing the request
+    try:
+        with _EXACT_CACHE_DB_LOCK:
+            match_result = _exact_cache_db().get(cache_key)
+    except Exception as e:
+        print(f"[WARNING] Match cache: disk lookup failed: {e}")
+        return None
+    
+    if match_result is not None:
+        _exact_cache_put(cache_key, match_result, persist=False)
+    return match_result
+
+def _exact_cache_put(cache_key: str, match_result: Dict[str, Any], persist: bool = True) -> None:
+    """
+    Cache a copy of an evaluation, evicting the least recently used entry from memory when full
+    """
+    match_result = copy.deepcopy(match_result)
+    with _EXACT_CACHE_LOCK:
+        _EXACT_CACHE[cache_key] = match_result
+        _EXACT_CACHE.move_to_end(cache_key)
+        if len(_EXACT_CACHE) > MATCH_CACHE_SIZE:
+            _EXACT_CACHE.popitem(last=False)
+    
+    if persist and os.path.isdir("temp"):
+        try:
+            with _EXACT_CACHE_DB_LOCK:
+                _exact_cache_db()[cache_key] = match_result
+        except Exception as e:
+            print(f"[WARNING] Match cache: disk store failed: {e}")
+
+@functools.lru_cache(maxsize=256)
+def _load_json_cached(file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime and size are only part of the cache key, so an edited file is read again
+    with open(file_path, 'rb') as f:
+        return orjson.loads(f.read())
 
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """
-    Load JSON data from a file
+    Load JSON data from a file (parsed files are cached until they are modified)
     
     Args:
         file_path: Path to the JSON file
@@ -23,105 +277,176 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
     Returns:
         JSON data as a dictionary
     """
-    if not os.path.exists(file_path):
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found at: {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    return data
+    # Return a copy, as callers (e.g. determine_pass_fail) may modify the data
+    return copy.deepcopy(_load_json_cached(file_path, stat.st_mtime_ns, stat.st_size))
 
-def compare_resume_with_job(resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
+def _cached_match(resume_data: Dict[str, Any], job_data: Dict[str, Any]):
     """
-    Compare a resume with a job description using the LLM
+    Look up an evaluation in the exact-match cache, then in the semantic cache
     
-    Args:
-        resume_data: Structured resume data
-        job_data: Structured job description data
-        
     Returns:
-        Matching evaluation as a dictionary
+        Tuple of (cache key, semantic cache embedding, cached evaluation or None)
+    """
+    # Check the exact-match cache first
+    cache_key = _match_cache_key(resume_data, job_data)
+    match_result = _exact_cache_get(cache_key)
+    if match_result is not None:
+        print("Using cached match result...")
+        return cache_key, None, match_result
+    
+    # Then the semantic cache
+    embedding = _MATCH_SEMANTIC_CACHE.embed(resume_data, job_data)
+    match_result = _MATCH_SEMANTIC_CACHE.lookup(embedding)
+    if match_result is not None:
+        print("Using semantically similar cached match result...")
+    return cache_key, embedding, match_result
+
+def _store_match(cache_key: str, embedding, match_result: Dict[str, Any]) -> None:
+    """
+    Add a fresh evaluation to both caches
+    """
+    _exact_cache_put(cache_key, match_result)
+    _MATCH_SEMANTIC_CACHE.add(embedding, match_result)
+
+_MISSING_KEY_ERR = "Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration"
+
+def _get_api_key(round_robin: bool = False) -> str:
+    """
+    Get the current Groq API key from the config file, or the next key in turn if round_robin is set
     """
-    # Get API key from config file
     try:
-        api_key = config.get_current_api_key()
-    except ValueError as e:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
+        api_key = config.next_api_key() if round_robin else config.get_current_api_key()
+    except ValueError:
+        api_key = None
     
     if not api_key:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
+        raise ValueError(_MISSING_KEY_ERR) from None
     
-    # Get API key from config file
-    try:
-        api_key = config.get_current_api_key()
-    except ValueError as e:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
+    return api_key
+
+# System prompt for the match evaluation. It is the same for every request and always sent
+# first, so the system turn is an identical prefix that the API can cache across requests.
+_SYSTEM_PROMPT = """\
+You are a fair and intelligent resume evaluation assistant. Your task is to compare a candidate's resume against a job description and provide a structured evaluation of the match.
+
+Compare the provided structured resume and job description data with the following priorities:
+- Technical Skills: High weight (look for exact matches and similar technologies)
+- Experience & Projects: High weight (must closely align with job responsibilities)
+- Soft Skills: Low weight (acknowledge them, but do not inflate the score)
+
+Be FAIR and INTELLIGENT in your evaluation:
+- Recognize that similar technologies (e.g., React experience can be relevant for Angular positions) should be considered
+- Consider the job level when evaluating experience (be more lenient for junior positions, stricter for senior positions)
+- Look for transferable skills and related experience
+- Consider the candidate's potential to learn rather than just current skills
+- Only count skills that are explicitly mentioned in the resume, not inferred ones
+- Require concrete evidence of experience with technologies mentioned in job description
+- Be skeptical of vague or generic project descriptions
+- Don't give benefit of the doubt for missing information
+- Penalize significantly for missing core technical skills
+- Focus on commonly known and understood technologies (avoid obscure tools like Gulp, Grunt, etc.)
+
+Generate the following scores:
+- match_score (0-100): Overall alignment between the resume and job description
+- skill_match_score (0-100): Based on overlap between technical skills required and those in the resume
+- experience_match_score (0-100): Based on both job experience and relevant projects
+
+Provide:
+- A few recruiter-style comments (short, relevant, and evidence-based)
+- A list of required skills that are missing or not strongly evident in the resume
+- A list of areas where the candidate is clearly overqualified for the job
+
+Your response should be a JSON object with the following structure:
+{
+  "match_score": (number between 0-100),
+  "skill_match_score": (number between 0-100),
+  "experience_match_score": (number between 0-100),
+  "comments": [
+    "Comment 1",
+    "Comment 2",
+    "Comment 3"
+  ],
+  "missing_skills": ["Skill 1", "Skill 2"],
+  "overqualified_in": ["Area 1", "Area 2"]
+}
+
+Notes:
+1. Consider Experience and Projects together when evaluating experience relevance and depth.
+2. Be specific and factual in your comments and evaluations.
+3. Base your evaluation only on the information provided in the resume and job description.
+4. Be honest but fair in your assessment - this is for screening candidates.
+5. Focus on commonly known and understood technologies (e.g., JavaScript, Python, React, Node.js, etc.)
+6. Avoid obscure tools like Gulp, Grunt, etc. unless explicitly mentioned.
+7. Provide your response as a valid JSON object only, with no additional text.
+"""
+_SYSTEM_MSG = {"role": "system", "content": _SYSTEM_PROMPT}
+
+# Input token budget for the resume and job description (leaving room for the prompt and the
+# response). Token counts use tiktoken if it is installed, otherwise ~4 characters per token.
+MAX_INPUT_TOKENS = 16384
+RESPONSE_TOKEN_RESERVE = 2048
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+_ENCODING = None
+
+def _count_tokens(text: str) -> int:
+    global _ENCODING
+    if not TIKTOKEN_AVAILABLE:
+        return len(text) // 4
+    if _ENCODING is None:
+        import tiktoken
+        _ENCODING = tiktoken.get_encoding("cl100k_base")
+    return len(_ENCODING.encode(text))
+
+def _fit_resume(resume_data: Dict[str, Any], job_json: str) -> str:
+    """
+    Serialize the resume, dropping the oldest positions and projects if it does not fit the token budget
     
-    if not api_key:
-        raise ValueError("Groq API key is not set. Please provide API keys in the GROQ_API_KEYS configuration")
-    
-    # System message to define the task for the LLM
-    system_message = """
-    You are a fair and intelligent resume evaluation assistant. Your task is to compare a candidate's resume against a job description and provide a structured evaluation of the match.
-    
-    Compare the provided structured resume and job description data with the following priorities:
-    - Technical Skills: High weight (look for exact matches and similar technologies)
-    - Experience & Projects: High weight (must closely align with job responsibilities)
-    - Soft Skills: Low weight (acknowledge them, but do not inflate the score)
-    
-    Be FAIR and INTELLIGENT in your evaluation:
-    - Recognize that similar technologies (e.g., React experience can be relevant for Angular positions) should be considered
-    - Consider the job level when evaluating experience (be more lenient for junior positions, stricter for senior positions)
-    - Look for transferable skills and related experience
-    - Consider the candidate's potential to learn rather than just current skills
-    - Only count skills that are explicitly mentioned in the resume, not inferred ones
-    - Require concrete evidence of experience with technologies mentioned in job description
-    - Be skeptical of vague or generic project descriptions
-    - Don't give benefit of the doubt for missing information
-    - Penalize significantly for missing core technical skills
-    - Focus on commonly known and understood technologies (avoid obscure tools like Gulp, Grunt, etc.)
-    
-    Generate the following scores:
-    - match_score (0-100): Overall alignment between the resume and job description
-    - skill_match_score (0-100): Based on overlap between technical skills required and those in the resume
-    - experience_match_score (0-100): Based on both job experience and relevant projects
-    
-    Provide:
-    - A few recruiter-style comments (short, relevant, and evidence-based)
-    - A list of required skills that are missing or not strongly evident in the resume
-    - A list of areas where the candidate is clearly overqualified for the job
-    
-    Your response should be a JSON object with the following structure:
-    {
-      "match_score": (number between 0-100),
-      "skill_match_score": (number between 0-100),
-      "experience_match_score": (number between 0-100),
-      "comments": [
-        "Comment 1",
-        "Comment 2",
-        "Comment 3"
-      ],
-      "missing_skills": ["Skill 1", "Skill 2"],
-      "overqualified_in": ["Area 1", "Area 2"]
-    }
+    Returns:
+        The resume as compact JSON
+    """
+    resume_json = orjson.dumps(resume_data).decode()
+    budget = MAX_INPUT_TOKENS - RESPONSE_TOKEN_RESERVE - _count_tokens(_SYSTEM_PROMPT) - _count_tokens(job_json)
+    if _count_tokens(resume_json) <= budget:
+        return resume_json
     
-    Notes:
-    1. Consider Experience and Projects together when evaluating experience relevance and depth.
-    2. Be specific and factual in your comments and evaluations.
-    3. Base your evaluation only on the information provided in the resume and job description.
-    4. Be honest but fair in your assessment - this is for screening candidates.
-    5. Focus on commonly known and understood technologies (e.g., JavaScript, Python, React, Node.js, etc.)
-    6. Avoid obscure tools like Gulp, Grunt, etc. unless explicitly mentioned.
-    7. Provide your response as a valid JSON object only, with no additional text.
+    # Positions and projects are listed newest first, so drop from the end. Copy only the
+    # containers being trimmed; the caller's data (and the cache key made from it) is untouched.
+    resume_data = dict(resume_data)
+    experience = resume_data.get("Experience")
+    if isinstance(experience, dict) and isinstance(experience.get("Positions"), list):
+        experience = resume_data["Experience"] = dict(experience)
+        positions = experience["Positions"] = list(experience["Positions"])
+    else:
+        positions = []
+    projects = resume_data.get("Projects")
+    projects = resume_data["Projects"] = list(projects) if isinstance(projects, list) else []
+    
+    while len(positions) > 1 or len(projects) > 1:
+        (positions if len(positions) > 1 else projects).pop()
+        resume_json = orjson.dumps(resume_data).decode()
+        if _count_tokens(resume_json) <= budget:
+            break
+    return resume_json
+
+def _build_match_messages(resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> List[Dict[str, str]]:
     """
+    Build the chat messages asking the LLM to evaluate a resume against a job description
+    """
+    job_json = orjson.dumps(job_data).decode()
     
-    # Prepare user message with resume and job description data
+    # Prepare user message with resume and job description data. The JSON is compact:
+    # indentation only adds input tokens, the model reads it just as well without it.
     user_message = f"""
     RESUME DATA:
-    {json.dumps(resume_data, indent=2)}
+    {_fit_resume(resume_data, job_json)}
     
     JOB DESCRIPTION DATA:
-    {json.dumps(job_data, indent=2)}
+    {job_json}
     
     Please evaluate the match between this resume and job description.
     
@@ -135,88 +460,280 @@ def compare_resume_with_job(resume_data: Dict[str, Any], job_data: Dict[str, Any
     7. Avoid obscure tools like Gulp, Grunt, etc. unless explicitly mentioned.
     """
     
-    # Prepare the request
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    # Prepare the request payload
-    payload = {
-        "messages": [
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": user_message}
-        ],
-        "model": config.MODEL_NAME,
-        "temperature": config.TEMPERATURE
-    }
-    
-    # Make the API request
-    max_retries = 5
-    base_delay = 2  # base delay in seconds
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            
-            # If successful, no need to retry
-            if response.status_code == 200:
-                break
-                
-            # If rate limited or quota exceeded, try next API key
-            if response.status_code == 429 or "quota" in response.text.lower():
-                print(f"API key quota exceeded. Trying next API key...")
-                api_key = config.cycle_api_key()
-                headers["Authorization"] = f"Bearer {api_key}"
-                continue
-                
-            # For other errors, raise exception
-            response.raise_for_status()
-            
-        except requests.exceptions.RequestException as e:
-            # If last attempt, raise the exception
-            if attempt == max_retries - 1:
-                raise Exception(f"Error in Groq API request after {max_retries} attempts: {str(e)}")
-            
-            # Otherwise, wait and retry
-            delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
-            print(f"Request failed. Retrying in {delay:.2f} seconds...")
-            time.sleep(delay)
+    # Prepare the chat messages
+    return [
+        _SYSTEM_MSG,
+        {"role": "user", "content": user_message}
+    ]
+
+# Score fields the pass/fail decision depends on. They come first in the requested JSON
+# format, so a streamed response usually contains all three well before it is complete.
+SCORE_FIELDS = ("match_score", "skill_match_score", "experience_match_score")
+SCORE_FIELD_RE = re.compile(r'"(match_score|skill_match_score|experience_match_score)"\s*:\s*(-?\d+(?:\.\d+)?)\s*[,}]')
+
+def _read_match_stream(stream, on_scores: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
+    """
+    Collect the content of a streamed completion, calling on_scores as soon as all score fields have arrived
     
-    # Parse the response
-    try:
-        result = response.json()
+    Args:
+        stream: Iterator of chat completion chunks
+        on_scores: Optional callback receiving a dict of the three scores
         
-        # Extract content from the response
-        content = result["choices"][0]["message"]["content"]
+    Returns:
+        The full response content
+    """
+    parts = []
+    scores = {}
+    scanned = ""
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        parts.append(delta)
         
+        if on_scores is not None and len(scores) < len(SCORE_FIELDS):
+            # Only rescan the unmatched tail, so a field split across chunks is still found.
+            # A number only counts once its terminator has arrived, as more digits may follow.
+            scanned += delta
+            end = 0
+            for field_match in SCORE_FIELD_RE.finditer(scanned):
+                value = field_match.group(2)
+                scores[field_match.group(1)] = float(value) if "." in value else int(value)
+                end = field_match.end()
+            scanned = scanned[end:]
+            if len(scores) == len(SCORE_FIELDS):
+                on_scores(dict(scores))
+    
+    return "".join(parts)
+
+# Matches a JSON object wrapped in a markdown code fence in the LLM response
+FENCED_JSON_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+def _parse_match_content(content: str) -> Dict[str, Any]:
+    """
+    Parse the evaluation JSON out of the LLM response content
+    """
+    try:
         # Extract JSON from the content
         try:
             # Try to parse the response as JSON directly
             match_result = json.loads(content)
             
-            return match_result
-            
         except json.JSONDecodeError:
             # If direct parsing fails, try to extract JSON from markdown code blocks
-            import re
-            json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', content, re.DOTALL)
+            json_match = FENCED_JSON_RE.search(content)
             if json_match:
                 match_result = json.loads(json_match.group(1))
-                
-                return match_result
             else:
                 # If all else fails, raise an error with the content for debugging
                 raise Exception(f"Could not parse JSON from LLM response. Content: {content[:500]}...")
         
+        return match_result
+        
     except Exception as e:
         print(f"Error processing LLM response: {str(e)}")
         raise
 
+def compare_resume_with_job(resume_data: Dict[str, Any], job_data: Dict[str, Any],
+                            on_scores: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Compare a resume with a job description using the LLM
+    
+    Args:
+        resume_data: Structured resume data
+        job_data: Structured job description data
+        on_scores: Optional callback called with the match scores as soon as they have been
+            streamed, before the rest of the evaluation (comments, skills) is complete
+        
+    Returns:
+        Matching evaluation as a dictionary
+    """
+    # Check the caches first
+    cache_key, embedding, match_result = _cached_match(resume_data, job_data)
+    if match_result is not None:
+        if on_scores is not None:
+            on_scores({field: match_result.get(field, 0) for field in SCORE_FIELDS})
+        return match_result
+    
+    # Get API key from config file
+    api_key = _get_api_key()
+    
+    # Prepare the chat messages
+    messages = _build_match_messages(resume_data, job_data)
+    
+    # Make the API request through the shared Groq client. This loop rotates API keys on rate
+    # limits and retries connection errors and server errors (the SDK's own retries are off).
+    import groq
+    client = _get_groq_client()
+    
+    for attempt in range(MAX_RETRIES):
+        try:
+            # Stream the response so the scores are available before the full evaluation. Groq doesn't
+            # stream in JSON mode, so no response_format here: the prompt asks for JSON only, and
+            # _parse_match_content also accepts it inside a code fence
+            stream = client.with_options(api_key=api_key, max_retries=0).chat.completions.create(
+                model=config.MODEL_NAME,
+                messages=messages,
+                temperature=config.TEMPERATURE,
+                stream=True
+            )
+            content = _read_match_stream(stream, on_scores)
+            break
+            
+        except groq.RateLimitError:
+            # If rate limited or quota exceeded, try next API key
+            print(f"API key quota exceeded. Trying next API key...")
+            api_key = config.cycle_api_key(api_key)
+            
+        except (groq.APIConnectionError, groq.InternalServerError) as e:
+            print(f"Transient Groq API error ({e}). Retrying...")
+            time.sleep(RETRY_BACKOFF_BASE * 2 ** attempt)
+            
+        except groq.APIError as e:
+            raise Exception(f"Error in Groq API request: {str(e)}")
+    else:
+        raise Exception(f"Groq API request failed on {MAX_RETRIES} attempts (rate limits or transient errors)")
+    
+    # Parse the response
+    match_result = _parse_match_content(content)
+    _store_match(cache_key, embedding, match_result)
+    return match_result
+
+async def compare_resume_with_job_async(resume_data: Dict[str, Any], job_data: Dict[str, Any],
+                                        client) -> Dict[str, Any]:
+    """
+    Async version of compare_resume_with_job, so several evaluations can wait on the API concurrently
+    
+    Args:
+        resume_data: Structured resume data
+        job_data: Structured job description data
+        client: groq.AsyncGroq client to send the request with
+        
+    Returns:
+        Matching evaluation as a dictionary
+    """
+    import asyncio
+    import groq
+    
+    # Check the caches first (embedding is CPU-bound, so keep it off the event loop)
+    cache_key, embedding, match_result = await asyncio.to_thread(_cached_match, resume_data, job_data)
+    if match_result is not None:
+        return match_result
+    
+    # Concurrent requests take keys in turn, so a batch spreads over all the per-key rate limits
+    api_key = _get_api_key(round_robin=True)
+    messages = _build_match_messages(resume_data, job_data)
+    
+    # On a rate limit move on to the next key; retry connection and server errors on the same key
+    for attempt in range(MAX_RETRIES):
+        try:
+            completion = await client.with_options(api_key=api_key, max_retries=0).chat.completions.create(
+                model=config.MODEL_NAME,
+                messages=messages,
+                temperature=config.TEMPERATURE,
+                response_format={"type": "json_object"}
+            )
+            break
+            
+        except groq.RateLimitError:
+            print(f"API key quota exceeded. Trying next API key...")
+            api_key = _get_api_key(round_robin=True)
+            
+        except (groq.APIConnectionError, groq.InternalServerError) as e:
+            print(f"Transient Groq API error ({e}). Retrying...")
+            await asyncio.sleep(RETRY_BACKOFF_BASE * 2 ** attempt)
+            
+        except groq.APIError as e:
+            raise Exception(f"Error in Groq API request: {str(e)}")
+    else:
+        raise Exception(f"Groq API request failed on {MAX_RETRIES} attempts (rate limits or transient errors)")
+    
+    match_result = _parse_match_content(completion.choices[0].message.content)
+    _store_match(cache_key, embedding, match_result)
+    return match_result
+
+# Local prefilter: a pair is rejected without calling the LLM if the resume covers less than
+# QUICK_REJECT_SKILL_COVERAGE of the required technical skills AND has less than
+# QUICK_REJECT_EXPERIENCE_RATIO of the required years of experience
+QUICK_REJECT_SKILL_COVERAGE = 0.1
+QUICK_REJECT_EXPERIENCE_RATIO = 0.3
+QUICK_REJECT_MIN_SKILLS = 3  # too few required skills to judge coverage on
+NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+SKILL_PUNCTUATION_RE = re.compile(r"[\s._-]+")
+
+# Common spellings of the same skill, after lowercasing and removing spaces, dots and dashes
+SKILL_SYNONYMS = {
+    "reactjs": "react", "js": "javascript", "ts": "typescript", "nodejs": "node",
+    "vuejs": "vue", "angularjs": "angular", "nextjs": "next",
+    "expressjs": "express", "golang": "go", "postgres": "postgresql", "py": "python",
+    "k8s": "kubernetes", "mongo": "mongodb", "csharp": "c#", "html5": "html", "css3": "css",
+}
+
+def _normalize_skill(skill: str) -> str:
+    skill = SKILL_PUNCTUATION_RE.sub("", str(skill).lower())
+    return SKILL_SYNONYMS.get(skill, skill)
+
+def _first_number(value) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    number = NUMBER_RE.search(str(value or ""))
+    return float(number.group()) if number else None
+
+def _required_skills(job_data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Required technical skills of a job, as {normalized skill: skill as written}
+    """
+    required = (job_data.get("skills_required") or {}).get("technical_skills") or []
+    return {_normalize_skill(skill): skill for skill in required if isinstance(skill, str)}
+
+def _resume_skills(resume_data: Dict[str, Any]) -> set:
+    return {_normalize_skill(skill) for skill in resume_data.get("Skills") or [] if isinstance(skill, str)}
+
+def _resume_years(resume_data: Dict[str, Any]) -> float:
+    experience = resume_data.get("Experience")
+    return _first_number(experience.get("Total Years") if isinstance(experience, dict) else None) or 0.0
+
+def quick_reject(resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Cheaply reject an obviously mismatched pair without calling the LLM
+    
+    Args:
+        resume_data: Structured resume data
+        job_data: Structured job description data
+        
+    Returns:
+        A low-score evaluation in the usual format if the pair is rejected, otherwise None
+    """
+    required = _required_skills(job_data)
+    required_years = _first_number((job_data.get("experience_required") or {}).get("years_of_experience"))
+    if len(required) < QUICK_REJECT_MIN_SKILLS or not required_years:
+        return None
+    
+    years = _resume_years(resume_data)
+    skills = _resume_skills(resume_data)
+    
+    coverage = len(required.keys() & skills) / len(required)
+    experience_ratio = years / required_years
+    if coverage >= QUICK_REJECT_SKILL_COVERAGE or experience_ratio >= QUICK_REJECT_EXPERIENCE_RATIO:
+        return None
+    
+    skill_score = round(100 * coverage)
+    experience_score = round(100 * experience_ratio)
+    return {
+        "match_score": (skill_score + experience_score) // 2,
+        "skill_match_score": skill_score,
+        "experience_match_score": experience_score,
+        "comments": [
+            f"The resume lists {len(required.keys() & skills)} of the {len(required)} required technical skills.",
+            f"The candidate has {years:g} years of experience against {required_years:g} required.",
+        ],
+        "missing_skills": [name for key, name in required.items() if key not in skills],
+        "overqualified_in": [],
+        "quick_reject": True
+    }
+
 def evaluate_match_from_json(resume_data: Dict[str, Any], job_data: Dict[str, Any],
                            overall_threshold: int = 70, skill_threshold: int = 65, 
                            experience_threshold: int = 60) -> Dict[str, Any]:
@@ -233,14 +750,387 @@ def evaluate_match_from_json(resume_data: Dict[str, Any], job_data: Dict[str, An
     Returns:
         Matching evaluation as a dictionary
     """
-    # Compare resume with job description
-    evaluation = compare_resume_with_job(resume_data, job_data)
+    # Compare resume with job description, unless the pair can be rejected without the LLM
+    evaluation = quick_reject(resume_data, job_data) or compare_resume_with_job(resume_data, job_data)
     
     # Determine pass/fail status based on thresholds and check for fraud
     evaluation = determine_pass_fail(evaluation, overall_threshold, skill_threshold, experience_threshold, resume_data)
     
     return evaluation
 
+# Evaluations of a batch that may wait on the API at once; more would only hit the rate limits
+BATCH_MAX_CONCURRENCY = config.GROQ_CONCURRENCY
+
+def _error_evaluation(error: Exception) -> Dict[str, Any]:
+    """
+    Evaluation recorded for a pair whose evaluation failed: zero scores, so it fails the thresholds
+    """
+    evaluation = {field: 0 for field in SCORE_FIELDS}
+    evaluation.update({
+        "comments": [f"Evaluation failed: {error}"],
+        "missing_skills": [],
+        "overqualified_in": [],
+        "error": str(error)
+    })
+    return evaluation
+
+async def _gather_evaluations(evaluate: Callable, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Run evaluate(resume_data, job_data) for every pair, at most BATCH_MAX_CONCURRENCY at a time.
+    A pair that raises gets an error evaluation instead of failing the whole batch.
+    """
+    import asyncio
+    
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    
+    async def _bounded(resume_data, job_data):
+        async with semaphore:
+            return await evaluate(resume_data, job_data)
+    
+    results = await asyncio.gather(*(_bounded(resume_data, job_data) for resume_data, job_data in pairs),
+                                   return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+    return [_error_evaluation(result) if isinstance(result, Exception) else result for result in results]
+
+async def evaluate_matches_batch(pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                                 overall_threshold: int = 70, skill_threshold: int = 65,
+                                 experience_threshold: int = 60) -> List[Dict[str, Any]]:
+    """
+    Evaluate several (resume, job description) pairs concurrently
+    
+    Args:
+        pairs: List of (resume_data, job_data) tuples
+        overall_threshold: Minimum required overall match score
+        skill_threshold: Minimum required skill match score
+        experience_threshold: Minimum required experience match score
+        
+    Returns:
+        Matching evaluations, in the same order as pairs
+    """
+    async with _new_async_groq_client() as client:
+        async def _evaluate(resume_data, job_data):
+            # Obviously mismatched pairs are rejected without calling the LLM
+            rejected = quick_reject(resume_data, job_data)
+            return rejected or await compare_resume_with_job_async(resume_data, job_data, client)
+        
+        evaluations = await _gather_evaluations(_evaluate, pairs)
+    
+    # Determine pass/fail status based on thresholds and check for fraud
+    return determine_pass_fail_batch(evaluations, overall_threshold, skill_threshold, experience_threshold,
+                                     [resume_data for resume_data, _ in pairs])
+
+def evaluate_matches_parallel(pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                              overall_threshold: int = 70, skill_threshold: int = 65,
+                              experience_threshold: int = 60) -> List[Dict[str, Any]]:
+    """
+    Synchronous wrapper around evaluate_matches_batch (for callers without an event loop)
+    """
+    import asyncio
+    return asyncio.run(evaluate_matches_batch(pairs, overall_threshold, skill_threshold, experience_threshold))
+
+# Column summaries of bulk screening results are written with pyarrow, if it is installed
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+def write_results_jsonl(results: List[Dict[str, Any]], path: str, candidate_ids: List[str] = None) -> None:
+    """
+    Write evaluations as JSON Lines, plus a columnar summary next to it for analytics
+    
+    The summary (<path without extension>.summary.parquet) has one column per field:
+    candidate_id, match_score, skill_match_score, experience_match_score and status,
+    so filtering a large screening run only reads the columns it needs.
+    
+    Args:
+        results: Evaluations, e.g. as returned by submit_batch_evaluation
+        path: Output path for the JSONL file
+        candidate_ids: Optional id per result (defaults to the position in results)
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        for result in results:
+            f.write(orjson.dumps(result))
+            f.write(b"\n")
+    
+    if not PYARROW_AVAILABLE:
+        return
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    if candidate_ids is None:
+        candidate_ids = [str(i) for i in range(len(results))]
+    columns = {"candidate_id": [str(candidate_id) for candidate_id in candidate_ids]}
+    for field in SCORE_FIELDS:
+        columns[field] = [result.get(field) for result in results]
+    columns["status"] = [(result.get("pass_fail") or {}).get("status") for result in results]
+    pq.write_table(pa.table(columns), os.path.splitext(path)[0] + ".summary.parquet")
+
+# Screening one resume against many jobs: all jobs are ranked by embedding similarity to the
+# resume and only the RANK_TOP_K best are evaluated by the LLM. Embeddings are cached on disk
+# by content digest (if the temp directory exists).
+RANK_TOP_K = 5
+EMBEDDING_CACHE_DIR = os.path.join("temp", "cache", "embeddings")
+_EMBEDDER = SemanticCache("ranking")
+
+def _document_embedding(data: Dict[str, Any]):
+    """
+    Embed the score-driving fields of a structured document (resume or job description),
+    reusing the on-disk copy if there is one
+    
+    Returns:
+        The normalized embedding, or None if embeddings are unavailable
+    """
+    if not _EMBEDDER.enabled:
+        return None
+    import numpy as np
+    
+    # Title, skills, experience and responsibilities rather than the whole document, whose
+    # JSON would be cut off by the model before it reaches the skills
+    text = _profile_text(data)
+    digest = hashlib.blake2b(f"{config.SEMANTIC_CACHE_MODEL}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+    cache_file = os.path.join(EMBEDDING_CACHE_DIR, f"{digest}.npy")
+    try:
+        return np.load(cache_file)
+    except (OSError, ValueError):
+        pass
+    
+    embedding = _EMBEDDER.embed(text)
+    os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=EMBEDDING_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, embedding)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        os.unlink(tmp_path)
+    return embedding
+
+def precompute_resume_embedding(resume_data: Dict[str, Any]):
+    """
+    Embed a resume once, to rank many job descriptions against it
+    
+    Args:
+        resume_data: Structured resume data
+        
+    Returns:
+        Normalized numpy embedding, or None if sentence-transformers is not installed
+        or the temp directory does not exist
+    """
+    return _document_embedding(resume_data)
+
+def _local_evaluation(resume_data: Dict[str, Any], job_data: Dict[str, Any], similarity: float = None) -> Dict[str, Any]:
+    """
+    Estimate an evaluation without the LLM, from skill coverage, years of experience and embedding similarity
+    """
+    required = _required_skills(job_data)
+    skills = _resume_skills(resume_data)
+    required_years = _first_number((job_data.get("experience_required") or {}).get("years_of_experience"))
+    
+    skill_score = round(100 * len(required.keys() & skills) / len(required)) if required else 0
+    experience_score = round(100 * min(1.0, _resume_years(resume_data) / required_years)) if required_years else 0
+    match_score = round(100 * max(0.0, similarity)) if similarity is not None else (skill_score + experience_score) // 2
+    return {
+        "match_score": match_score,
+        "skill_match_score": skill_score,
+        "experience_match_score": experience_score,
+        "comments": ["Estimated locally: this job ranked below the jobs evaluated in detail for this resume."],
+        "missing_skills": [name for key, name in required.items() if key not in skills],
+        "overqualified_in": [],
+        "local_score": True
+    }
+
+def evaluate_resume_against_jobs(resume_data: Dict[str, Any], jobs: List[Dict[str, Any]], top_k: int = RANK_TOP_K,
+                                 overall_threshold: int = 70, skill_threshold: int = 65,
+                                 experience_threshold: int = 60) -> List[Dict[str, Any]]:
+    """
+    Screen one resume against many job descriptions, calling the LLM only for the best-matching jobs
+    
+    Jobs are ranked by cosine similarity between the resume embedding (computed once) and each
+    job embedding, or by required skill coverage if embeddings are unavailable. The top_k jobs
+    get a full LLM evaluation; the others get a local estimate (marked with "local_score").
+    
+    Args:
+        resume_data: Structured resume data
+        jobs: Structured job description data, one per job
+        top_k: Number of best-ranked jobs to evaluate with the LLM
+        overall_threshold: Minimum required overall match score
+        skill_threshold: Minimum required skill match score
+        experience_threshold: Minimum required experience match score
+        
+    Returns:
+        Matching evaluations, in the same order as jobs
+    """
+    resume_embedding = precompute_resume_embedding(resume_data)
+    if resume_embedding is not None:
+        similarities = [float(resume_embedding @ _document_embedding(job_data)) for job_data in jobs]
+    else:
+        skills = _resume_skills(resume_data)
+        required = [_required_skills(job_data) for job_data in jobs]
+        similarities = [len(job_skills.keys() & skills) / max(1, len(job_skills)) for job_skills in required]
+    
+    ranked = sorted(range(len(jobs)), key=similarities.__getitem__, reverse=True)
+    top = ranked[:top_k]
+    
+    evaluations: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    for index, evaluation in zip(top, evaluate_matches_parallel([(resume_data, jobs[index]) for index in top],
+                                                                overall_threshold, skill_threshold,
+                                                                experience_threshold)):
+        evaluations[index] = evaluation
+    for index in ranked[top_k:]:
+        similarity = similarities[index] if resume_embedding is not None else None
+        evaluations[index] = determine_pass_fail(_local_evaluation(resume_data, jobs[index], similarity),
+                                                 overall_threshold, skill_threshold, experience_threshold,
+                                                 resume_data)
+    return evaluations
+
+# Batch API polling: start at BATCH_POLL_INTERVAL seconds, doubling up to BATCH_POLL_MAX_INTERVAL,
+# and give up (cancel and fall back to concurrent realtime requests) after BATCH_TIMEOUT seconds
+BATCH_POLL_INTERVAL = 5
+BATCH_POLL_MAX_INTERVAL = 60
+BATCH_TIMEOUT = 30 * 60
+
+def _wait_for_batch(client, batch_id: str, timeout: float):
+    """
+    Poll a batch with exponential backoff until it finishes or the timeout expires
+    
+    Returns:
+        The finished batch object, or None if it timed out (the batch is cancelled)
+    """
+    deadline = time.monotonic() + timeout
+    interval = BATCH_POLL_INTERVAL
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in ("completed", "failed", "expired", "cancelled"):
+            return batch
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"Batch {batch_id} did not finish within {timeout} seconds. Cancelling...")
+            try:
+                client.batches.cancel(batch_id)
+            except Exception as e:
+                print(f"Warning: Could not cancel batch {batch_id}: {e}")
+            return None
+        
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, BATCH_POLL_MAX_INTERVAL)
+
+def submit_batch_evaluation(pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]], output_path: str = None,
+                            overall_threshold: int = 70, skill_threshold: int = 65,
+                            experience_threshold: int = 60, timeout: float = BATCH_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Evaluate a pool of (resume, job description) pairs through the Groq Batch API
+    
+    Intended for bulk offline screening: batch requests are cheaper and are not subject to
+    the per-request rate limits. Pairs that are already cached are not submitted. If the
+    batch does not finish within the timeout, or some requests in it fail, the remaining
+    pairs are evaluated with evaluate_matches_batch instead.
+    
+    Args:
+        pairs: List of (resume_data, job_data) tuples
+        output_path: Optional path to save the evaluations as a JSON list (or as JSON Lines,
+            via write_results_jsonl, if it ends with .jsonl)
+        overall_threshold: Minimum required overall match score
+        skill_threshold: Minimum required skill match score
+        experience_threshold: Minimum required experience match score
+        timeout: Seconds to wait for the batch before falling back to realtime requests
+        
+    Returns:
+        Matching evaluations, in the same order as pairs
+    """
+    evaluations: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+    pending = {}  # custom_id -> (index, cache key, embedding)
+    lines = []
+    
+    for index, (resume_data, job_data) in enumerate(pairs):
+        cache_key, embedding, match_result = _cached_match(resume_data, job_data)
+        if match_result is not None:
+            evaluations[index] = match_result
+            continue
+        
+        custom_id = uuid.uuid4().hex
+        pending[custom_id] = (index, cache_key, embedding)
+        lines.append(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": config.MODEL_NAME,
+                "messages": _build_match_messages(resume_data, job_data),
+                "temperature": config.TEMPERATURE,
+                "response_format": {"type": "json_object"}
+            }
+        }, ensure_ascii=False))
+    
+    if pending:
+        import groq
+        client = _get_groq_client().with_options(api_key=_get_api_key())
+        
+        try:
+            batch_file = client.files.create(
+                file=("match_batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            print(f"Submitted batch {batch.id} with {len(pending)} evaluations. Waiting for results...")
+            batch = _wait_for_batch(client, batch.id, timeout)
+        except groq.APIError as e:
+            print(f"Batch submission failed ({e}). Falling back to realtime requests...")
+            batch = None
+        
+        # Collect the successful results; anything else stays pending for the fallback
+        if batch is not None and batch.output_file_id:
+            output = client.files.content(batch.output_file_id).text()
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                entry = pending.get(result.get("custom_id"))
+                response = result.get("response") or {}
+                if entry is None or response.get("status_code") != 200:
+                    continue
+                try:
+                    match_result = _parse_match_content(response["body"]["choices"][0]["message"]["content"])
+                except Exception:
+                    continue
+                index, cache_key, embedding = entry
+                _store_match(cache_key, embedding, match_result)
+                evaluations[index] = match_result
+                del pending[result["custom_id"]]
+        
+        if pending:
+            print(f"{len(pending)} evaluations were not returned by the batch. Evaluating them directly...")
+            import asyncio
+            
+            async def _evaluate_remaining():
+                async with _new_async_groq_client() as async_client:
+                    return await _gather_evaluations(
+                        lambda resume_data, job_data: compare_resume_with_job_async(resume_data, job_data, async_client),
+                        [pairs[index] for index, _, _ in pending.values()]
+                    )
+            
+            for (index, _, _), match_result in zip(pending.values(), asyncio.run(_evaluate_remaining())):
+                evaluations[index] = match_result
+    
+    # Determine pass/fail status based on thresholds and check for fraud
+    evaluations = determine_pass_fail_batch(evaluations, overall_threshold, skill_threshold, experience_threshold,
+                                            [resume_data for resume_data, _ in pairs])
+    
+    # Save to file if output path is provided (.jsonl paths get JSON Lines and a column summary)
+    if output_path and output_path.endswith(".jsonl"):
+        write_results_jsonl(evaluations, output_path,
+                            [resume_data.get("Name") or i for i, (resume_data, _) in enumerate(pairs)])
+    elif output_path:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(evaluations, f, indent=2, ensure_ascii=False)
+    
+    return evaluations
+
 def evaluate_match(resume_file: str, job_file: str, output_file: str = None,
                 overall_threshold: int = 70, skill_threshold: int = 65, 
                 experience_threshold: int = 60) -> Dict[str, Any]:
@@ -291,6 +1181,72 @@ def determine_pass_fail(evaluation: Dict[str, Any],
         experience_threshold: Minimum required experience match score (default: 60)
         resume_data: Original resume data for fraud detection
         
+    Returns:
+        Updated evaluation dictionary with pass/fail status
+    """
+    # Extract scores (a missing or null score counts as 0, so it fails)
+    overall_score = evaluation.get('match_score') or 0
+    skill_score = evaluation.get('skill_match_score') or 0
+    experience_score = evaluation.get('experience_match_score') or 0
+    
+    return _apply_pass_fail(evaluation, resume_data,
+                            (overall_score < overall_threshold,
+                             skill_score < skill_threshold,
+                             experience_score < experience_threshold),
+                            (overall_threshold, skill_threshold, experience_threshold))
+
+def determine_pass_fail_batch(evaluations: List[Dict[str, Any]],
+                              overall_threshold: int = 70,
+                              skill_threshold: int = 65,
+                              experience_threshold: int = 60,
+                              resume_batch: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Determine pass/fail for a batch of evaluations, comparing all scores against the thresholds at once
+    
+    Args:
+        evaluations: The evaluation dictionaries with match scores
+        overall_threshold: Minimum required overall match score (default: 70)
+        skill_threshold: Minimum required skill match score (default: 65)
+        experience_threshold: Minimum required experience match score (default: 60)
+        resume_batch: Original resume data for fraud detection, in the same order as evaluations
+        
+    Returns:
+        Updated evaluation dictionaries with pass/fail status
+    """
+    if resume_batch is None:
+        resume_batch = [None] * len(evaluations)
+    thresholds = (overall_threshold, skill_threshold, experience_threshold)
+    
+    try:
+        import numpy as np
+    except ImportError:
+        return [
+            determine_pass_fail(evaluation, *thresholds, resume_data)
+            for evaluation, resume_data in zip(evaluations, resume_batch)
+        ]
+    
+    # One [N, 3] comparison instead of three scalar comparisons per evaluation
+    scores = np.array([[evaluation.get(field, 0) for field in SCORE_FIELDS] for evaluation in evaluations],
+                      dtype=np.float64).reshape(-1, len(SCORE_FIELDS))
+    # Written as "not >=" so a missing (None -> NaN) score fails instead of passing
+    fails = (~(scores >= np.array(thresholds, dtype=np.float64))).tolist()
+    
+    return [
+        _apply_pass_fail(evaluation, resume_data, row, thresholds)
+        for evaluation, resume_data, row in zip(evaluations, resume_batch, fails)
+    ]
+
+def _apply_pass_fail(evaluation: Dict[str, Any], resume_data: Dict[str, Any],
+                     fails: Tuple[bool, bool, bool], thresholds: Tuple[int, int, int]) -> Dict[str, Any]:
+    """
+    Add the pass/fail status and feedback message to an evaluation
+    
+    Args:
+        evaluation: The evaluation dictionary with match scores
+        resume_data: Original resume data for fraud detection
+        fails: Whether the overall, skill and experience scores are below their thresholds
+        thresholds: The overall, skill and experience thresholds
+        
     Returns:
         Updated evaluation dictionary with pass/fail status
     """
@@ -306,14 +1262,11 @@ def determine_pass_fail(evaluation: Dict[str, Any],
             fraud_type = resume_data.get("fraud_type", None)
             red_flags = resume_data.get("red_flags", [])
     
-    # Extract scores
-    overall_score = evaluation.get('match_score', 0)
-    skill_score = evaluation.get('skill_match_score', 0)
-    experience_score = evaluation.get('experience_match_score', 0)
+    overall_failed, skill_failed, experience_failed = fails
+    overall_threshold, skill_threshold, experience_threshold = thresholds
     
     # Get missing skills and areas of improvement
     missing_skills = evaluation.get('missing_skills', [])
-    comments = evaluation.get('comments', [])
     
     # Check minimum requirements or fraudulent resume
     failed_criteria = []
@@ -330,14 +1283,14 @@ def determine_pass_fail(evaluation: Dict[str, Any],
         evaluation['experience_match_score'] = 0
     else:
         # Normal criteria checking for non-fraudulent resumes
-        if overall_score < overall_threshold:
-            failed_criteria.append(f"Overall match score ({overall_score}) below minimum threshold ({overall_threshold})")
+        if overall_failed:
+            failed_criteria.append(f"Overall match score ({evaluation.get('match_score', 0)}) below minimum threshold ({overall_threshold})")
         
-        if skill_score < skill_threshold:
-            failed_criteria.append(f"Skill match score ({skill_score}) below minimum threshold ({skill_threshold})")
+        if skill_failed:
+            failed_criteria.append(f"Skill match score ({evaluation.get('skill_match_score', 0)}) below minimum threshold ({skill_threshold})")
         
-        if experience_score < experience_threshold:
-            failed_criteria.append(f"Experience match score ({experience_score}) below minimum threshold ({experience_threshold})")
+        if experience_failed:
+            failed_criteria.append(f"Experience match score ({evaluation.get('experience_match_score', 0)}) below minimum threshold ({experience_threshold})")
     
     # Determine pass/fail status
     is_pass = not failed_criteria and not is_fraudulent
@@ -380,9 +1333,9 @@ def determine_pass_fail(evaluation: Dict[str, Any],
             message += f"We recommend focusing on developing the following key skills: {', '.join(missing_skills[:5])}. "
         
         # Add encouragement
-        if skill_score < skill_threshold:
+        if skill_failed:
             message += "Acquiring additional technical expertise in these areas would significantly enhance your candidacy for similar roles in the future. "
-        elif experience_score < experience_threshold:
+        elif experience_failed:
             message += "Gaining more practical experience in these areas would significantly enhance your profile for similar positions. "
         
         message += "We appreciate your application and encourage you to continue developing your skills in these areas."
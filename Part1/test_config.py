@@ -27,7 +27,6 @@ try:
     for i, key in enumerate(config.GROQ_API_KEYS):
         print(f"API Key {i+1}: {key[:10]}...")
     
-    print(f"Current API key index: {config.CURRENT_API_KEY_INDEX}")
     print(f"Current API key: {config.get_current_api_key()[:10]}...")
     print(f"Model name: {config.MODEL_NAME}")
     print(f"Temperature: {config.TEMPERATURE}")
@@ -13,7 +13,6 @@ try:
     import config
     print("Config imported successfully!")
     print(f"Number of API keys: {len(config.GROQ_API_KEYS)}")
-    print(f"Current API key index: {config.CURRENT_API_KEY_INDEX}")
     print(f"Current API key: {config.get_current_api_key()[:10]}...")
     
     # Test cycling through API keys
@@ -8,7 +8,8 @@ import os
 import re
 import sys
 import json
-import uuid
+import math
+import asyncio
 from typing import Dict, List, Any
 
 from langchain_groq import ChatGroq
@@ -17,6 +18,26 @@ from langchain_core.messages import HumanMessage, SystemMessage
 # Allow importing config.py from project root
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import config
+from quiz_prompts import (
+    LEVEL_DESCRIPTIONS, DEFAULT_LEVEL_DESCRIPTION,
+    SCORER_LEVEL_DESCRIPTIONS, DEFAULT_SCORER_LEVEL_DESCRIPTION, RUBRIC
+)
+from quiz_io import QUESTION_SPLIT, QUESTION_FIELDS, question_key, run_async, save_quiz
+
+# Maximum number of scoring requests in flight at once (keeps bursts under the Groq rate limits)
+SCORER_MAX_CONCURRENCY = 4
+# Questions scored together in one request; larger batches make each response slower
+SCORER_BATCH_SIZE = 20
+# While the generator is still streaming, questions are sent to the scorer in groups of this size
+STREAM_SCORE_BATCH = 5
+# Each generation round asks for this many times the questions still needed, so that after
+# the scorer rejects some there are usually enough left without another round
+OVERFETCH_FACTOR = 1.5
+# Shorter question texts are rejected without asking the scorer
+MIN_QUESTION_LENGTH = 20
+
+# JSON array in the scorer's reply, with or without a markdown code fence around it
+_VERDICTS_RE = re.compile(r"\[.*\]", re.DOTALL)
 
 
 # ==============================
@@ -25,28 +46,20 @@ import config
 class QuestionGeneratorAgent:
     """Generates multiple-choice technical questions."""
 
-    def __init__(self):
-        api_key = config.get_current_api_key()
-        self.llm = ChatGroq(api_key=api_key, model_name=config.MODEL_NAME)
+    def __init__(self, llm: ChatGroq = None):
+        if llm is None:
+            llm = ChatGroq(api_key=config.get_current_api_key(), model_name=config.MODEL_NAME)
+        self.llm = llm
         print("🧩 QuestionGeneratorAgent initialized.")
 
-    def generate_questions(self, job_data: Dict[str, Any], num_questions: int) -> List[Dict[str, Any]]:
+    def _build_messages(self, job_data: Dict[str, Any], num_questions: int) -> list:
         job_title = job_data.get("job_title", "Unknown Title")
         skills = ", ".join(job_data.get("skills_required", {}).get("technical_skills", []))
         responsibilities = "; ".join(job_data.get("job_responsibilities", []))
         experience = job_data.get("experience_required", {}).get("years_of_experience", "Not specified")
         level = job_data.get("experience_required", {}).get("level", "Not specified")
 
-        # Define difficulty descriptions
-        level_descriptions = {
-            "Internship": "Focus on fundamental concepts and basic skills appropriate for someone new to the field",
-            "Associate": "Cover core skills with some practical application for early career professionals",
-            "Junior": "Include practical scenarios and common problem-solving for developers with some experience",
-            "Senior": "Emphasize complex scenarios, architecture decisions, and advanced concepts for experienced professionals",
-            "Expert": "Focus on cutting-edge technologies, system design, and expert-level problem-solving for industry leaders"
-        }
-        
-        level_description = level_descriptions.get(level, "Appropriate for the role's requirements")
+        level_description = LEVEL_DESCRIPTIONS.get(level, DEFAULT_LEVEL_DESCRIPTION)
 
         prompt_text = (
             f"You are an expert technical interviewer.\n\n"
@@ -57,52 +70,113 @@ class QuestionGeneratorAgent:
             f"Years of Experience: {experience}\n\n"
             f"Generate {num_questions} concise, technically accurate multiple-choice questions (MCQs) "
             f"appropriate for a {level} level candidate.\n"
-            f"The questions should match the difficulty level:\n"
-            f"- Internship: Basic concepts, fundamental knowledge\n"
-            f"- Associate: Core skills, simple applications\n"
-            f"- Junior: Practical scenarios, common problem-solving\n"
-            f"- Senior: Complex scenarios, architecture decisions\n"
-            f"- Expert: Advanced concepts, system design, cutting-edge technologies\n\n"
+            f"{RUBRIC}\n"
             f"Each question must follow this format:\n\n"
             f"1. Question text\nA. Option A\nB. Option B\nC. Option C\nD. Option D\nCorrect answer: X\n"
         )
 
+        return [
+            SystemMessage(content="You are an expert quiz generator."),
+            HumanMessage(content=prompt_text)
+        ]
+
+    def generate_questions(self, job_data: Dict[str, Any], num_questions: int) -> List[Dict[str, Any]]:
         try:
-            messages = [
-                SystemMessage(content="You are an expert quiz generator."),
-                HumanMessage(content=prompt_text)
-            ]
-            result = self.llm.invoke(messages)
-            raw_output = result.content
-            return self._parse_questions(raw_output)
+            chunks = (chunk.content for chunk in self.llm.stream(self._build_messages(job_data, num_questions)))
+            return list(self._iter_parse(chunks))
         except Exception as e:
             print(f"❌ Error generating questions: {e}")
             return []
 
+    async def agenerate_questions(self, job_data: Dict[str, Any], num_questions: int) -> List[Dict[str, Any]]:
+        """Async version of generate_questions."""
+        return [q async for q in self.astream_questions(job_data, num_questions)]
+
+    async def astream_questions(self, job_data: Dict[str, Any], num_questions: int):
+        """Stream the reply and yield each question as soon as its answer line has arrived."""
+        parser = _MCQStreamParser()
+        try:
+            async for chunk in self.llm.astream(self._build_messages(job_data, num_questions)):
+                for q in parser.feed(chunk.content):
+                    yield q
+            for q in parser.close():
+                yield q
+        except Exception as e:
+            print(f"❌ Error generating questions: {e}")
+            return
+        if not parser.parsed:
+            self._save_debug_output(parser.text)
+
+    def _iter_parse(self, chunks):
+        """Yield questions from an iterable of text chunks as each one is complete."""
+        parser = _MCQStreamParser()
+        for chunk in chunks:
+            yield from parser.feed(chunk)
+        yield from parser.close()
+        if not parser.parsed:
+            self._save_debug_output(parser.text)
+
     def _parse_questions(self, text: str) -> List[Dict[str, Any]]:
-        pattern = re.compile(
-            r"(?:\d+\.\s*)?(.*?)\nA\.\s*(.*?)\nB\.\s*(.*?)\nC\.\s*(.*?)\nD\.\s*(.*?)\n(?:Correct answer|Answer):\s*([A-D])",
-            re.DOTALL | re.IGNORECASE
-        )
-        matches = pattern.findall(text)
-        if not matches:
-            # Only save debug file if directory exists
-            if os.path.exists(config.QUIZ_DATA_DIR):
-                debug_path = os.path.join(config.QUIZ_DATA_DIR, "debug_agent_raw_output.txt")
-                with open(debug_path, "w", encoding="utf-8") as f:
-                    f.write(text)
-                print(f"⚠️ Could not parse any questions. Raw output saved to {debug_path}")
-            else:
-                print("⚠️ Could not parse any questions.")
+        return list(self._iter_parse([text]))
+
+    @staticmethod
+    def _save_debug_output(text: str) -> None:
+        config.ensure_quiz_dir()
+        debug_path = os.path.join(config.QUIZ_DATA_DIR, "debug_agent_raw_output.txt")
+        with open(debug_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"⚠️ Could not parse any questions. Raw output saved to {debug_path}")
+
+
+class _MCQStreamParser:
+    """
+    Incremental parser for the generator's streamed reply. Text is fed chunk by chunk and
+    each MCQ is returned once the next question has started or the line after its answer
+    letter has, so nothing has to wait for the whole reply.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._buffer = ""
+        self._seen = set()
+        self.parsed = 0
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far (for the debug output)."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        if not chunk:
             return []
+        self._chunks.append(chunk)
+        self._buffer += chunk
+        # A question can only be completed by a chunk that ends its answer line
+        if "\n" not in chunk:
+            return []
+        return self._drain(final=False)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Parse whatever is left once the stream has ended."""
+        return self._drain(final=True)
 
-        parsed = []
-        seen = set()
+    def _drain(self, final: bool) -> List[Dict[str, Any]]:
+        questions = []
+        parts = QUESTION_SPLIT.split(self._buffer)
+        # Until the stream has ended the last chunk may still be growing: it is parsed
+        # once the text after its answer letter has started, and otherwise kept
+        last = "" if final else parts.pop()
+        matches = [m.groups() for m in map(QUESTION_FIELDS.match, parts) if m]
+        m = QUESTION_FIELDS.match(last)
+        if m and m.end() < len(last):
+            matches.append(m.groups())
+            last = last[m.end():]
         for q, a, b, c, d, correct in matches:
             q = q.strip()
-            if q and q not in seen:
-                seen.add(q)
-                parsed.append({
+            key = question_key(q)
+            if q and key not in self._seen:
+                self._seen.add(key)
+                questions.append({
                     "question": q,
                     "options": [
                         {"letter": "A", "text": a.strip()},
@@ -112,7 +186,10 @@ class QuestionGeneratorAgent:
                     ],
                     "correct_answer": correct.strip().upper()
                 })
-        return parsed
+        # Drop the consumed text so each scan only covers the unfinished question
+        self._buffer = last
+        self.parsed += len(questions)
+        return questions
 
 
 # ==============================
@@ -121,25 +198,38 @@ class QuestionGeneratorAgent:
 class QuestionScorerAgent:
     """Validates whether generated questions are relevant and well-formed."""
 
-    def __init__(self):
-        api_key = config.get_current_api_key()
-        self.llm = ChatGroq(api_key=api_key, model_name=config.MODEL_NAME, verbose=True)
+    def __init__(self, max_concurrency: int = SCORER_MAX_CONCURRENCY, llm: ChatGroq = None):
+        if llm is None:
+            llm = ChatGroq(api_key=config.get_current_api_key(), model_name=config.MODEL_NAME, verbose=True)
+        self.llm = llm
+        self.max_concurrency = max_concurrency
 
-    def score_question(self, question: Dict[str, Any], job_data: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _structural_ok(question: Dict[str, Any], job_data: Dict[str, Any]) -> bool:
+        """
+        Cheap checks that reject malformed or off-topic questions without an LLM request:
+        4 distinct non-empty options, an answer letter A-D, a question text of at least
+        MIN_QUESTION_LENGTH characters that mentions one of the job's technical skills.
+        """
+        q_text = question.get("question", "").strip()
+        if len(q_text) < MIN_QUESTION_LENGTH:
+            return False
+        options = [o.get("text", "").strip().lower() for o in question.get("options", [])]
+        if len(options) != 4 or not all(options) or len(set(options)) != 4:
+            return False
+        if question.get("correct_answer") not in ("A", "B", "C", "D"):
+            return False
+        skills = job_data.get("skills_required", {}).get("technical_skills", [])
+        if not skills:
+            return True
+        q_lower = q_text.lower()
+        return any(skill.lower() in q_lower for skill in skills if skill)
+
+    def _build_prompt(self, question: Dict[str, Any], job_data: Dict[str, Any]) -> str:
         q_text = question.get("question", "")
         opts = "\n".join([f"{o['letter']}. {o['text']}" for o in question["options"]])
         level = job_data.get("experience_required", {}).get("level", "Not specified")
-        
-        # Define difficulty descriptions for scoring
-        level_descriptions = {
-            "Internship": "questions should focus on fundamental concepts and basic skills",
-            "Associate": "questions should cover core skills with some practical application",
-            "Junior": "questions should include practical scenarios and common problem-solving",
-            "Senior": "questions should emphasize complex scenarios, architecture decisions, and advanced concepts",
-            "Expert": "questions should focus on cutting-edge technologies, system design, and expert-level problem-solving"
-        }
-        
-        level_description = level_descriptions.get(level, "questions should be appropriate for the role's requirements")
+        level_description = SCORER_LEVEL_DESCRIPTIONS.get(level, DEFAULT_SCORER_LEVEL_DESCRIPTION)
         
         full_prompt = (
             f"Question:\n{q_text}\n\n"
@@ -151,73 +241,236 @@ class QuestionScorerAgent:
             f"Check that the difficulty matches the level and the content is relevant to the job.\n"
             f"Respond only 'VALID' or 'INVALID'."
         )
+        return full_prompt
+
+    def _build_batch_prompt(self, questions: List[Dict[str, Any]], job_data: Dict[str, Any]) -> str:
+        level = job_data.get("experience_required", {}).get("level", "Not specified")
+        level_description = SCORER_LEVEL_DESCRIPTIONS.get(level, DEFAULT_SCORER_LEVEL_DESCRIPTION)
+        
+        numbered = []
+        for i, question in enumerate(questions, 1):
+            opts = "\n".join(f"{o['letter']}. {o['text']}" for o in question["options"])
+            numbered.append(
+                f"Question {i}:\n{question.get('question', '')}\n"
+                f"Options:\n{opts}\n"
+                f"Correct Answer: {question['correct_answer']}"
+            )
         
+        return (
+            "\n\n".join(numbered) + "\n\n"
+            f"Job Level: {level}\n\n"
+            f"These questions are for a {level} level position. The questions at this level should {level_description}.\n\n"
+            f"For each question, decide whether it is a valid, relevant technical MCQ appropriate for a {level} level candidate. "
+            f"Check that the difficulty matches the level and the content is relevant to the job.\n"
+            f'Reply only with a JSON array with one entry per question, like [{{"id": 1, "verdict": "VALID"}}, {{"id": 2, "verdict": "INVALID"}}].'
+        )
+
+    @staticmethod
+    def _parse_verdicts(text: str, count: int) -> List[bool]:
+        """Parse the batch reply into one verdict per question (missing entries count as invalid)."""
+        match = _VERDICTS_RE.search(text)
+        if not match:
+            raise ValueError(f"No JSON array in scorer reply: {text[:200]}")
+        valid = [False] * count
+        for entry in json.loads(match.group(0)):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                i = int(entry.get("id")) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= i < count:
+                valid[i] = str(entry.get("verdict", "")).strip().upper() == "VALID"
+        return valid
+
+    def score_questions_batch(self, questions: List[Dict[str, Any]], job_data: Dict[str, Any]) -> List[bool]:
+        """Score up to SCORER_BATCH_SIZE questions with a single LLM request."""
+        passed = [q for q in questions if self._structural_ok(q, job_data)]
+        if not passed:
+            return [False] * len(questions)
+        try:
+            result = self.llm.invoke([HumanMessage(content=self._build_batch_prompt(passed, job_data))])
+            verdicts = self._parse_verdicts(result.content, len(passed))
+        except Exception as e:
+            print(f"⚠️ Batch scoring error: {e}. Scoring questions one by one...")
+            verdicts = [self.score_question(q, job_data) for q in passed]
+        return self._merge_verdicts(questions, passed, verdicts)
+
+    @staticmethod
+    def _merge_verdicts(questions: List[Dict[str, Any]], passed: List[Dict[str, Any]],
+                        verdicts: List[bool]) -> List[bool]:
+        """Map verdicts for the questions that passed _structural_ok back onto the full list."""
+        by_id = {id(q): valid for q, valid in zip(passed, verdicts)}
+        return [by_id.get(id(q), False) for q in questions]
+
+    async def ascore_questions_batch(self, questions: List[Dict[str, Any]], job_data: Dict[str, Any],
+                                     semaphore: asyncio.Semaphore = None) -> List[bool]:
+        """Async version of score_questions_batch."""
+        if not questions:
+            return []
+        try:
+            if semaphore is None:
+                result = await self.llm.ainvoke([HumanMessage(content=self._build_batch_prompt(questions, job_data))])
+            else:
+                async with semaphore:
+                    result = await self.llm.ainvoke([HumanMessage(content=self._build_batch_prompt(questions, job_data))])
+            return self._parse_verdicts(result.content, len(questions))
+        except Exception as e:
+            print(f"⚠️ Batch scoring error: {e}. Scoring questions one by one...")
+            return await self.ascore_questions(questions, job_data, batch=False)
+
+    def score_question(self, question: Dict[str, Any], job_data: Dict[str, Any]) -> bool:
+        if not self._structural_ok(question, job_data):
+            return False
+        try:
+            result = self.llm.invoke([HumanMessage(content=self._build_prompt(question, job_data))])
+            output = result.content.strip().upper()
+            return output == "VALID"
+        except Exception as e:
+            print(f"⚠️ Scoring error: {e}")
+            return False
+
+    async def ascore_question(self, question: Dict[str, Any], job_data: Dict[str, Any],
+                              semaphore: asyncio.Semaphore = None) -> bool:
+        """Async version of score_question; the semaphore bounds how many run at once."""
+        if not self._structural_ok(question, job_data):
+            return False
         try:
-            result = self.llm.invoke([HumanMessage(content=full_prompt)])
+            if semaphore is None:
+                result = await self.llm.ainvoke([HumanMessage(content=self._build_prompt(question, job_data))])
+            else:
+                async with semaphore:
+                    result = await self.llm.ainvoke([HumanMessage(content=self._build_prompt(question, job_data))])
             output = result.content.strip().upper()
             return output == "VALID"
         except Exception as e:
             print(f"⚠️ Scoring error: {e}")
             return False
 
+    async def ascore_questions(self, questions: List[Dict[str, Any]], job_data: Dict[str, Any],
+                               batch: bool = True) -> List[bool]:
+        """
+        Score several questions concurrently (at most max_concurrency requests in flight).
+        With batch set, each request scores up to SCORER_BATCH_SIZE questions at once.
+        Questions failing _structural_ok are rejected without a request.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        if not batch:
+            verdicts = await asyncio.gather(
+                *(self.ascore_question(q, job_data, semaphore) for q in questions),
+                return_exceptions=True
+            )
+            return [verdict is True for verdict in verdicts]
+        
+        passed = [q for q in questions if self._structural_ok(q, job_data)]
+        chunks = [passed[i:i + SCORER_BATCH_SIZE] for i in range(0, len(passed), SCORER_BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(self.ascore_questions_batch(chunk, job_data, semaphore) for chunk in chunks),
+            return_exceptions=True
+        )
+        verdicts = []
+        for chunk, result in zip(chunks, results):
+            verdicts.extend(result if isinstance(result, list) else [False] * len(chunk))
+        return self._merge_verdicts(questions, passed, verdicts)
+
 
 # ==============================
 # 🔹 Quiz Generator Orchestrator
 # ==============================
 class AgentBasedQuizGenerator:
     def __init__(self):
-        self.generator = QuestionGeneratorAgent()
-        self.scorer = QuestionScorerAgent()
+        # One client (and connection pool) shared by both agents
+        self._llm = ChatGroq(api_key=config.get_current_api_key(), model_name=config.MODEL_NAME)
+        self.generator = QuestionGeneratorAgent(llm=self._llm)
+        self.scorer = QuestionScorerAgent(llm=self._llm)
         # Don't create directories by default
         print("🔍 AgentBasedQuizGenerator initialized.")
 
     def generate_quiz(self, job_data: Dict[str, Any], num_questions: int) -> str:
+        return run_async(self.agenerate_quiz(job_data, num_questions))
+
+    async def agenerate_quiz(self, job_data: Dict[str, Any], num_questions: int) -> str:
+        """
+        Generate and save a quiz. The generator's reply is streamed, and every STREAM_SCORE_BATCH
+        parsed questions are sent to the scorer while the rest is still being generated. Each
+        round over-fetches (OVERFETCH_FACTOR), so usually one round is enough; if the questions
+        being scored could not fill the quiz even if all were valid, the next round is requested
+        right away. Whatever is still running when the quiz is full is cancelled.
+        """
         all_questions = []
-        seen = set()
+        seen = set()  # questions accepted or being scored
         attempts = 0
         MAX_ATTEMPTS = num_questions * 2
+        generating = None
+        tasks = set()
+        being_scored = 0
+        # Finished tasks report here: (questions, scoring task), or (None, generation task)
+        finished = asyncio.Queue()
 
-        while len(all_questions) < num_questions and attempts < MAX_ATTEMPTS:
-            remaining = num_questions - len(all_questions)
-            new_questions = self.generator.generate_questions(job_data, remaining)
-            for q in new_questions:
-                if q["question"] in seen:
+        def start_scoring(questions):
+            nonlocal being_scored
+            being_scored += len(questions)
+            task = asyncio.ensure_future(self.scorer.ascore_questions(questions, job_data))
+            task.add_done_callback(lambda t: finished.put_nowait((questions, t)))
+            tasks.add(task)
+
+        async def generate_round(count):
+            batch = []
+            async for q in self.generator.astream_questions(job_data, count):
+                key = question_key(q["question"])
+                if key in seen:
                     continue
-                if self.scorer.score_question(q, job_data):
-                    all_questions.append(q)
-                    seen.add(q["question"])
-                if len(all_questions) >= num_questions:
-                    break
+                seen.add(key)
+                batch.append(q)
+                if len(batch) >= STREAM_SCORE_BATCH:
+                    start_scoring(batch)
+                    batch = []
+            if batch:
+                start_scoring(batch)
+
+        def start_generation():
+            nonlocal generating, attempts
             attempts += 1
+            remaining = num_questions - len(all_questions)
+            generating = asyncio.ensure_future(
+                generate_round(max(remaining, math.ceil(remaining * OVERFETCH_FACTOR)))
+            )
+            generating.add_done_callback(lambda t: finished.put_nowait((None, t)))
+            tasks.add(generating)
+
+        start_generation()
+        try:
+            while len(all_questions) < num_questions and (generating or being_scored):
+                questions, task = await finished.get()
+                tasks.discard(task)
+                if questions is None:
+                    generating = None
+                else:
+                    being_scored -= len(questions)
+                    verdicts = task.result() if not task.cancelled() and task.exception() is None else []
+                    for q, valid in zip(questions, verdicts):
+                        if not valid:
+                            seen.discard(question_key(q["question"]))
+                        elif len(all_questions) < num_questions:
+                            all_questions.append(q)
+                    # Questions without a verdict can be generated again
+                    for q in questions[len(verdicts):]:
+                        seen.discard(question_key(q["question"]))
+
+                # Request the next round while the previous one is still being scored, but only
+                # if the questions being scored can't fill the quiz on their own
+                if generating is None and len(all_questions) + being_scored < num_questions and attempts < MAX_ATTEMPTS:
+                    start_generation()
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
         print(f"✅ Generated {len(all_questions)}/{num_questions} valid questions.")
         return self._save_quiz(job_data, all_questions)
 
     def _save_quiz(self, job_data: Dict[str, Any], questions: List[Dict[str, Any]]) -> str:
-        # Only create directory if it doesn't exist
-        if not os.path.exists(config.QUIZ_DATA_DIR):
-            os.makedirs(config.QUIZ_DATA_DIR, exist_ok=True)
-        
-        slug = ''.join(c if c.isalnum() else '_' for c in job_data.get('job_title', 'unknown').lower())
-        level = job_data.get("experience_required", {}).get("level", "").lower()
-        if level:
-            slug += f"_{level}"
-        quiz_id = f"quiz_{slug}_{uuid.uuid4().hex[:8]}"
-        file_path = os.path.join(config.QUIZ_DATA_DIR, f"{quiz_id}.json")
-
-        # Add metadata including level information
-        metadata = {
-            "question_count": len(questions),
-            "level": job_data.get("experience_required", {}).get("level", "Not specified")
-        }
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump({
-                "quiz_id": quiz_id,
-                "job_info": job_data,
-                "metadata": metadata,
-                "questions": questions
-            }, f, indent=2, ensure_ascii=False)
-
+        quiz_id, file_path = save_quiz(job_data, questions)
         print(f"💾 Quiz saved at: {file_path}")
-        return quiz_id
\ No newline at end of file
+        return quiz_id
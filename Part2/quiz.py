@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import os
-import json
+import sys
+import orjson
 import argparse
 from typing import Dict, List, Any
-from config import QUIZ_DATA_DIR
+from config import QUIZ_DATA_DIR, QUIZ_INDEX_FILE, QUIZ_PUBLIC_SUFFIX, ensure_quiz_dir
 
 class QuizRunner:
     """
@@ -12,8 +13,7 @@ class QuizRunner:
     
     def __init__(self):
         """Initialize the quiz runner."""
-        if not os.path.exists(QUIZ_DATA_DIR):
-            os.makedirs(QUIZ_DATA_DIR)
+        ensure_quiz_dir()
     
     def load_quiz(self, quiz_id: str) -> Dict[str, Any]:
         """
@@ -30,11 +30,29 @@ class QuizRunner:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Quiz with ID {quiz_id} not found.")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            quiz_data = json.load(f)
+        with open(file_path, 'rb') as f:
+            quiz_data = orjson.loads(f.read())
         
         return quiz_data
     
+    def load_candidate_quiz(self, quiz_id: str) -> Dict[str, Any]:
+        """
+        Load the candidate view of a quiz (without correct answers).
+        
+        Args:
+            quiz_id: The ID of the quiz to load
+            
+        Returns:
+            Quiz data formatted for candidate display
+        """
+        # Quizzes saved with a precomputed public view only need a file read
+        public_path = os.path.join(QUIZ_DATA_DIR, f"{quiz_id}{QUIZ_PUBLIC_SUFFIX}")
+        try:
+            with open(public_path, 'rb') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return self.format_quiz_for_candidate(self.load_quiz(quiz_id))
+    
     def format_quiz_for_candidate(self, quiz_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Format the quiz for candidate display (without correct answers).
@@ -86,34 +104,22 @@ class QuizRunner:
         questions = quiz_data.get('questions', [])
         
         # THEN CHECK - Create a dictionary mapping question IDs to correct answers
-        correct_answers = {}
-        for i, q in enumerate(questions):
-            correct_answers[i + 1] = q.get('correct_answer')
+        correct_answers = {i + 1: q.get('correct_answer') for i, q in enumerate(questions)}
         
-        # THEN CHECK - Score the answers
+        # THEN CHECK - Score the answers (answers with an invalid question ID are skipped)
         total_questions = len(questions)
-        correct_count = 0
-        question_results = []
-        
-        for answer in candidate_answers:
-            question_id = answer.get('question_id')
-            candidate_answer = answer.get('answer')
-            
-            # CONDITION IF DISLIKED THEN REMOVED - Skip if question ID is invalid
-            if question_id not in correct_answers:
-                continue
-            
-            is_correct = candidate_answer == correct_answers[question_id]
-            
-            question_results.append({
+        question_results = [
+            {
                 'question_id': question_id,
                 'candidate_answer': candidate_answer,
                 'correct_answer': correct_answers[question_id],
-                'is_correct': is_correct
-            })
-            
-            if is_correct:
-                correct_count += 1
+                'is_correct': candidate_answer == correct_answers[question_id]
+            }
+            for answer in candidate_answers
+            for question_id, candidate_answer in ((answer.get('question_id'), answer.get('answer')),)
+            if question_id in correct_answers
+        ]
+        correct_count = sum(result['is_correct'] for result in question_results)
         
         # CONDITION TO FILL GAP - Calculate score
         score_percentage = (correct_count / total_questions) * 100 if total_questions > 0 else 0
@@ -136,11 +142,8 @@ class QuizRunner:
         Args:
             quiz_id: The ID of the quiz to run
         """
-        # FIRST GENERATE - Load the quiz data
-        quiz_data = self.load_quiz(quiz_id)
-        
-        # THEN CHECK - Format for candidate
-        candidate_quiz = self.format_quiz_for_candidate(quiz_data)
+        # FIRST GENERATE - Load the quiz formatted for the candidate
+        candidate_quiz = self.load_candidate_quiz(quiz_id)
         
         print(f"\n===== QUIZ: {candidate_quiz.get('job_title')} =====\n")
         
@@ -148,10 +151,13 @@ class QuizRunner:
         answers = []
         for q in candidate_quiz.get('questions', []):
             question_id = q.get('question_id')
-            print(f"\nQ{question_id}: {q.get('question')}")
-            
-            for option in q.get('options', []):
-                print(f"{option.get('letter')}. {option.get('text')}")
+            # Write the question and its options as one block instead of a print per line
+            sys.stdout.write("\n".join([
+                f"\nQ{question_id}: {q.get('question')}",
+                *(f"{option.get('letter')}. {option.get('text')}" for option in q.get('options', [])),
+                ""
+            ]))
+            sys.stdout.flush()
             
             # CONDITION IF DISLIKED THEN REMOVED - Get answer with validation
             while True:
@@ -182,14 +188,32 @@ class QuizRunner:
         quizzes = []
         
         # FIRST GENERATE - Look through all quiz files
-        for filename in os.listdir(QUIZ_DATA_DIR):
-            if filename.endswith('.json'):
+        with os.scandir(QUIZ_DATA_DIR) as entries:
+            filenames = [entry.name for entry in entries if entry.name.endswith('.json')
+                         and not entry.name.endswith(QUIZ_PUBLIC_SUFFIX) and entry.is_file()]
+        
+        # Summaries of quizzes in the index don't require opening the quiz file
+        indexed = {}
+        if os.path.exists(QUIZ_INDEX_FILE):
+            with open(QUIZ_INDEX_FILE, 'rb') as f:
+                for line in f:
+                    try:
+                        quiz_summary = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    indexed[f"{quiz_summary.get('quiz_id')}.json"] = quiz_summary
+        
+        for filename in filenames:
+            if filename in indexed:
+                quizzes.append(indexed[filename])
+            else:
+                # Quiz saved before the index existed: read the summary from the file itself
                 file_path = os.path.join(QUIZ_DATA_DIR, filename)
                 
                 try:
                     # THEN CHECK - Load each quiz file
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        quiz_data = json.load(f)
+                    with open(file_path, 'rb') as f:
+                        quiz_data = orjson.loads(f.read())
                     
                     # CONDITION IF DISLIKED THEN REMOVED - Extract summary information
                     quiz_summary = {
@@ -0,0 +1,111 @@
+"""
+Parsing and saving helpers shared by the quiz generators (agent-based and direct API).
+"""
+
+import os
+import re
+import sys
+import uuid
+import asyncio
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Tuple
+
+import orjson
+
+# Allow importing config.py from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import config
+
+# Question numbers ("1. ") at the start of a line; splitting on them gives one chunk per MCQ
+QUESTION_SPLIT = re.compile(r'(?m)^\s*\d+\.\s*')
+# The fields of one MCQ chunk: question, options A-D (one line each) and the correct answer letter.
+# Anchored and per chunk, so malformed output can't make the match backtrack over the whole reply
+QUESTION_FIELDS = re.compile(
+    r'\A(.+?)\nA\.\s*([^\n]+)\nB\.\s*([^\n]+)\nC\.\s*([^\n]+)\nD\.\s*([^\n]+)\n(?:Correct answer|Answer):\s*([A-D])',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Runs of characters that are not allowed in quiz file names
+SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+def question_key(question: str) -> bytes:
+    """Duplicate-detection key for a question: digest of its case- and whitespace-normalized text."""
+    return hashlib.blake2b(" ".join(question.split()).lower().encode("utf-8"), digest_size=16).digest()
+
+
+def write_atomic(file_path: str, data: bytes) -> None:
+    """Write data in one call to a temp file and rename it over file_path, so readers never see a partial quiz."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def run_async(coro):
+    """Run a coroutine to completion, also when called from code already inside an event loop (e.g. FastAPI)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run() can't nest, so give the coroutine its own loop in a worker thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def save_quiz(job_data: Dict[str, Any], questions: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Save a quiz, its candidate view (no correct answers) and its index line under config.QUIZ_DATA_DIR.
+    Returns (quiz_id, path of the quiz file).
+    """
+    config.ensure_quiz_dir()
+
+    slug = SLUG_RE.sub('_', job_data.get('job_title', 'Unknown Job').lower()).strip('_')
+    level = job_data.get("experience_required", {}).get("level", "").lower()
+    if level:
+        slug += f"_{level}"
+    quiz_id = f"quiz_{slug}_{uuid.uuid4().hex[:8]}"
+    file_path = os.path.join(config.QUIZ_DATA_DIR, f"{quiz_id}.json")
+
+    # Add metadata including level information
+    metadata = {
+        "question_count": len(questions),
+        "level": job_data.get("experience_required", {}).get("level", "Not specified")
+    }
+
+    write_atomic(file_path, orjson.dumps({
+        "quiz_id": quiz_id,
+        "job_info": job_data,
+        "metadata": metadata,
+        "questions": questions
+    }, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+    # Candidate view (no correct answers), precomputed once instead of on every load
+    public_path = os.path.join(config.QUIZ_DATA_DIR, f"{quiz_id}{config.QUIZ_PUBLIC_SUFFIX}")
+    write_atomic(public_path, orjson.dumps({
+        "quiz_id": quiz_id,
+        "job_title": job_data.get("job_title", "Unknown Job"),
+        "questions": [
+            {
+                "question_id": i + 1,
+                "question": q.get("question"),
+                "options": [{"letter": o.get("letter"), "text": o.get("text")} for o in q.get("options", [])]
+            }
+            for i, q in enumerate(questions)
+        ]
+    }))
+
+    with open(config.QUIZ_INDEX_FILE, 'ab') as f:
+        f.write(orjson.dumps({
+            "quiz_id": quiz_id,
+            "job_title": job_data.get("job_title", "Unknown"),
+            "question_count": len(questions)
+        }, option=orjson.OPT_APPEND_NEWLINE))
+
+    return quiz_id, file_path
@@ -0,0 +1,34 @@
+"""
+Prompt fragments shared by the quiz generators (agent-based and direct API) and the question scorer.
+Built once at import rather than on every call.
+"""
+
+# Difficulty description per job level, used when generating questions
+LEVEL_DESCRIPTIONS = {
+    "Internship": "Focus on fundamental concepts and basic skills appropriate for someone new to the field",
+    "Associate": "Cover core skills with some practical application for early career professionals",
+    "Junior": "Include practical scenarios and common problem-solving for developers with some experience",
+    "Senior": "Emphasize complex scenarios, architecture decisions, and advanced concepts for experienced professionals",
+    "Expert": "Focus on cutting-edge technologies, system design, and expert-level problem-solving for industry leaders"
+}
+DEFAULT_LEVEL_DESCRIPTION = "Appropriate for the role's requirements"
+
+# Difficulty description per job level, used when scoring questions
+SCORER_LEVEL_DESCRIPTIONS = {
+    "Internship": "questions should focus on fundamental concepts and basic skills",
+    "Associate": "questions should cover core skills with some practical application",
+    "Junior": "questions should include practical scenarios and common problem-solving",
+    "Senior": "questions should emphasize complex scenarios, architecture decisions, and advanced concepts",
+    "Expert": "questions should focus on cutting-edge technologies, system design, and expert-level problem-solving"
+}
+DEFAULT_SCORER_LEVEL_DESCRIPTION = "questions should be appropriate for the role's requirements"
+
+# Difficulty rubric included in every generation prompt
+RUBRIC = (
+    "The questions should match the difficulty level:\n"
+    "- Internship: Basic concepts, fundamental knowledge\n"
+    "- Associate: Core skills, simple applications\n"
+    "- Junior: Practical scenarios, common problem-solving\n"
+    "- Senior: Complex scenarios, architecture decisions\n"
+    "- Expert: Advanced concepts, system design, cutting-edge technologies\n"
+)
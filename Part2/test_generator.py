@@ -7,14 +7,35 @@ falls back to direct Groq API if not.
 import os
 import sys
 import json
-import uuid
-import re
-import requests
+import asyncio
 from typing import List, Dict, Any
 
 # Import config from project root
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import config
+from quiz_prompts import LEVEL_DESCRIPTIONS, DEFAULT_LEVEL_DESCRIPTION, RUBRIC
+from quiz_io import QUESTION_SPLIT, QUESTION_FIELDS, question_key, run_async, save_quiz
+from Part1.parser_common import GROQ_API_URL, LazySession
+
+# Pooled session shared by all JobTestGenerator instances, so repeated calls reuse the TCP/TLS
+# connection (created on first use). Nothing rotates API keys here, so rate limits (429) are
+# retried too, honoring the server's Retry-After
+_SESSION = LazySession(
+    pool_connections=16, pool_maxsize=32,
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+
+# Larger quizzes are generated as concurrent requests of up to SHARD_SIZE questions each,
+# with at most MAX_INFLIGHT_SHARDS requests in flight
+SHARD_SIZE = 3
+MAX_INFLIGHT_SHARDS = 4
+
 
 # ✅ Correct import — no silent ImportError anymore
 try:
@@ -33,22 +54,28 @@ class JobTestGenerator:
 
     def __init__(self):
         # Don't create directories by default
-        pass
+        self._set_api_key(config.get_current_api_key())
 
-    def generate_batch_questions(self, job_title, skills, responsibilities, experience, level, num_questions):
+    def rotate_key(self):
+        """Switch to the next API key after the current one was rejected (401)."""
+        self._set_api_key(config.cycle_api_key(self._api_key))
+
+    def _set_api_key(self, api_key):
+        # Headers are built once per key instead of for every request
+        self._api_key = api_key
+        self._headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _build_request(self, job_title, skills, responsibilities, experience, level, num_questions, focus=None):
         skills_str = ", ".join(skills)
         resp_str = "; ".join(responsibilities)
         
-        # Define difficulty descriptions
-        level_descriptions = {
-            "Internship": "Focus on fundamental concepts and basic skills appropriate for someone new to the field",
-            "Associate": "Cover core skills with some practical application for early career professionals",
-            "Junior": "Include practical scenarios and common problem-solving for developers with some experience",
-            "Senior": "Emphasize complex scenarios, architecture decisions, and advanced concepts for experienced professionals",
-            "Expert": "Focus on cutting-edge technologies, system design, and expert-level problem-solving for industry leaders"
-        }
-        
-        level_description = level_descriptions.get(level, "Appropriate for the role's requirements")
+        level_description = LEVEL_DESCRIPTIONS.get(level, DEFAULT_LEVEL_DESCRIPTION)
+        # Shards of a larger quiz each get a different subset of skills, so they don't all
+        # come back with the same questions
+        focus_str = f"Focus these questions on: {', '.join(focus)}\n" if focus else ""
 
         prompt = f"""
 You are a technical interviewer. 
@@ -59,14 +86,8 @@ Skills: {skills_str}
 Responsibilities: {resp_str}
 Experience: {experience}
 Level: {level} - {level_description}
-
-The questions should match the difficulty level:
-- Internship: Basic concepts, fundamental knowledge
-- Associate: Core skills, simple applications
-- Junior: Practical scenarios, common problem-solving
-- Senior: Complex scenarios, architecture decisions
-- Expert: Advanced concepts, system design, cutting-edge technologies
-
+{focus_str}
+{RUBRIC}
 Each question must have:
 - Four options labeled A, B, C, D
 - One correct answer clearly indicated as "Correct answer: X"
@@ -82,25 +103,28 @@ D. Option D
 Correct answer: A
 """
 
-        api_key = config.get_current_api_key()
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
         data = {
             "model": config.MODEL_NAME,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": getattr(config, "TEMPERATURE", 0.7),
             "max_tokens": 4096
         }
+        return data
 
+    def generate_batch_questions(self, job_title, skills, responsibilities, experience, level, num_questions):
+        # Decoding time grows with the number of questions, so larger quizzes are generated
+        # as several smaller requests running concurrently
+        if num_questions > SHARD_SIZE:
+            return run_async(self.agenerate_batch_questions(
+                job_title, skills, responsibilities, experience, level, num_questions
+            ))
+
+        data = self._build_request(job_title, skills, responsibilities, experience, level, num_questions)
         try:
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=90
-            )
+            response = _SESSION.get().post(GROQ_API_URL, headers=self._headers, json=data, timeout=90)
+            if response.status_code == 401:
+                self.rotate_key()
+                response = _SESSION.get().post(GROQ_API_URL, headers=self._headers, json=data, timeout=90)
             response.raise_for_status()
             content = response.json()["choices"][0]["message"]["content"]
             return self._parse_questions(content)
@@ -108,29 +132,62 @@ Correct answer: A
             print(f"[ERROR] Fallback generation failed: {e}")
             return []
 
+    async def agenerate_batch_questions(self, job_title, skills, responsibilities, experience, level, num_questions,
+                                        max_inflight: int = MAX_INFLIGHT_SHARDS):
+        """Generate num_questions as concurrent requests of up to SHARD_SIZE questions each."""
+        import httpx
+
+        num_shards = -(-num_questions // SHARD_SIZE)
+        counts = [num_questions // num_shards + (i < num_questions % num_shards) for i in range(num_shards)]
+        semaphore = asyncio.Semaphore(max_inflight)
+
+        async def one_shard(client, i, count):
+            focus = (skills[i::num_shards] or [skills[i % len(skills)]]) if skills else None
+            data = self._build_request(job_title, skills, responsibilities, experience, level, count, focus)
+            try:
+                async with semaphore:
+                    response = await client.post(GROQ_API_URL, headers=self._headers, json=data)
+                    if response.status_code == 401:
+                        # Another shard may already have rotated away from the rejected key
+                        if f"Bearer {self._api_key}" == response.request.headers.get("Authorization"):
+                            self.rotate_key()
+                        response = await client.post(GROQ_API_URL, headers=self._headers, json=data)
+                response.raise_for_status()
+                return self._parse_questions(response.json()["choices"][0]["message"]["content"])
+            except Exception as e:
+                print(f"[ERROR] Fallback generation failed (shard {i + 1}/{num_shards}): {e}")
+                return []
+
+        async with httpx.AsyncClient(timeout=90) as client:
+            shards = await asyncio.gather(*(one_shard(client, i, count) for i, count in enumerate(counts)))
+
+        # Shards are parsed separately, so drop questions repeated across them
+        questions, seen = [], set()
+        for shard in shards:
+            for q in shard:
+                key = question_key(q["question"])
+                if key not in seen:
+                    seen.add(key)
+                    questions.append(q)
+        return questions
+
     def _parse_questions(self, text: str) -> List[Dict[str, Any]]:
-        pattern = re.compile(
-            r"(?:\d+\.\s*)?(.*?)\nA\.\s*(.*?)\nB\.\s*(.*?)\nC\.\s*(.*?)\nD\.\s*(.*?)\n(?:Correct answer|Answer):\s*([A-D])",
-            re.DOTALL | re.IGNORECASE
-        )
-        matches = pattern.findall(text)
+        matches = [m.groups() for m in map(QUESTION_FIELDS.match, QUESTION_SPLIT.split(text)) if m]
         if not matches:
-            # Only save debug file if directory exists
-            if os.path.exists(config.QUIZ_DATA_DIR):
-                debug_path = os.path.join(config.QUIZ_DATA_DIR, "debug_fallback_raw_output.txt")
-                with open(debug_path, "w", encoding="utf-8") as f:
-                    f.write(text)
-                print(f"[WARNING] Could not parse any questions. Raw output saved to {debug_path}")
-            else:
-                print("[WARNING] Could not parse any questions.")
+            config.ensure_quiz_dir()
+            debug_path = os.path.join(config.QUIZ_DATA_DIR, "debug_fallback_raw_output.txt")
+            with open(debug_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            print(f"[WARNING] Could not parse any questions. Raw output saved to {debug_path}")
             return []
 
         questions, seen = [], set()
         for q, a, b, c, d, correct in matches:
             q = q.strip()
-            if not q or q in seen:
+            key = question_key(q)
+            if not q or key in seen:
                 continue
-            seen.add(q)
+            seen.add(key)
             questions.append({
                 "question": q,
                 "options": [
@@ -168,31 +225,7 @@ Correct answer: A
         return self._save_quiz(job_data, questions)
 
     def _save_quiz(self, job_info, questions):
-        # Only create directory if it doesn't exist
-        if not os.path.exists(config.QUIZ_DATA_DIR):
-            os.makedirs(config.QUIZ_DATA_DIR, exist_ok=True)
-        
-        slug = ''.join(c if c.isalnum() else '_' for c in job_info.get('job_title', 'Unknown Job').lower())
-        level = job_info.get("experience_required", {}).get("level", "").lower()
-        if level:
-            slug += f"_{level}"
-        quiz_id = f"quiz_{slug}_{uuid.uuid4().hex[:8]}"
-        file_path = os.path.join(config.QUIZ_DATA_DIR, f"{quiz_id}.json")
-
-        # Add metadata including level information
-        metadata = {
-            "question_count": len(questions),
-            "level": job_info.get("experience_required", {}).get("level", "Not specified")
-        }
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                "quiz_id": quiz_id,
-                "job_info": job_info,
-                "metadata": metadata,
-                "questions": questions
-            }, f, indent=2, ensure_ascii=False)
-
+        quiz_id, file_path = save_quiz(job_info, questions)
         print(f"[INFO] Quiz saved at: {file_path}")
         return quiz_id
 
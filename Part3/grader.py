@@ -1,14 +1,23 @@
 # ./Part3/grader.py (FINAL CORRECTED VERSION)
 
 import os
+import sys
 import json
+import orjson
+import asyncio
+import functools
 from typing import List, Dict, Optional, Any
 from pydantic import BaseModel, Field
 from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
-from langchain_core.prompts import SystemMessagePromptTemplate, MessagesPlaceholder
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
+from langchain_core.prompts import MessagesPlaceholder
 from dotenv import load_dotenv
 
+# Allow importing llm_cache.py from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from llm_cache import LLMResponseCache
+from Part3.llm_limits import GROQ_ASYNC_HTTP_CLIENT, ainvoke_limited
+
 # Load environment variables for the API key when run standalone or imported
 load_dotenv()
 
@@ -20,6 +29,11 @@ class InterviewRating(BaseModel):
     weaknesses: List[str] = Field(..., description="3 key gaps or weaknesses identified.")
     hiring_recommendation: str = Field(..., description="Final recommendation, e.g., 'Strong Hire', 'Proceed with Caution', 'No Hire'")
 
+class DualRating(BaseModel):
+    """Structured output for both grading agents, produced by a single LLM call."""
+    initial: InterviewRating = Field(..., description="The Initial Scorer's rating.")
+    challenger: InterviewRating = Field(..., description="The Challenger Grader's rating after reviewing the initial one.")
+
 # --- Configuration (Internal Definition) ---
 # CRITICAL FIX: Use a stable, currently supported Groq model
 MODEL_NAME = "moonshotai/kimi-k2-instruct-0905"
@@ -30,48 +44,39 @@ EVALUATION_FILE = "final_evaluation_report.json"
 rating_llm_fixed_temp = ChatGroq(
     model_name=MODEL_NAME,
     temperature=0.0, 
+    http_async_client=GROQ_ASYNC_HTTP_CLIENT,
 )
 
-# --- Helper: Grade Agent Definition (MODIFIED) ---
-def get_grading_chain(agent_role: str):
-    """
-    Creates a structured output chain for a specific grading agent role.
-    """
-    
-    # 1. Define the specific instruction based on the agent's job
-    vague_penalty_instruction = """
+# Grading runs at temperature 0, so an identical request always gets the same rating
+GRADING_CACHE = LLMResponseCache("grading")
+
+
+async def _ainvoke_cached(chain, messages: List[BaseMessage], parse=InterviewRating.model_validate):
+    """Invoke a grading chain, reusing the rating of an identical earlier request."""
+    key = GRADING_CACHE.make_key(MODEL_NAME, messages, 0.0)
+    cached = await GRADING_CACHE.aget(key)
+    if cached is not None:
+        return parse(cached)
+    raw = await ainvoke_limited(chain, messages)
+    if isinstance(raw, BaseModel):
+        raw = raw.model_dump()
+    # Parsed before caching, so a malformed reply raises now instead of being served again until it expires
+    rating = parse(raw)
+    await GRADING_CACHE.aset(key, raw)
+    return rating
+
+
+# --- Grading Prompts ---
+# Static text shared by both agents comes first and per-interview content (transcript, job level)
+# last, so every grading request starts with the same bytes and Groq's prompt
+# cache can reuse the prefix
+STATIC_RUBRIC_PREFIX = """
+    You are a grading agent evaluating a technical interview transcript.
+
     ***VAGUENESS PENALTY: CRITICALLY DEDUCT POINTS IF*** a candidate's answer is overly vague, uses generic buzzwords without specific examples, or avoids providing concrete technical details when asked. Vagueness must be treated as a significant weakness.
-    """
-    
-    if agent_role == "Initial Scorer":
-        debate_prompt = f"""
-        You are the primary scoring agent. Your **#1 priority** is to assess the candidate's **Mentality and Approach** to problem-solving.
-        
-        **SCORING GUIDELINE (CRITICAL):** Grade with leniency, focusing on **potential and curiosity**. Start the score high (e.g., 90/100) and deduct points only for specific, major errors or complete knowledge failures required for the job. Do not score harshly on minor confusion.
-        {vague_penalty_instruction}
-        
-        Provide a holistic score and detailed summary strictly based on the transcript, assessing:
-        1. **Mentality:** Self-awareness, curiosity, handling ambiguity, and problem-solving method.
-        2. **Technical Depth:** Accuracy against the job level and resume project claims.
-        """
-    else: # Challenger Grader
-        debate_prompt = f"""
-        You are the secondary, skeptical grading agent. Your job is to **CRITICALLY REVIEW** the Initial Scorer's findings below.
-        1. **Initial Score:** {{initial_score_json}} 
-        2. **Action:** Challenge the initial score if you find bias, missing context, or flawed logic. **Specifically, assess if the Initial Scorer was strict enough on vagueness and generalities.**
-        {vague_penalty_instruction}
-        3. **Final Task:** Provide your final, independent score and justification using the schema. Your score should only agree if the Initial Scorer's logic is perfect.
-        
-        CRITICAL RULE: While you must critique weaknesses, your final recommendation should reflect the overall Consensus Score's passing threshold.
-        """
-
-    # 2. Construct the grading prompt
-    grader_instruction = f"""
-    --- AGENT ROLE: {agent_role} ---
-    {debate_prompt}
-    
+
     Your final analysis must consider:
-    - Technical Depth (compared to the {{job_level}} target).
+    - Technical Depth (compared to the target job level given after the transcript).
     - Mental Aptitude (problem-solving approach, self-awareness, handling uncertainty).
     - Communication (clarity, confidence, professionalism).
 
@@ -81,10 +86,40 @@ def get_grading_chain(agent_role: str):
     
     GENERATE A JSON OBJECT STRICTLY FOLLOWING THE PYTHON SCHEMA. Do not include any text, prose, or conversation outside the JSON.
     """
+
+# Role-specific instructions, appended to the shared prefix
+AGENT_ROLE_PROMPTS = {
+    "Initial Scorer": """
+    --- AGENT ROLE: Initial Scorer ---
+    You are the primary scoring agent. Your **#1 priority** is to assess the candidate's **Mentality and Approach** to problem-solving.
+    
+    **SCORING GUIDELINE (CRITICAL):** Grade with leniency, focusing on **potential and curiosity**. Start the score high (e.g., 90/100) and deduct points only for specific, major errors or complete knowledge failures required for the job. Do not score harshly on minor confusion.
+    
+    Provide a holistic score and detailed summary strictly based on the transcript, assessing:
+    1. **Mentality:** Self-awareness, curiosity, handling ambiguity, and problem-solving method.
+    2. **Technical Depth:** Accuracy against the job level and resume project claims.
+    """,
+    "Challenger Grader": """
+    --- AGENT ROLE: Challenger Grader ---
+    You are the secondary, skeptical grading agent. Your job is to **CRITICALLY REVIEW** the Initial Scorer's findings.
+    1. **Action:** Challenge the initial score if you find bias, missing context, or flawed logic. **Specifically, assess if the Initial Scorer was strict enough on vagueness and generalities.**
+    2. **Final Task:** Provide your final, independent score and justification using the schema. Your score should only agree if the Initial Scorer's logic is perfect.
     
-    rating_prompt = SystemMessagePromptTemplate.from_template(grader_instruction)
+    CRITICAL RULE: While you must critique weaknesses, your final recommendation should reflect the overall Consensus Score's passing threshold.
+    """,
+}
 
-    # 3. Create the final chain with structured output
+# --- Helper: Grade Agent Definition (MODIFIED) ---
+@functools.cache
+def get_grading_chain(agent_role: str):
+    """
+    Creates a structured output chain for a specific grading agent role.
+    Returns the agent's (static) system message and the chain.
+    Built once per role; later calls return the same prompt and chain.
+    """
+    rating_prompt = SystemMessage(content=STATIC_RUBRIC_PREFIX + AGENT_ROLE_PROMPTS[agent_role])
+
+    # Create the final chain with structured output
     grading_chain = rating_llm_fixed_temp.with_structured_output(
         schema=InterviewRating,
         method="json_schema"
@@ -92,10 +127,47 @@ def get_grading_chain(agent_role: str):
     
     return rating_prompt, grading_chain
 
+# Both roles in one request, so the transcript is sent (and prefilled) once instead of once per agent
+DUAL_GRADER_INSTRUCTIONS = """
+    --- SINGLE RESPONSE, TWO AGENTS ---
+    You play both agent roles below, in order. First grade the transcript as the Initial Scorer and put that
+    rating under "initial". Then act as the Challenger Grader, critically reviewing the "initial" rating you just
+    wrote, and put your own rating under "challenger". Return both ratings in ONE JSON object.
+    """
+
+# The fused call runs in JSON mode (no server-side schema), so the schema is spelled out in the prompt;
+# derived once at import
+DUAL_RATING_SCHEMA = orjson.dumps(DualRating.model_json_schema()).decode()
+
+@functools.cache
+def get_dual_grading_chain():
+    """
+    Creates a structured output chain that runs the Initial Scorer and the Challenger Grader in one call.
+    Returns the combined (static) system message and the chain.
+    Built once; later calls return the same prompt and chain.
+    """
+    rating_prompt = SystemMessage(
+        content=STATIC_RUBRIC_PREFIX + DUAL_GRADER_INSTRUCTIONS + f"    JSON schema: {DUAL_RATING_SCHEMA}\n"
+        + AGENT_ROLE_PROMPTS["Initial Scorer"] + AGENT_ROLE_PROMPTS["Challenger Grader"]
+    )
+
+    # Raw JSON, validated against DualRating by the caller
+    grading_chain = rating_llm_fixed_temp.with_structured_output(method="json_mode")
+
+    return rating_prompt, grading_chain
+
+# The fused prompt and chain (the only ones grading uses) are built at import, not per grading request
+DUAL_GRADER_PROMPT, DUAL_GRADER_CHAIN = get_dual_grading_chain()
+
+def _write_evaluation(final_report: Dict[str, Any]):
+    with open(EVALUATION_FILE, 'wb') as f:
+        f.write(orjson.dumps(final_report, option=orjson.OPT_APPEND_NEWLINE))
+
 # --- Public Function for Phase 2 (Accepts data directly) ---
-def evaluate_candidate(context: Dict):
+async def evaluate_candidate(context: Dict):
     """
     Runs the two-agent evaluation process using the context dictionary passed from the interviewer.
+    Both agents grade in a single LLM call; their scores are averaged into the consensus score.
     """
     if not context:
         return
@@ -110,42 +182,32 @@ def evaluate_candidate(context: Dict):
     # CRITICAL: We now rely on 'transcript' being the list of messages
     transcript_data = context['transcript'] 
     
-    # Prepare message list for LLM (Transcript + Context)
+    # Prepare message list for LLM, built in place: the prebuilt grader prompt, the context in one system
+    # message, then the transcript in its native roles
     rating_messages: List[BaseMessage] = [
-        HumanMessage(content="--- JOB AND CANDIDATE CONTEXT ---"),
-        HumanMessage(content=f"Job Level: {job_level}"),
-        HumanMessage(content=f"Job Description: {context.get('job_description', 'N/A')}"),
-        HumanMessage(content=f"Candidate Resume: {context.get('resume_content', 'N/A')}"),
-        HumanMessage(content="--- CONVERSATION TRANSCRIPT ---"),
+        DUAL_GRADER_PROMPT,
+        SystemMessage(content=(
+            f"JOB_LEVEL={job_level}\n"
+            f"JD={context.get('job_description', 'N/A')}\n"
+            f"RESUME={context.get('resume_content', 'N/A')}"
+        )),
     ]
-    for msg in transcript_data:
+    rating_messages.extend(
         # This KeyError is fixed because interviewer.py now sends 'type'
-        if msg['type'] == 'human':
-            rating_messages.append(HumanMessage(content=msg['content']))
-        elif msg['type'] == 'ai':
-            rating_messages.append(AIMessage(content=msg['content']))
-    rating_messages.append(HumanMessage(content="--- END TRANSCRIPT ---"))
+        HumanMessage(content=msg['content']) if msg['type'] == 'human' else AIMessage(content=msg['content'])
+        for msg in transcript_data if msg['type'] in ('human', 'ai')
+    )
 
 
-    # --- AGENT 1: Initial Scorer ---
-    print("[INFO] Agent 1 (Initial Scorer) running...")
-    scorer_prompt, scorer_chain = get_grading_chain("Initial Scorer")
-    
-    # Inject Agent 1's specific prompt variables
-    agent_1_messages = scorer_prompt.format_messages(job_level=job_level) + rating_messages
-    initial_rating_obj = scorer_chain.invoke(agent_1_messages)
-    
-    
-    # --- AGENT 2: Challenger Grader ---
-    # Convert Agent 1's result to JSON for Agent 2 to review
-    initial_score_json = initial_rating_obj.model_dump_json()
-    print("[INFO] Agent 2 (Challenger) running to validate initial score...")
-    
-    challenger_prompt, challenger_chain = get_grading_chain("Challenger Grader")
+    # --- AGENT 1 (Initial Scorer) and AGENT 2 (Challenger Grader) ---
+    # One fused request: the Challenger reviews the Initial Scorer's rating inside the same response,
+    # so the shared transcript is only prefilled once
+    print("[INFO] Agent 1 (Initial Scorer) and Agent 2 (Challenger) running...")
     
-    # Inject Agent 2's specific prompt variables (including the JSON score)
-    agent_2_messages = challenger_prompt.format_messages(job_level=job_level, initial_score_json=initial_score_json) + rating_messages
-    final_rating_obj = challenger_chain.invoke(agent_2_messages)
+    # Dynamic values go last, after the shared prefix and the transcript
+    rating_messages.append(HumanMessage(content=f"Target job level: {job_level}"))
+    dual_rating = await _ainvoke_cached(DUAL_GRADER_CHAIN, rating_messages, parse=DualRating.model_validate)
+    initial_rating_obj, final_rating_obj = dual_rating.initial, dual_rating.challenger
 
     
     # --- Consensus and Final Report ---
@@ -168,9 +230,8 @@ def evaluate_candidate(context: Dict):
     final_report['overall_score'] = avg_score
     final_report['hiring_recommendation'] = final_recommendation # Overwrite LLM's recommendation
     
-    # Save the final result to a separate JSON file
-    with open(EVALUATION_FILE, 'w', encoding='utf-8') as f:
-        json.dump(final_report, f, indent=4)
+    # Save the final result to a separate JSON file (in a worker thread, off the event loop)
+    await asyncio.to_thread(_write_evaluation, final_report)
     
     print(f"[INFO] Final evaluation (Consensus Score) saved to {EVALUATION_FILE}")
 
@@ -179,6 +240,7 @@ def evaluate_candidate(context: Dict):
     print(f"AGENT 1 SCORE: {initial_rating_obj.overall_score}/100")
     print(f"AGENT 2 SCORE: {final_rating_obj.overall_score}/100")
     print(f"CONSENSUS SCORE: {avg_score}/100")
+    print(f"GRADING CACHE: {GRADING_CACHE.stats}")
     print("-------------------------------------------")
     
     # We return the dictionary for the API endpoint
@@ -196,6 +258,6 @@ if __name__ == "__main__":
     context_data = load_transcript_for_standalone_test()
     if context_data:
         # Simulate the API call context (which is the combined transcript context)
-        evaluate_candidate(context_data)
+        asyncio.run(evaluate_candidate(context_data))
     else:
         print("[CRITICAL] Cannot run Grader.py standalone. Run test.py first to create context.")
\ No newline at end of file
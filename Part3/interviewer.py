@@ -1,8 +1,14 @@
 # ./Part3/interviewer.py (FINAL CORRECTED VERSION)
 
 import os
-import json
+import re
+import sys
+import orjson
 import time
+import asyncio
+import contextlib
+import importlib.util
+import uuid
 # CRITICAL FIX: Use Optional for older Python versions
 from typing import List, Any, Dict, Tuple, Optional 
 from dotenv import load_dotenv 
@@ -19,11 +25,14 @@ if not os.getenv("GROQ_API_KEY"):
 # ---------------------------------------------------------------------------------
 
 
+# Allow importing llm_cache.py from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from llm_cache import LLMResponseCache
+from Part3.llm_limits import GROQ_ASYNC_HTTP_CLIENT, GROQ_SEM, ainvoke_limited
+
 # LangChain Imports
 from langchain_groq import ChatGroq
 from langchain_core.prompts import SystemMessagePromptTemplate, HumanMessagePromptTemplate
-# FIX: Use langchain_classic for ConversationBufferWindowMemory in LangChain 1.x
-from langchain_classic.memory import ConversationBufferWindowMemory
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 # --- CONFIGURATION (Shared Constants) ---
@@ -39,12 +48,32 @@ MAX_PRIMARY_QUESTIONS = 5
 MAX_ELABORATIONS = 1 
 MEMORY_WINDOW = 8
 TRANSCRIPT_FILE = "interview_transcript.json"
+# Per-session JSONL logs of the transcript, written turn by turn
+TRANSCRIPT_LOG_DIR = os.path.join("temp", "transcripts")
+# Set once TRANSCRIPT_LOG_DIR is known to exist, so new sessions skip the makedirs call
+_TRANSCRIPT_LOG_DIR_READY = False
+
+def _ensure_transcript_log_dir() -> bool:
+    """Create TRANSCRIPT_LOG_DIR once per process; False if there is no temp directory to log into."""
+    global _TRANSCRIPT_LOG_DIR_READY
+    if not _TRANSCRIPT_LOG_DIR_READY:
+        if not os.path.isdir("temp"):
+            return False
+        os.makedirs(TRANSCRIPT_LOG_DIR, exist_ok=True)
+        _TRANSCRIPT_LOG_DIR_READY = True
+    return True
 
 REPETITION_PHRASES = [
     "To ensure clarity, I will repeat the question:",
     "Let me clarify that point for you:",
     "I'm happy to rephrase the question:"
 ]
+# One compiled pattern finds every control marker of a reply in a single pass: the sentinel phrase
+# anywhere, a repetition starter only at the very start
+_PROTOCOL_SCAN = re.compile(
+    "(?P<sentinel>" + re.escape(SENTINEL_END_PHRASE) + ")"
+    "|(?P<repetition>^(?:" + "|".join(map(re.escape, REPETITION_PHRASES)) + "))"
+)
 # -----------------------------------------------------------------------
 
 
@@ -53,22 +82,62 @@ try:
     chat_llm = ChatGroq(
         model_name=os.getenv("GROQ_MODEL", MODEL_NAME),
         temperature=0.7, 
+        http_async_client=GROQ_ASYNC_HTTP_CLIENT,
     )
 except Exception as e:
     print(f"[FATAL ERROR] ChatGroq initialization failed: {e}")
     raise
 
 
-# --- Helper Function for System Instruction ---
-def _get_system_instruction(job_description, resume_content, job_level, candidate_name):
-    """Centralized function to return the system instruction template."""
-    return f"""
+# Responses to fully templated prompts (warning re-ask, soft close) for an identical history
+RESPONSE_CACHE = LLMResponseCache("interviewer")
+
+# Optional local profanity check (better_profanity): a reply it flags gets the warning protocol
+# directly, without an LLM round-trip; everything else is still judged by the LLM
+PROFANITY_FILTER_AVAILABLE = importlib.util.find_spec("better_profanity") is not None
+if PROFANITY_FILTER_AVAILABLE:
+    from better_profanity import profanity
+    profanity.load_censor_words()
+
+
+def _is_obviously_abusive(candidate_reply: str) -> bool:
+    return PROFANITY_FILTER_AVAILABLE and profanity.contains_profanity(candidate_reply)
+
+
+# Short aliases for the long top-level keys of the parsed job description and resume. The legend is part
+# of the static system instruction, so the per-session context can use the short keys on every turn
+CONTEXT_KEY_ALIASES = {
+    "job_title": "title",
+    "role_description": "role",
+    "experience_required": "xp",
+    "skills_required": "skills",
+    "preferred_skills": "pref",
+    "job_responsibilities": "resp",
+    "Certifications": "certs",
+}
+_KEY_LEGEND = ", ".join(f"{alias}={key}" for key, alias in CONTEXT_KEY_ALIASES.items())
+
+
+def _scan_protocol(text: str) -> set:
+    """Returns the names of the control markers found in a reply ('sentinel', 'repetition')."""
+    return {match.lastgroup for match in _PROTOCOL_SCAN.finditer(text)}
+
+
+def _compact_context(jd: Dict, resume: Dict) -> str:
+    """Returns the job description and resume as one minified JSON string with aliased top-level keys."""
+    def alias(data: Dict) -> Dict:
+        return {CONTEXT_KEY_ALIASES.get(key, key): value for key, value in data.items()}
+    return orjson.dumps({"jd": alias(jd), "cv": alias(resume)}).decode()
+
+
+# --- System Instruction ---
+# The persona and rules are the same for every session, so they form a constant prefix (reused by
+# Groq's prompt cache); the per-session context follows in a second message (_get_session_context)
+SYSTEM_INSTRUCTION = f"""
 You are the **Ultra-Paced Expert Technical Interviewer AI** named **'InterviewerBot'**. Your persona is **highly professional, objective, supportive, and efficient**. Your primary goal is a **rapid, high-signal assessment** that feels conversational.
 
---- CONTEXT ---
-Job Description: {job_description}
-Candidate Resume: {resume_content}
-The target role level is dynamically set to: **{job_level}**.
+The job description, the candidate's resume and the target role level are given in the CONTEXT message that follows.
+In its JSON, "jd" is the job description and "cv" the candidate's resume. Key legend: {_KEY_LEGEND}.
 
 --- CORE INTERVIEW OBJECTIVES (EFFICIENCY & CLARITY) ---
 
@@ -89,172 +158,338 @@ The target role level is dynamically set to: **{job_level}**.
 """
 
 
+# Shared by every session
+STATIC_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_INSTRUCTION)
+
+
+def _get_session_context(context_json, job_level, candidate_name):
+    """Returns the per-session part of the system instruction."""
+    return f"""
+--- CONTEXT ---
+Candidate Name: {candidate_name}
+{context_json}
+The target role level is dynamically set to: **{job_level}**.
+"""
+
+
 class InterviewerBot:
     """
     Manages the state and logic for a single, ongoing AI interview session.
     """
-    def __init__(self, job_desc_str: str, resume_content_str: str, job_level: str, candidate_name: str):
+    def __init__(self, job_desc_str: str, resume_content_str: str, job_level: str, candidate_name: str,
+                 prompt_context: Optional[str] = None):
         
         self.job_description = job_desc_str
         self.resume_content = resume_content_str
         self.job_level = job_level
         self.candidate_name = candidate_name
+        # The system messages don't change during a session, so they are built once here and every turn
+        # sends byte-identical context. The prompt uses the compact, key-aliased JSON (see _compact_context),
+        # serialized once by start_interview_logic; the full strings above are what the grader receives
+        prompt_context = prompt_context or f'{{"jd":{job_desc_str},"cv":{resume_content_str}}}'
+        self._session_message = SystemMessage(content=_get_session_context(prompt_context, job_level, candidate_name))
         
         self.warning_count = 0
         self.primary_question_count = 0 
         self.elaboration_count = 0 
         self.is_finished = False
         self.is_in_soft_close = False
+        # Control markers found in the latest reply (see _scan_protocol)
+        self._reply_markers: set = set()
         self.transcript_history: List[Dict] = []
+        # Each transcript entry is also appended to this session's JSONL log as it happens
+        # (only if the temp directory exists), so nothing is lost if the session dies
+        self.transcript_log = None
+        if _ensure_transcript_log_dir():
+            self.transcript_log = os.path.join(TRANSCRIPT_LOG_DIR, f"{uuid.uuid4().hex}.jsonl")
         
-        self.memory = ConversationBufferWindowMemory(
-            memory_key="history",
-            input_key="input", 
-            return_messages=True,
-            k=MEMORY_WINDOW
-        )
+        # The list sent to the LLM, kept between turns: the two system messages, then the last
+        # MEMORY_WINDOW exchanges (one human + one AI message each). Each call only appends its
+        # action guide for the duration of the call (see _prompt)
+        self._messages: List[Any] = [STATIC_SYSTEM_MESSAGE, self._session_message]
         self.llm = chat_llm 
 
-    def get_system_instruction(self):
-        return _get_system_instruction(self.job_description, self.resume_content, self.job_level, self.candidate_name)
+    def __getstate__(self):
+        # The shared LLM client isn't picklable (sessions can be pickled into Redis) and the static
+        # instruction is the same for every session; both are reattached on load
+        state = self.__dict__.copy()
+        state.pop("llm", None)
+        state["_messages"] = self._messages[1:]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.llm = chat_llm
+        self._messages = [STATIC_SYSTEM_MESSAGE, *state["_messages"]]
+
+    def _record(self, entry: Dict[str, str]):
+        """Adds an entry to the transcript and its log."""
+        self.transcript_history.append(entry)
+        if self.transcript_log:
+            try:
+                with open(self.transcript_log, 'ab') as f:
+                    f.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+            except OSError as e:
+                print(f"[WARNING] Could not append to transcript log: {e}")
+
+    def get_system_messages(self) -> List[SystemMessage]:
+        """The static instruction followed by this session's context."""
+        return self._messages[:2]
+
+    def _remember(self, message):
+        """Adds a conversation message to the LLM's memory, dropping the oldest beyond the window."""
+        self._messages.append(message)
+        if len(self._messages) > 2 + 2 * MEMORY_WINDOW:
+            del self._messages[2]
 
     def init_session(self) -> str:
         """Starts the conversation with the first greeting."""
         initial_greeting = f"Hello {self.candidate_name}, thank you for joining me today. We have a short time, so let's jump right into the technical discussion. How are you doing?"
         # FIX: Use 'type': 'ai'
-        self.transcript_history.append({"type": "ai", "content": initial_greeting})
-        self.memory.chat_memory.add_ai_message(AIMessage(content=initial_greeting))
+        self._record({"type": "ai", "content": initial_greeting})
+        self._remember(AIMessage(content=initial_greeting))
         return initial_greeting
 
-    def _invoke_llm_for_response(self, action_guide: str) -> str:
-        """Helper to invoke the LLM with the current memory state and an action guide."""
-        
-        messages = [
-            SystemMessage(content=self.get_system_instruction()),
-            *self.memory.chat_memory.messages,
-            HumanMessage(content=action_guide)
-        ]
-        
-        print("InterviewerBot: Thinking...")
+    @contextlib.contextmanager
+    def _prompt(self, action_guide: str):
+        """The persistent message list with the action guide appended for the duration of one LLM call."""
+        self._messages.append(HumanMessage(content=action_guide))
+        try:
+            yield self._messages
+        finally:
+            self._messages.pop()
+
+    async def _ainvoke_llm_for_response(self, action_guide: str, cacheable: bool = False) -> str:
+        """
+        Helper to invoke the LLM with the current memory state and an action guide.
+        With cacheable set (templated action guides only), an identical earlier request's reply is reused.
+        """
+        with self._prompt(action_guide) as messages:
+            cache_key = None
+            if cacheable:
+                cache_key = RESPONSE_CACHE.make_key(self.llm.model_name, messages, self.llm.temperature)
+                cached = await RESPONSE_CACHE.aget(cache_key)
+                if cached is not None:
+                    return cached
+
+            print("InterviewerBot: Thinking...")
+            try:
+                # Awaited, so the event loop keeps serving other sessions during the request
+                response = await ainvoke_limited(self.llm, messages)
+                bot_text = response.content.strip()
+                if cache_key is not None:
+                    await RESPONSE_CACHE.aset(cache_key, bot_text)
+                return bot_text
+            except Exception as e:
+                error_message = f"[LLM_ERROR] The AI model failed to respond: {e}"
+                print(error_message)
+                return error_message
+
+    async def _astream_llm(self, action_guide: str):
+        """Like _ainvoke_llm_for_response, but yields the reply chunk by chunk as it is generated."""
+        print("InterviewerBot: Thinking (streaming)...")
+        received = False
         try:
-            response = self.llm.invoke(messages)
-            return response.content.strip()
+            with self._prompt(action_guide) as messages:
+                stream = self.llm.astream(messages)
+                try:
+                    # A GROQ_SEM slot is held only until the first chunk arrives, not while a slow
+                    # client reads the rest of the reply
+                    async with GROQ_SEM:
+                        chunk = await anext(stream, None)
+                    while chunk is not None:
+                        if chunk.content:
+                            received = True
+                            yield chunk.content
+                        chunk = await anext(stream, None)
+                finally:
+                    await stream.aclose()
         except Exception as e:
             error_message = f"[LLM_ERROR] The AI model failed to respond: {e}"
             print(error_message)
-            return error_message
+            if not received:
+                yield error_message
 
 
-    def _handle_protocol_response(self, bot_text: str) -> str:
+    async def _ahandle_protocol_response(self, bot_text: str) -> str:
         """Handles tags and updates internal state."""
         
         if bot_text == WARNING_TAG:
             self.warning_count += 1
-            self.transcript_history.append({"type": "PROTOCOL", "content": WARNING_TAG}) 
+            self._record({"type": "PROTOCOL", "content": WARNING_TAG})
             
             if self.warning_count > MAX_WARNINGS:
                 self.is_finished = True
                 final_message = "I appreciate your time, but given the lack of professional engagement, I must conclude this interview now."
-                self.transcript_history.append({"type": "PROTOCOL", "content": TERMINATION_TAG}) 
-                self.transcript_history.append({"type": "ai", "content": final_message})
+                self._record({"type": "PROTOCOL", "content": TERMINATION_TAG})
+                self._record({"type": "ai", "content": final_message})
                 return final_message
             
             warning_message = "I noticed your last response was unprofessional. Please maintain a professional demeanor. I'll re-ask the question."
-            self.transcript_history.append({"type": "ai", "content": warning_message})
-            self.memory.chat_memory.add_ai_message(AIMessage(content=warning_message))
+            self._record({"type": "ai", "content": warning_message})
+            self._remember(AIMessage(content=warning_message))
             
             re_ask_message = "The candidate has been warned. Acknowledge this and output the *exact* last technical question (or follow-up) asked before the candidate's last message. DO NOT PIVOT. DO NOT REPEAT THE WARNING MESSAGE."
             
-            bot_text = self._invoke_llm_for_response(re_ask_message)
+            bot_text = await self._ainvoke_llm_for_response(re_ask_message, cacheable=True)
         
-        if SENTINEL_END_PHRASE in bot_text:
+        # Scanned once here; _update_pacing reuses the result
+        self._reply_markers = _scan_protocol(bot_text)
+        if "sentinel" in self._reply_markers:
             self.is_finished = True
             final_message = bot_text.replace(SENTINEL_END_PHRASE, "").strip()
-            self.transcript_history.append({"type": "PROTOCOL", "content": SENTINEL_END_PHRASE})
-            self.transcript_history.append({"type": "ai", "content": final_message})
+            self._record({"type": "PROTOCOL", "content": SENTINEL_END_PHRASE})
+            self._record({"type": "ai", "content": final_message})
             return final_message
             
         # FIX: Use 'type': 'ai'
-        self.transcript_history.append({"type": "ai", "content": bot_text})
-        self.memory.chat_memory.add_ai_message(AIMessage(content=bot_text))
+        self._record({"type": "ai", "content": bot_text})
+        self._remember(AIMessage(content=bot_text))
         
         return bot_text
 
 
-    def process_turn(self, candidate_reply: str) -> Tuple[str, bool]:
-        """Processes one turn of candidate input."""
-        # FIX: Use 'type': 'human'
-        self.transcript_history.append({"type": "human", "content": candidate_reply}) 
-        self.memory.chat_memory.add_user_message(HumanMessage(content=candidate_reply))
-        
-        if self.is_in_soft_close:
-            return self._continue_soft_close(candidate_reply)
-        
-        if self.primary_question_count >= MAX_PRIMARY_QUESTIONS:
-            print(f"[PACING OVERRIDE] Max primary questions ({MAX_PRIMARY_QUESTIONS}) reached. Initiating graceful soft close.")
-            return self._initiate_soft_close()
-
+    def _next_action_guide(self) -> str:
         if self.primary_question_count == 0:
-            action_guide = "Analyze the candidate's LATEST message. If abusive/profane, output the protocol tag. Otherwise, acknowledge the greeting, then transition immediately to the first primary technical question (Question 1) based on the rules."
+            return "Analyze the candidate's LATEST message. If abusive/profane, output the protocol tag. Otherwise, acknowledge the greeting, then transition immediately to the first primary technical question (Question 1) based on the rules."
         elif self.elaboration_count < MAX_ELABORATIONS:
-            action_guide = f"The candidate has responded. Based on the rules: If they asked for repetition/clarification, use one of the specific starter phrases and repeat the last question. Otherwise, you MUST now ask the single required follow-up question (Elaboration Count: {self.elaboration_count + 1}). Check for abuse and output the warning tag if detected."
+            return f"The candidate has responded. Based on the rules: If they asked for repetition/clarification, use one of the specific starter phrases and repeat the last question. Otherwise, you MUST now ask the single required follow-up question (Elaboration Count: {self.elaboration_count + 1}). Check for abuse and output the warning tag if detected."
         else:
-            action_guide = f"The current topic is complete (Max Elaborations: {MAX_ELABORATIONS} reached). Acknowledge the candidate's last answer *briefly*, then gracefully pivot and ask a NEW primary technical question (Question {self.primary_question_count + 1}) based on the Resume/JD. Check for abuse and output the warning tag if detected."
-
-        bot_text = self._invoke_llm_for_response(action_guide)
-        final_bot_text = self._handle_protocol_response(bot_text)
-
-        if self.is_finished: 
-            return final_bot_text, True
-
-        is_repetition = any(final_bot_text.startswith(phrase) for phrase in REPETITION_PHRASES)
+            return f"The current topic is complete (Max Elaborations: {MAX_ELABORATIONS} reached). Acknowledge the candidate's last answer *briefly*, then gracefully pivot and ask a NEW primary technical question (Question {self.primary_question_count + 1}) based on the Resume/JD. Check for abuse and output the warning tag if detected."
 
-        if not is_repetition:
+    def _update_pacing(self):
+        if "repetition" not in self._reply_markers:
             if self.primary_question_count == 0:
                 self.primary_question_count = 1 
             elif self.elaboration_count >= MAX_ELABORATIONS:
                 self.primary_question_count += 1
                 self.elaboration_count = 0 
-                self.transcript_history.append({"type": "PROTOCOL", "content": PIVOT_TAG})
+                self._record({"type": "PROTOCOL", "content": PIVOT_TAG})
             else:
                 self.elaboration_count += 1
         else:
             print("[PACING EXCEPTION] Repetition detected. Elaboration count is NOT incremented.")
 
+    async def aprocess_turn(self, candidate_reply: str) -> Tuple[str, bool]:
+        """Processes one turn of candidate input."""
+        # FIX: Use 'type': 'human'
+        self._record({"type": "human", "content": candidate_reply})
+        self._remember(HumanMessage(content=candidate_reply))
+        
+        if self.is_in_soft_close:
+            return await self._acontinue_soft_close(candidate_reply)
+        
+        if self.primary_question_count >= MAX_PRIMARY_QUESTIONS:
+            print(f"[PACING OVERRIDE] Max primary questions ({MAX_PRIMARY_QUESTIONS}) reached. Initiating graceful soft close.")
+            return await self._ainitiate_soft_close()
+
+        if _is_obviously_abusive(candidate_reply):
+            bot_text = WARNING_TAG
+        else:
+            bot_text = await self._ainvoke_llm_for_response(self._next_action_guide())
+        final_bot_text = await self._ahandle_protocol_response(bot_text)
+
+        if self.is_finished: 
+            return final_bot_text, True
+
+        self._update_pacing()
         return final_bot_text, self.is_finished
+
+    async def astream_turn(self, candidate_reply: str):
+        """
+        Streaming version of aprocess_turn: yields the reply text piece by piece as the LLM
+        generates it. Control tags never reach the client: a reply that may still turn out to be
+        WARNING_TAG is held back until it can't be, and SENTINEL_END_PHRASE is cut out of the text.
+        State (transcript, pacing, is_finished) is updated once the reply is complete.
+        """
+        self._record({"type": "human", "content": candidate_reply})
+        self._remember(HumanMessage(content=candidate_reply))
+        
+        # The soft close replies are short (and partly cached), so they are sent whole
+        if self.is_in_soft_close:
+            bot_text, _ = await self._acontinue_soft_close(candidate_reply)
+            yield bot_text
+            return
+        if self.primary_question_count >= MAX_PRIMARY_QUESTIONS:
+            print(f"[PACING OVERRIDE] Max primary questions ({MAX_PRIMARY_QUESTIONS}) reached. Initiating graceful soft close.")
+            bot_text, _ = await self._ainitiate_soft_close()
+            yield bot_text
+            return
+        if _is_obviously_abusive(candidate_reply):
+            bot_text = await self._ahandle_protocol_response(WARNING_TAG)
+            yield bot_text
+            if not self.is_finished:
+                self._update_pacing()
+            return
+
+        received = ""
+        sent = 0  # characters of the visible text already yielded
+        maybe_tag = True
+        # Closed explicitly on an early break, so the action guide is removed from the message list right away
+        stream = self._astream_llm(self._next_action_guide())
+        try:
+            async for chunk in stream:
+                received += chunk
+                if maybe_tag:
+                    # WARNING_TAG is the entire reply by prompt contract, so it shows within the first characters
+                    if len(received) < len(WARNING_TAG) + 2 and WARNING_TAG.startswith(received.strip()):
+                        continue
+                    if received.strip() == WARNING_TAG:
+                        break
+                    maybe_tag = False
+                visible = received.replace(SENTINEL_END_PHRASE, "").lstrip()
+                # Hold back an end that could be the start of the sentinel phrase
+                safe = len(visible)
+                for k in range(min(len(SENTINEL_END_PHRASE) - 1, len(visible)), 0, -1):
+                    if SENTINEL_END_PHRASE.startswith(visible[-k:]):
+                        safe -= k
+                        break
+                if safe > sent:
+                    yield visible[sent:safe]
+                    sent = safe
+        finally:
+            await stream.aclose()
+
+        final_bot_text = await self._ahandle_protocol_response(received.strip())
+        # The rest of the reply, or after a warning the re-asked question / closing message
+        rest = final_bot_text[sent:] if sent else final_bot_text
+        if rest:
+            yield rest
+
+        if not self.is_finished:
+            self._update_pacing()
     
-    def _initiate_soft_close(self) -> Tuple[str, bool]:
+    async def _ainitiate_soft_close(self) -> Tuple[str, bool]:
         self.is_in_soft_close = True
         soft_close_prompt = "The technical interview section is complete. Output ONLY the final soft close question (Rule 2: 'Do you have any final questions for me...')."
         
-        bot_text = self._invoke_llm_for_response(soft_close_prompt)
+        bot_text = await self._ainvoke_llm_for_response(soft_close_prompt, cacheable=True)
         
-        self.transcript_history.append({"type": "PROTOCOL", "content": SOFT_CLOSE_TAG})
-        self.transcript_history.append({"type": "ai", "content": bot_text})
-        self.memory.chat_memory.add_ai_message(AIMessage(content=bot_text))
+        self._record({"type": "PROTOCOL", "content": SOFT_CLOSE_TAG})
+        self._record({"type": "ai", "content": bot_text})
+        self._remember(AIMessage(content=bot_text))
         
         return bot_text, False
 
-    def _continue_soft_close(self, candidate_reply: str) -> Tuple[str, bool]:
+    async def _acontinue_soft_close(self, candidate_reply: str) -> Tuple[str, bool]:
         final_signal_prompt = f"The candidate has replied to your soft close question. Reply conversationally to their final statement/question, and then immediately output the exact, standalone phrase: {SENTINEL_END_PHRASE}. DO NOT ASK NEW QUESTIONS OR FOLLOW-UPS."
         
-        bot_text = self._invoke_llm_for_response(final_signal_prompt)
+        bot_text = await self._ainvoke_llm_for_response(final_signal_prompt)
         
-        if SENTINEL_END_PHRASE in bot_text:
+        if "sentinel" in _scan_protocol(bot_text):
             self.is_finished = True
             final_message = bot_text.replace(SENTINEL_END_PHRASE, "").strip()
-            self.transcript_history.append({"type": "PROTOCOL", "content": SENTINEL_END_PHRASE})
-            self.transcript_history.append({"type": "ai", "content": final_message})
+            self._record({"type": "PROTOCOL", "content": SENTINEL_END_PHRASE})
+            self._record({"type": "ai", "content": final_message})
             return final_message, True
         
-        self.transcript_history.append({"type": "ai", "content": bot_text})
-        self.memory.chat_memory.add_ai_message(AIMessage(content=bot_text))
+        self._record({"type": "ai", "content": bot_text})
+        self._remember(AIMessage(content=bot_text))
         return bot_text, False
         
 
-    def get_context_for_grading(self) -> Dict[str, Any]:
-        """Prepares the final data structure needed by the grader and saves the transcript file."""
-        final_context = {
+    def _build_grading_context(self) -> Dict[str, Any]:
+        return {
             "timestamp": time.time(),
             "job_level": self.job_level,
             "candidate_name": self.candidate_name,
@@ -262,14 +497,26 @@ class InterviewerBot:
             "resume_content": self.resume_content,
             "transcript": self.transcript_history
         }
-        
+
+    @staticmethod
+    def _save_transcript(final_context: Dict[str, Any]):
         try:
-            with open(TRANSCRIPT_FILE, 'w', encoding='utf-8') as f:
-                json.dump(final_context, f, indent=4)
+            with open(TRANSCRIPT_FILE, 'wb') as f:
+                f.write(orjson.dumps(final_context, option=orjson.OPT_APPEND_NEWLINE))
             print(f"\n[FINALIZATION] Successfully saved interview transcript to {TRANSCRIPT_FILE}.")
         except Exception as e:
             print(f"[ERROR] Could not save transcript file: {e}")
-            
+
+    def get_context_for_grading(self) -> Dict[str, Any]:
+        """Prepares the final data structure needed by the grader and saves the transcript file."""
+        final_context = self._build_grading_context()
+        self._save_transcript(final_context)
+        return final_context
+
+    async def aget_context_for_grading(self) -> Dict[str, Any]:
+        """Async version of get_context_for_grading: the file is written in a worker thread."""
+        final_context = self._build_grading_context()
+        await asyncio.to_thread(self._save_transcript, final_context)
         return final_context
 
 
@@ -279,31 +526,33 @@ class InterviewerBot:
 try:
     from Part3.grader import evaluate_candidate
 except ImportError:
-    def evaluate_candidate(context):
+    async def evaluate_candidate(context):
         raise NotImplementedError("Part3/grader.py not found or evaluate_candidate is missing.")
 
 
 def start_interview_logic(jd_data: Dict, resume_data: Dict) -> Tuple[str, InterviewerBot]:
     """Initializes the InterviewerBot instance and gets the first greeting."""
-    job_desc_str = json.dumps(jd_data, indent=4)
-    resume_content_str = json.dumps(resume_data, indent=4)
+    # Compact JSON: indentation would only add prompt tokens
+    job_desc_str = orjson.dumps(jd_data).decode()
+    resume_content_str = orjson.dumps(resume_data).decode()
     job_level = jd_data.get('experience_required', {}).get('level', 'General')
     candidate_name = resume_data.get('Name', 'Candidate')
     
-    interviewer = InterviewerBot(job_desc_str, resume_content_str, job_level, candidate_name)
+    interviewer = InterviewerBot(job_desc_str, resume_content_str, job_level, candidate_name,
+                                 prompt_context=_compact_context(jd_data, resume_data))
     first_message = interviewer.init_session()
     
     return first_message, interviewer
 
 
-def chat_interview_logic(interviewer_instance: InterviewerBot, candidate_reply: str) -> Tuple[str, bool, Optional[Dict]]:
+async def chat_interview_logic(interviewer_instance: InterviewerBot, candidate_reply: str) -> Tuple[str, bool, Optional[Dict]]:
     """
     Processes one chat turn.
     Returns: (ai_response: str, is_finished: bool, final_context: Optional[Dict])
     """
     
     try:
-        ai_response, is_finished = interviewer_instance.process_turn(candidate_reply)
+        ai_response, is_finished = await interviewer_instance.aprocess_turn(candidate_reply)
     except Exception as e:
         ai_response = f"Internal chat processing failure: {e}"
         is_finished = True
@@ -312,7 +561,31 @@ def chat_interview_logic(interviewer_instance: InterviewerBot, candidate_reply:
     final_context: Optional[Dict[str, Any]] = None
 
     if is_finished:
-        final_context = interviewer_instance.get_context_for_grading()
+        final_context = await interviewer_instance.aget_context_for_grading()
         print("[FINALIZATION] Interview finished. Transcript prepared for external grading API call.")
         
-    return ai_response, is_finished, final_context
\ No newline at end of file
+    return ai_response, is_finished, final_context
+
+async def stream_interview_logic(interviewer_instance: InterviewerBot, candidate_reply: str):
+    """
+    Streaming version of chat_interview_logic.
+    Yields {"token": str} for each piece of the reply, then one
+    {"is_finished": bool, "final_context": Optional[Dict]} event.
+    """
+    try:
+        async for token in interviewer_instance.astream_turn(candidate_reply):
+            yield {"token": token}
+        is_finished = interviewer_instance.is_finished
+    except Exception as e:
+        ai_response = f"Internal chat processing failure: {e}"
+        is_finished = True
+        print(f"[CRITICAL_PROCESS_ERROR] {ai_response}")
+        yield {"token": ai_response}
+
+    final_context: Optional[Dict[str, Any]] = None
+
+    if is_finished:
+        final_context = await interviewer_instance.aget_context_for_grading()
+        print("[FINALIZATION] Interview finished. Transcript prepared for external grading API call.")
+
+    yield {"is_finished": is_finished, "final_context": final_context}
@@ -0,0 +1,47 @@
+# ./Part3/llm_limits.py
+
+# Shared limit on concurrent Groq requests from the interviewer and the grader.
+# Every async ChatGroq call goes through GROQ_SEM, so many parallel sessions queue here
+# instead of bursting into the API's rate limits; a request that is still rate limited
+# is retried after a jittered exponential backoff. The async ChatGroq clients also share one
+# HTTP connection pool (GROQ_ASYNC_HTTP_CLIENT).
+
+import os
+import sys
+import random
+import asyncio
+import importlib.util
+import httpx
+
+# Allow importing config.py from project root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import config
+
+GROQ_SEM = asyncio.Semaphore(config.GROQ_CONCURRENCY)
+
+# HTTP/2 needs the optional h2 package; without it the shared client still pools HTTP/1.1 connections
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Passed to every async ChatGroq (interviewer and grader) so their requests reuse open TLS connections
+# and, with HTTP/2, are multiplexed over the same connection
+GROQ_ASYNC_HTTP_CLIENT = httpx.AsyncClient(
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_keepalive_connections=config.GROQ_KEEPALIVE_CONNECTIONS),
+)
+
+
+async def ainvoke_limited(runnable, messages):
+    """Invoke a LangChain runnable under GROQ_SEM, retrying rate-limited requests with backoff."""
+    import groq
+
+    for attempt in range(config.GROQ_RATE_LIMIT_RETRIES):
+        try:
+            async with GROQ_SEM:
+                return await runnable.ainvoke(messages)
+        except groq.RateLimitError:
+            if attempt == config.GROQ_RATE_LIMIT_RETRIES - 1:
+                raise
+            # Full jitter, so requests limited at the same moment don't all retry together
+            delay = random.uniform(0, config.GROQ_BACKOFF_BASE * 2 ** attempt)
+            print(f"[WARNING] Groq rate limit hit. Retrying in {delay:.1f}s...")
+            await asyncio.sleep(delay)
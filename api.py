@@ -2,26 +2,37 @@
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query
 from pydantic import BaseModel
-import tempfile, json, os, uuid
+import tempfile, os, secrets
+import contextlib
+import importlib.util
+import orjson
 from typing import Dict, Any, Optional 
 # from fastapi.middleware.cors import CORSMiddleware
 # from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Response, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
+import shutil
+import anyio
 # from pydantic import BaseModel
 # import tempfile, json, uuid, traceback, os
 # from typing import Dict, Any, Optional
 # import edge_tts
-import traceback
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 
+import config
+from session_store import InterviewSessionStore
 # Import all logic functions from main.py
 from main import (
     TRANSCRIPT_FILE, parse_resume_logic, parse_job_logic, 
-    match_logic, quiz_logic, start_interview_logic, chat_interview_logic,
-    evaluate_candidate 
+    match_logic_from_dicts, quiz_logic_from_dict, start_interview_logic, chat_interview_logic,
+    stream_interview_logic, evaluate_candidate 
 )
 
 # Create FastAPI app instance FIRST
-app = FastAPI(title="Resume–Job Matching API")
+# Responses are serialized with orjson instead of the stdlib json encoder
+app = FastAPI(title="Resume–Job Matching API", default_response_class=ORJSONResponse)
 
 # THEN add CORS middleware configuration for frontend
 app.add_middleware(
@@ -33,13 +44,81 @@ app.add_middleware(
     allow_headers=["*"],              # Allow all headers
 )
 
-# --- GLOBAL IN-MEMORY CACHE FOR INTERVIEW SESSIONS ---
-INTERVIEW_SESSIONS = {}
+# --- COMPRESSION ---
+# JSON responses (matches, quizzes, final interview context) are compressed with brotli if
+# brotli-asgi is installed (it falls back to gzip for clients without br), otherwise with gzip.
+# The SSE endpoint is left alone: the compressor would hold back the small token events
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli_asgi") is not None
+if BROTLI_AVAILABLE:
+    from brotli_asgi import BrotliMiddleware as _CompressionMiddleware
+    _COMPRESSION_OPTIONS = {"quality": 4, "minimum_size": config.API_COMPRESSION_MIN_SIZE}
+else:
+    from fastapi.middleware.gzip import GZipMiddleware as _CompressionMiddleware
+    _COMPRESSION_OPTIONS = {"compresslevel": 5, "minimum_size": config.API_COMPRESSION_MIN_SIZE}
+
+UNCOMPRESSED_PATHS = {"/interview/chat/stream"}
+
+class CompressionMiddleware(_CompressionMiddleware):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(CompressionMiddleware, **_COMPRESSION_OPTIONS)
+
+# --- LOGGING ---
+# Request handlers only put log records on a queue; a background thread (started with the app)
+# writes them to stderr, so no request waits on console I/O
+_LOG_QUEUE = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[QueueHandler(_LOG_QUEUE)])
+_LOG_LISTENER = QueueListener(_LOG_QUEUE, logging.StreamHandler())
+log = logging.getLogger("api")
+
+@app.on_event("startup")
+async def start_log_listener():
+    _LOG_LISTENER.start()
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    _LOG_LISTENER.stop()
+
+# --- WORKER THREADS ---
+# The parsing, matching and quiz endpoints run their synchronous (LLM-bound) logic in the threadpool
+# so the event loop stays free; the pool is sized for many concurrent, mostly waiting, requests
+@app.on_event("startup")
+async def size_threadpool():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = config.API_THREADPOOL_SIZE
+
+# --- SHARED GROQ HTTP CLIENT ---
+# Every interview turn and grading call goes through one pooled client (Part3/llm_limits.py), so
+# concurrent requests reuse open TLS connections; it is exposed on app.state and closed on shutdown
+@app.on_event("startup")
+async def open_groq_client():
+    try:
+        from Part3.llm_limits import GROQ_ASYNC_HTTP_CLIENT
+    except ImportError:
+        app.state.http = None
+        return
+    app.state.http = GROQ_ASYNC_HTTP_CLIENT
+
+@app.on_event("shutdown")
+async def close_groq_client():
+    if getattr(app.state, "http", None) is not None:
+        await app.state.http.aclose()
+
+# --- INTERVIEW SESSIONS (in memory, or in Redis if SESSION_REDIS_URL is set) ---
+INTERVIEW_SESSIONS = InterviewSessionStore()
+
+@app.get("/metrics")
+async def metrics():
+    """Live interview session counts for this worker."""
+    return {"interview_sessions": INTERVIEW_SESSIONS.stats}
 
 # --- Pydantic models ---
 class InterviewStartInput(BaseModel):
-    job_description_json: str
-    resume_json: str
+    job_description: Dict[str, Any]
+    resume: Dict[str, Any]
 
 class InterviewChatInput(BaseModel):
     session_id: str
@@ -51,6 +130,20 @@ class InterviewResponse(BaseModel):
     is_finished: bool = False
     final_context: Optional[Dict[str, Any]] = None 
 
+def _interview_response(session_id: str, message: str, is_finished: bool = False,
+                        final_context: Optional[Dict[str, Any]] = None) -> ORJSONResponse:
+    """
+    Returns an InterviewResponse body as a ready-made response: FastAPI then skips the model
+    validation and jsonable_encoder pass it would otherwise run on every chat turn.
+    InterviewResponse stays the documented response_model.
+    """
+    return ORJSONResponse({
+        "session_id": session_id,
+        "message": message,
+        "is_finished": is_finished,
+        "final_context": final_context,
+    })
+
 
 # @app.get("/api/voice")
 # async def stream_voice(text: str = Query(..., description="Text to convert to speech"), voice: str = Query("en-US-AriaNeural", description="Voice name")):
@@ -90,9 +183,9 @@ async def grade_transcript(data: GradingInput):
     """
     try:
         # Assuming the KeyErrors are fixed in interviewer.py, this should now succeed
-        evaluation_result = evaluate_candidate(data.transcript_context)
+        evaluation_result = await evaluate_candidate(data.transcript_context)
         
-        print("[API] Grading completed successfully.")
+        log.info("[API] Grading completed successfully.")
         return {
             "status": "Grading Complete",
             "evaluation": evaluation_result
@@ -100,9 +193,7 @@ async def grade_transcript(data: GradingInput):
     except NotImplementedError:
         raise HTTPException(status_code=501, detail="Grading feature is not implemented (Part3/grader.py not found).")
     except Exception as e:
-        # This traceback call is now safe
-        traceback.print_exc() 
-        print(f"[ERROR] Grading failed: {e}")
+        log.exception(f"[ERROR] Grading failed: {e}")
         # This will send the error detail back to the client
         raise HTTPException(status_code=500, detail=f"Internal server error during grading: {e}")
 
@@ -113,26 +204,16 @@ async def grade_transcript(data: GradingInput):
 
 @app.post("/interview/start", response_model=InterviewResponse)
 async def start_interview(data: InterviewStartInput):
-    try:
-        jd_data = json.loads(data.job_description_json)
-        resume_data = json.loads(data.resume_json)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON format for Job Description or Resume content.")
-
-    session_id = str(uuid.uuid4())
+    session_id = secrets.token_urlsafe(16)
 
     try:
-        first_message, interviewer_instance = start_interview_logic(jd_data, resume_data)
-        INTERVIEW_SESSIONS[session_id] = interviewer_instance
-
-        print(f"\n[API] Started new session: {session_id}")
-        return InterviewResponse(
-            session_id=session_id,
-            message=first_message,
-            is_finished=False
-        )
+        first_message, interviewer_instance = await run_in_threadpool(start_interview_logic, data.job_description, data.resume)
+        await INTERVIEW_SESSIONS.set(session_id, interviewer_instance)
+
+        log.info(f"[API] Started new session: {session_id}")
+        return _interview_response(session_id, first_message)
     except Exception as e:
-        print(f"[ERROR] Failed to start interview session: {e}")
+        log.exception(f"[ERROR] Failed to start interview session: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to start interview session: {e}")
 
 
@@ -141,74 +222,118 @@ async def continue_interview(data: InterviewChatInput):
     session_id = data.session_id
     candidate_reply = data.candidate_reply
 
-    if session_id not in INTERVIEW_SESSIONS:
+    interviewer_instance = await INTERVIEW_SESSIONS.get(session_id)
+    if interviewer_instance is None:
         raise HTTPException(status_code=404, detail="Interview session not found or has expired.")
 
-    interviewer_instance = INTERVIEW_SESSIONS[session_id]
-
     try:
-        ai_response, is_finished, final_context = chat_interview_logic(interviewer_instance, candidate_reply)
+        ai_response, is_finished, final_context = await chat_interview_logic(interviewer_instance, candidate_reply)
         
         if is_finished:
-            del INTERVIEW_SESSIONS[session_id]
-            print(f"[API] Finished and cleared session: {session_id}")
+            await INTERVIEW_SESSIONS.delete(session_id)
+            log.info(f"[API] Finished and cleared session: {session_id}")
+        else:
+            await INTERVIEW_SESSIONS.set(session_id, interviewer_instance)
 
-        return InterviewResponse(
-            session_id=session_id,
-            message=ai_response,
-            is_finished=is_finished,
-            final_context=final_context 
-        )
+        return _interview_response(session_id, ai_response, is_finished, final_context)
 
     except Exception as e:
-        print(f"[ERROR] Failed to continue chat turn for session {session_id}: {e}")
-        traceback.print_exc() 
-        if session_id in INTERVIEW_SESSIONS:
-            del INTERVIEW_SESSIONS[session_id]
+        log.exception(f"[ERROR] Failed to continue chat turn for session {session_id}: {e}")
+        await INTERVIEW_SESSIONS.delete(session_id)
         raise HTTPException(status_code=500, detail=f"Internal server error during chat turn: {e}")
 
+@app.post("/interview/chat/stream")
+async def continue_interview_stream(data: InterviewChatInput):
+    """
+    Same as /interview/chat, but the reply is streamed as Server-Sent Events while it is generated:
+    one `data: {"token": ...}` event per piece of text, then a final
+    `data: {"session_id": ..., "is_finished": ..., "final_context": ...}` event.
+    """
+    session_id = data.session_id
+    candidate_reply = data.candidate_reply
+
+    interviewer_instance = await INTERVIEW_SESSIONS.get(session_id)
+    if interviewer_instance is None:
+        raise HTTPException(status_code=404, detail="Interview session not found or has expired.")
+
+    async def event_stream():
+        try:
+            async for event in stream_interview_logic(interviewer_instance, candidate_reply):
+                if "is_finished" in event:
+                    event = {"session_id": session_id, **event}
+                    if event["is_finished"]:
+                        await INTERVIEW_SESSIONS.delete(session_id)
+                        log.info(f"[API] Finished and cleared session: {session_id}")
+                    else:
+                        await INTERVIEW_SESSIONS.set(session_id, interviewer_instance)
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+        except Exception as e:
+            log.exception(f"[ERROR] Failed to stream chat turn for session {session_id}: {e}")
+            await INTERVIEW_SESSIONS.delete(session_id)
+            yield b"data: " + orjson.dumps({'session_id': session_id, 'error': str(e), 'is_finished': True}) + b"\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 # ===================================================
 # EXISTING ENDPOINTS (Unchanged)
 # ===================================================
+# Uploads are copied to disk in 1 MiB chunks in a worker thread, never read into memory whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def _save_upload(upload: UploadFile, suffix: str) -> str:
+    """Copies an uploaded file into a named temp file and returns its path."""
+    def copy():
+        src = upload.file
+        src.seek(0)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            shutil.copyfileobj(src, tmp, UPLOAD_CHUNK_SIZE)
+            return tmp.name
+    return await run_in_threadpool(copy)
+
+@contextlib.asynccontextmanager
+async def tmp_upload(upload: Optional[UploadFile], suffix: str):
+    """Yields the upload saved to a temp file (None if there is no upload) and deletes the file afterwards."""
+    if not upload:
+        yield None
+        return
+    path = await _save_upload(upload, suffix)
+    try:
+        yield path
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
 @app.post("/parse/resume")
 async def parse_resume(file: UploadFile = File(...), job_file: UploadFile = None):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(await file.read())
-        resume_path = tmp.name
-
-    job_path = None
-    if job_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as tmpj:
-            tmpj.write(await job_file.read())
-            job_path = tmpj.name
-
-    data = parse_resume_logic(resume_path, job_path)
+    async with tmp_upload(file, ".pdf") as resume_path, tmp_upload(job_file, ".txt") as job_path:
+        data = await run_in_threadpool(parse_resume_logic, resume_path, job_path)
     return data
 
 @app.post("/parse/job")
 async def parse_job(file: UploadFile = File(...)):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as tmp:
-        tmp.write(await file.read())
-        job_path = tmp.name
-    data = parse_job_logic(job_path)
+    async with tmp_upload(file, ".txt") as job_path:
+        data = await run_in_threadpool(parse_job_logic, job_path)
     return data
 
+async def _read_json_upload(upload: UploadFile, name: str) -> Any:
+    """Parses a small JSON upload straight from the request body."""
+    try:
+        return orjson.loads(await upload.read())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON format for {name}.")
+
+# The JSON inputs are parsed in memory and passed through, with no temp file round-trip
 @app.post("/match")
 async def match(resume_json: UploadFile = File(...), job_json: UploadFile = File(...)):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as rtmp, \
-          tempfile.NamedTemporaryFile(delete=False, suffix=".json") as jtmp:
-        rtmp.write(await resume_json.read())
-        jtmp.write(await job_json.read())
-        r_path, j_path = rtmp.name, jtmp.name
-    data = match_logic(r_path, j_path)
+    resume_data = await _read_json_upload(resume_json, "resume")
+    job_data = await _read_json_upload(job_json, "job description")
+    data = await run_in_threadpool(match_logic_from_dicts, resume_data, job_data)
     return data
 
 @app.post("/quiz")
 async def generate_quiz(job_json: UploadFile = File(...), questions: int = Form(5)):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as tmp:
-        tmp.write(await job_json.read())
-        job_path = tmp.name
-    data = quiz_logic(job_path, questions)
+    job_data = await _read_json_upload(job_json, "job description")
+    data = await run_in_threadpool(quiz_logic_from_dict, job_data, questions)
     return data
 # from fastapi.middleware.cors import CORSMiddleware
 # from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Response, Query
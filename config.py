@@ -2,6 +2,8 @@
 
 import os
 import json
+import itertools
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -20,30 +22,113 @@ else:
     # Use a dummy key if nothing is found (prevents crash, but API calls will fail)
     GROQ_API_KEYS = ["MISSING_API_KEY"]
 
-# Current API key index (starts at 0)
-CURRENT_API_KEY_INDEX = 0
+# The key in use; starts at the first one and only moves on when it is reported as failed
+_CURRENT_API_KEY = GROQ_API_KEYS[0] if GROQ_API_KEYS else None
+# Positions of the next key to rotate to (wrapped modulo the number of keys)
+_API_KEY_ROTATION = itertools.count(1)
+
+# Guards key rotation when several threads hit a rate limit at the same time
+_API_KEY_LOCK = threading.Lock()
 
 # Function to get the current API key
 def get_current_api_key():
-    if not GROQ_API_KEYS:
-         return None
-    return GROQ_API_KEYS[CURRENT_API_KEY_INDEX]
+    return _CURRENT_API_KEY
 
 # Function to cycle to the next API key
-def cycle_api_key():
-    global CURRENT_API_KEY_INDEX
+# If failed_key is given and another thread has already rotated away from it,
+# the current key is returned instead of skipping over a fresh key
+def cycle_api_key(failed_key=None):
+    global _CURRENT_API_KEY
     if not GROQ_API_KEYS:
         return None
-    CURRENT_API_KEY_INDEX = (CURRENT_API_KEY_INDEX + 1) % len(GROQ_API_KEYS)
-    return get_current_api_key()
+    with _API_KEY_LOCK:
+        if failed_key is None or failed_key == _CURRENT_API_KEY:
+            _CURRENT_API_KEY = GROQ_API_KEYS[next(_API_KEY_ROTATION) % len(GROQ_API_KEYS)]
+        return _CURRENT_API_KEY
+
+# Round-robin over all keys, for concurrent requests (e.g. async batches): each call hands out
+# the next key, so simultaneous requests spread over the per-key rate limits. next() on a
+# count is atomic under the GIL, so no lock is needed
+_API_KEY_COUNTER = itertools.count()
+
+def next_api_key():
+    if not GROQ_API_KEYS:
+        return None
+    return GROQ_API_KEYS[next(_API_KEY_COUNTER) % len(GROQ_API_KEYS)]
 
 # Model settings
 MODEL_NAME = "moonshotai/kimi-k2-instruct-0905"
 TEMPERATURE = 0.2
 
+# Semantic cache settings (only used if sentence-transformers is installed)
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+# Entries kept per semantic cache namespace; the oldest are dropped beyond this
+SEMANTIC_CACHE_MAX_ENTRIES = 5000
+# The job description semantic cache is opt-in (set JD_SEMANTIC_CACHE=1); it compares the title
+# and the requirements part of the text, since postings often share their opening boilerplate
+JD_SEMANTIC_CACHE = os.getenv("JD_SEMANTIC_CACHE", "0") == "1"
+# The resume semantic cache is opt-in (set RESUME_SEMANTIC_CACHE=1) and uses a stricter threshold
+RESUME_SEMANTIC_CACHE = os.getenv("RESUME_SEMANTIC_CACHE", "0") == "1"
+RESUME_SEMANTIC_CACHE_THRESHOLD = 0.97
+# The match semantic cache is opt-in (set MATCH_SEMANTIC_CACHE=1); evaluations are reused only if
+# both the resume and the job description reach this similarity
+MATCH_SEMANTIC_CACHE = os.getenv("MATCH_SEMANTIC_CACHE", "0") == "1"
+MATCH_SEMANTIC_CACHE_THRESHOLD = 0.97
+# The match cache is segmented by job title, and each segment's threshold is adjusted by 0.01
+# every MATCH_SEMANTIC_CACHE_WINDOW lookups towards the target hit rate, within these bounds
+# (never looser than MATCH_SEMANTIC_CACHE_THRESHOLD)
+MATCH_SEMANTIC_CACHE_THRESHOLD_RANGE = (0.97, 0.99)
+MATCH_SEMANTIC_CACHE_TARGET_HIT_RATE = 0.3
+MATCH_SEMANTIC_CACHE_WINDOW = 100
+
 #--------------------------------------Part 2 Constants-------------------------------------
 # Quiz data directory
 QUIZ_DATA_DIR = "Part2/QuizData"
+# One JSON line per saved quiz (quiz_id, job_title, question_count), so listing quizzes
+# doesn't have to open every quiz file
+QUIZ_INDEX_FILE = os.path.join(QUIZ_DATA_DIR, "_index.jsonl")
+# Suffix of the candidate view saved next to each quiz (<quiz_id>.public.json: the questions
+# without the correct answers), so serving a quiz doesn't strip the answers on every load
+QUIZ_PUBLIC_SUFFIX = ".public.json"
+
+# Set once QUIZ_DATA_DIR is known to exist, so later saves skip the makedirs call
+_QUIZ_DIR_READY = False
+
+def ensure_quiz_dir():
+    global _QUIZ_DIR_READY
+    if not _QUIZ_DIR_READY:
+        os.makedirs(QUIZ_DATA_DIR, exist_ok=True)
+        _QUIZ_DIR_READY = True
 
 # Default number of questions per quiz
-DEFAULT_NUM_QUESTIONS = 10
\ No newline at end of file
+DEFAULT_NUM_QUESTIONS = 10
+#--------------------------------------Part 3 Constants-------------------------------------
+# Exact-match LLM response cache (llm_cache.py): entries kept in memory and their lifetime
+LLM_CACHE_SIZE = 256
+LLM_CACHE_TTL = 3600
+# Optional Redis URL (e.g. redis://localhost:6379/0) to share the cache between workers;
+# only used if the redis package is installed
+LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL")
+# Async Groq requests from the interview and grading code that may be in flight at once,
+# and how often a rate-limited request is retried (jittered exponential backoff from 1 s)
+GROQ_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "8"))
+GROQ_RATE_LIMIT_RETRIES = 4
+GROQ_BACKOFF_BASE = 1.0
+# Idle connections kept open in the shared Groq HTTP client
+GROQ_KEEPALIVE_CONNECTIONS = int(os.getenv("GROQ_KEEPALIVE_CONNECTIONS", "32"))
+# Interview sessions (session_store.py): idle sessions expire after this many seconds.
+# With SESSION_REDIS_URL (or REDIS_URL) set and the redis package installed, sessions are kept
+# in Redis, so any API worker can serve any session; run that Redis with
+# maxmemory-policy allkeys-lru so stale interviews are evicted first under memory pressure
+SESSION_TTL = int(os.getenv("SESSION_TTL", "1800"))
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL") or os.getenv("REDIS_URL")
+# Sessions each worker keeps already unpickled in front of Redis
+SESSION_LOCAL_CACHE_SIZE = 128
+# Cap on sessions held in process when Redis isn't used
+SESSION_MAX_LOCAL = int(os.getenv("SESSION_MAX_LOCAL", "10000"))
+#--------------------------------------API Constants-------------------------------------
+# Threads available to the API for synchronous endpoint logic (parsing, matching, quiz generation)
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "200"))
+# Responses smaller than this many bytes are sent uncompressed
+API_COMPRESSION_MIN_SIZE = 1024
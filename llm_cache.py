@@ -0,0 +1,114 @@
+# Exact-match cache for LLM responses
+#
+# Grading runs at temperature 0 and some interviewer prompts (warning re-ask, soft close) are
+# fully templated, so the same request can come back more than once. Responses are keyed by a
+# SHA-256 of the model, temperature and messages, and kept in an in-process LRU with a TTL.
+# If LLM_CACHE_REDIS_URL is set and the redis package is installed, entries are also shared
+# through Redis; Redis errors are treated as cache misses.
+
+import json
+import time
+import hashlib
+import threading
+import importlib.util
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import config
+
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+
+
+class LLMResponseCache:
+    """
+    LRU + TTL cache for JSON-serializable LLM results, optionally backed by Redis
+    """
+
+    def __init__(self, namespace: str, maxsize: int = None, ttl_seconds: int = None, redis_url: str = None):
+        self.namespace = namespace
+        self.maxsize = config.LLM_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl_seconds = config.LLM_CACHE_TTL if ttl_seconds is None else ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        redis_url = config.LLM_CACHE_REDIS_URL if redis_url is None else redis_url
+        self._redis = None
+        if redis_url and REDIS_AVAILABLE:
+            import redis.asyncio
+            self._redis = redis.asyncio.from_url(redis_url)
+
+    def make_key(self, model: str, messages: List[Any], temperature: float) -> str:
+        """
+        Cache key for a request
+
+        Args:
+            model: Model name
+            messages: LangChain messages (type and content are used)
+            temperature: Sampling temperature
+        """
+        payload = {
+            "model": model,
+            "temperature": temperature,
+            "messages": [[getattr(m, "type", ""), getattr(m, "content", m)] for m in messages],
+        }
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return f"llm:{self.namespace}:{digest}"
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(key)
+            except Exception as e:
+                print(f"[WARNING] LLM cache: Redis lookup failed: {e}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._remember(key, value, now)
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Cache a JSON-serializable value."""
+        self._remember(key, value, time.time())
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, json.dumps(value, ensure_ascii=False), ex=self.ttl_seconds)
+            except Exception as e:
+                print(f"[WARNING] LLM cache: Redis store failed: {e}")
+
+    def _remember(self, key: str, value: Any, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since start-up."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "size": len(self._entries),
+            }
@@ -4,9 +4,12 @@ import argparse
 import os
 import sys
 import json
+import orjson
 import datetime
 from typing import Dict, Any, List, Optional 
 
+import config
+
 # ===================================================
 # 1. PATH SETUP – ensures modules load
 # ===================================================
@@ -29,13 +32,16 @@ if PART3_DIR not in sys.path:
 
 # Part 3 Imports 
 try:
-    from Part3.interviewer import start_interview_logic, chat_interview_logic, InterviewerBot 
+    from Part3.interviewer import start_interview_logic, chat_interview_logic, stream_interview_logic, InterviewerBot 
     from Part3.grader import evaluate_candidate 
 except ImportError as e:
     print(f"[WARNING] Could not import Part3 modules. Interview pipeline will fail: {e}")
     def start_interview_logic(*args, **kwargs): return None, None 
-    def chat_interview_logic(*args, **kwargs): return "Error: Part3 not loaded.", True, None
-    def evaluate_candidate(*args, **kwargs): raise NotImplementedError("Part3 modules not found.")
+    async def chat_interview_logic(*args, **kwargs): return "Error: Part3 not loaded.", True, None
+    async def stream_interview_logic(*args, **kwargs):
+        yield {"token": "Error: Part3 not loaded."}
+        yield {"is_finished": True, "final_context": None}
+    async def evaluate_candidate(*args, **kwargs): raise NotImplementedError("Part3 modules not found.")
     class InterviewerBot: pass 
 
 # Part 1/2 Imports 
@@ -62,12 +68,12 @@ TRANSCRIPT_FILE = "interview_transcript.json"
 def load_data(file_path):
     """Helper to safely load JSON data"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
             return json.dumps(data, indent=4), data 
     except FileNotFoundError:
         return None, None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"[ERROR] Failed to parse JSON in: {file_path}")
         return None, None
 
@@ -90,39 +96,38 @@ def parse_job_logic(job_path):
     data = convert_job_description_to_json(job_path)
     return data
 
+def match_logic_from_dicts(resume_data, job_data, overall=70, skill=65, exp=60):
+    return evaluate_match_from_json(resume_data, job_data, overall, skill, exp)
+
 def match_logic(resume_json_path, job_json_path, overall=70, skill=65, exp=60):
     if not os.path.exists(resume_json_path):
         raise FileNotFoundError(f"Resume JSON not found: {resume_json_path}")
     if not os.path.exists(job_json_path):
         raise FileNotFoundError(f"Job JSON not found: {job_json_path}")
-    with open(resume_json_path, encoding="utf-8") as r, open(job_json_path, encoding="utf-8") as j:
-        resume_data, job_data = json.load(r), json.load(j)
-    result = evaluate_match_from_json(resume_data, job_data, overall, skill, exp)
-    return result
+    with open(resume_json_path, 'rb') as r, open(job_json_path, 'rb') as j:
+        resume_data, job_data = orjson.loads(r.read()), orjson.loads(j.read())
+    return match_logic_from_dicts(resume_data, job_data, overall, skill, exp)
 
-def quiz_logic(job_json_path, questions=5):
-    if not os.path.exists(job_json_path):
-        raise FileNotFoundError(f"Job JSON not found: {job_json_path}")
-    with open(job_json_path, encoding="utf-8") as f:
-        job_data = json.load(f)
+def quiz_logic_from_dict(job_data, questions=5):
     generator = JobTestGenerator()
     quiz_id = generator.generate_quiz_from_json(job_data, questions)
     
-    quiz_dir = os.path.join(BASE_DIR, "Part2", "QuizData")
-    quiz_files = [f for f in os.listdir(quiz_dir) if f.endswith(f"{quiz_id}.json")]
-    
-    if not quiz_files:
-         quiz_files = [f for f in os.listdir(quiz_dir) if f.startswith(f"quiz_{job_data.get('Title', 'job')}") and f.endswith(".json")]
-    
-    if not quiz_files:
+    # Both generators save the quiz as <QUIZ_DATA_DIR>/<quiz_id>.json, so no directory scan is needed
+    quiz_file = os.path.join(config.QUIZ_DATA_DIR, f"{quiz_id}.json")
+    if not os.path.exists(quiz_file):
         raise FileNotFoundError(f"Quiz file not found after generation for ID: {quiz_id}")
 
-    quiz_file = os.path.join(quiz_dir, quiz_files[0])
-
-    with open(quiz_file, encoding="utf-8") as f:
-        quiz_data = json.load(f)
+    with open(quiz_file, 'rb') as f:
+        quiz_data = orjson.loads(f.read())
     return quiz_data
 
+def quiz_logic(job_json_path, questions=5):
+    if not os.path.exists(job_json_path):
+        raise FileNotFoundError(f"Job JSON not found: {job_json_path}")
+    with open(job_json_path, 'rb') as f:
+        job_data = orjson.loads(f.read())
+    return quiz_logic_from_dict(job_data, questions)
+
 
 # ===================================================
 # 5. INTERVIEW PIPELINE FUNCTION (Deprecated for chat mode)
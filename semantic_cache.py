@@ -0,0 +1,174 @@
+# Semantic (embedding similarity) cache for LLM outputs on near-duplicate inputs
+#
+# The exact-match caches only help when the input text is byte-for-byte identical.
+# This cache embeds the input with a small local sentence-transformers model and
+# returns a previously computed result when the cosine similarity to a cached input
+# is above a threshold. It is optional: if numpy / sentence-transformers are not
+# installed, or the temp directory does not exist, every lookup is a miss.
+
+import os
+import copy
+import json
+import hashlib
+import tempfile
+import threading
+import importlib.util
+from typing import Dict, Any, List, Optional
+
+import config
+
+# Check for the optional dependencies without importing them: sentence-transformers
+# pulls in torch, which would add seconds to the import time of every module using the cache
+SEMANTIC_CACHE_AVAILABLE = all(
+    importlib.util.find_spec(module) is not None
+    for module in ("numpy", "sentence_transformers")
+)
+
+# Root folder for persisted semantic cache data (one sub-folder per namespace)
+SEMANTIC_CACHE_DIR = os.path.join("temp", "cache", "semantic")
+
+# The model only reads its first 256 word pieces, so longer texts are embedded in windows of
+# this many words and the window embeddings are averaged, letting the end of a text count too
+EMBED_CHUNK_WORDS = 150
+
+# The embedding model is loaded lazily on first use and shared by all caches
+_MODEL = None
+
+def _get_model():
+    global _MODEL
+    if _MODEL is None:
+        from sentence_transformers import SentenceTransformer
+        _MODEL = SentenceTransformer(config.SEMANTIC_CACHE_MODEL)
+    return _MODEL
+
+
+def _digest(embeddings) -> str:
+    """Digest of an embedding matrix, stored in entries.json to check that both files belong together"""
+    return hashlib.blake2b(embeddings.tobytes(), digest_size=16).hexdigest()
+
+def _write_atomic(file_path: str, write) -> None:
+    """Call write(f) on a temp file next to file_path, then rename it over file_path"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache persisted under temp/cache/semantic/<namespace>/
+    """
+
+    def __init__(self, namespace: str, threshold: float = None):
+        self.namespace = namespace
+        self.threshold = config.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.cache_dir = os.path.join(SEMANTIC_CACHE_DIR, namespace)
+        self._embeddings = None  # float32 matrix [N, d] of normalized embeddings
+        self._entries: List[Dict[str, Any]] = []
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        # Same rule as the exact-match caches: only cache if temp directory exists
+        return SEMANTIC_CACHE_AVAILABLE and os.path.isdir("temp")
+
+    def embed(self, text: str):
+        """
+        Embed text as a normalized float32 vector (the normalized mean of its window embeddings)
+
+        Returns:
+            The embedding, or None if the cache is disabled
+        """
+        if not self.enabled:
+            return None
+        import numpy as np
+        words = text.split()
+        chunks = [" ".join(words[i:i + EMBED_CHUNK_WORDS]) for i in range(0, len(words), EMBED_CHUNK_WORDS)] or [""]
+        embedding = _get_model().encode(chunks, normalize_embeddings=True).mean(axis=0)
+        return (embedding / (np.linalg.norm(embedding) or 1.0)).astype(np.float32)
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        embeddings_file = os.path.join(self.cache_dir, "embeddings.npy")
+        entries_file = os.path.join(self.cache_dir, "entries.json")
+        if os.path.exists(embeddings_file) and os.path.exists(entries_file):
+            import numpy as np
+            # An unreadable, truncated or mismatched pair of files is treated as an empty cache.
+            # entries.json is written last and records a digest of the embeddings it belongs to,
+            # so a crash between the two writes can't pair entries with the wrong embeddings
+            try:
+                with open(entries_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                embeddings = np.load(embeddings_file)
+                if data["embeddings_digest"] != _digest(embeddings):
+                    return
+                entries = data["entries"]
+            except (OSError, ValueError, EOFError, KeyError, TypeError) as e:
+                print(f"[WARNING] Ignoring unreadable semantic cache '{self.namespace}': {e}")
+                return
+            if len(entries) == len(embeddings):
+                self._entries = entries
+                self._embeddings = embeddings
+
+    def lookup(self, embedding) -> Optional[Dict[str, Any]]:
+        """
+        Find the cached result whose input is most similar to the given embedding
+
+        Args:
+            embedding: Embedding returned by embed()
+
+        Returns:
+            A copy of the cached result if the best similarity reaches the threshold, otherwise None
+        """
+        if embedding is None:
+            return None
+        with self._lock:
+            self._load()
+            embeddings, entries = self._embeddings, self._entries
+        if embeddings is None or not len(entries):
+            return None
+
+        import numpy as np
+        # Embeddings are normalized, so one matrix-vector product gives all cosine similarities
+        scores = embeddings @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return copy.deepcopy(entries[best])
+        return None
+
+    def add(self, embedding, value: Dict[str, Any]) -> None:
+        """
+        Add a result to the cache and persist it
+
+        Args:
+            embedding: Embedding returned by embed() for the input that produced value
+            value: The result to cache
+        """
+        if embedding is None:
+            return
+        import numpy as np
+        with self._lock:
+            self._load()
+            row = embedding.reshape(1, -1)
+            # Build new objects rather than mutating, so concurrent lookups see a consistent pair
+            embeddings = row if self._embeddings is None else np.vstack([self._embeddings, row])
+            entries = self._entries + [copy.deepcopy(value)]
+            # Keep only the newest SEMANTIC_CACHE_MAX_ENTRIES entries
+            self._embeddings = embeddings[-config.SEMANTIC_CACHE_MAX_ENTRIES:]
+            self._entries = entries[-config.SEMANTIC_CACHE_MAX_ENTRIES:]
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _write_atomic(os.path.join(self.cache_dir, "embeddings.npy"),
+                          lambda f: np.save(f, self._embeddings))
+            entries_json = json.dumps({
+                "embeddings_digest": _digest(self._embeddings),
+                "entries": self._entries
+            }, ensure_ascii=False).encode("utf-8")
+            _write_atomic(os.path.join(self.cache_dir, "entries.json"), lambda f: f.write(entries_json))
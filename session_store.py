@@ -0,0 +1,117 @@
+# Store for live interview sessions (InterviewerBot instances)
+#
+# Without Redis, sessions are kept in this process and expire after SESSION_TTL seconds of
+# inactivity, so abandoned interviews don't accumulate; at most SESSION_MAX_LOCAL of them are kept,
+# the least recently active dropping out first. If SESSION_REDIS_URL is set and the redis
+# package is installed, each session is pickled into Redis under "sess:<session_id>" with the same
+# TTL, which lets several API workers share the sessions. Each worker also keeps its most recently
+# used sessions unpickled; a cached bot is reused only while Redis still holds exactly the bytes it
+# was stored as, so a turn served by another worker is never missed.
+
+import time
+import pickle
+import threading
+import importlib.util
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import config
+
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+
+
+class InterviewSessionStore:
+    """
+    Session ID -> interviewer bot, in memory or in Redis, with an idle TTL
+    """
+
+    def __init__(self, redis_url: str = None, ttl_seconds: int = None, local_cache_size: int = None,
+                 max_sessions: int = None):
+        self.ttl_seconds = config.SESSION_TTL if ttl_seconds is None else ttl_seconds
+        self.local_cache_size = config.SESSION_LOCAL_CACHE_SIZE if local_cache_size is None else local_cache_size
+        self.max_sessions = config.SESSION_MAX_LOCAL if max_sessions is None else max_sessions
+        # session_id -> (expires_at, bot); every set moves the session to the end, so the order is
+        # also the expiry order and the oldest sessions are always at the front
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._unpickled: "OrderedDict[str, tuple]" = OrderedDict()  # Redis mode: session_id -> (raw, bot)
+        self._lock = threading.Lock()
+
+        redis_url = config.SESSION_REDIS_URL if redis_url is None else redis_url
+        self._redis = None
+        if redis_url and REDIS_AVAILABLE:
+            import redis.asyncio
+            self._redis = redis.asyncio.from_url(redis_url)
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"sess:{session_id}"
+
+    async def get(self, session_id: str) -> Optional[Any]:
+        """Return the session's bot, or None if it doesn't exist or has expired."""
+        if self._redis is not None:
+            raw = await self._redis.get(self._key(session_id))
+            if raw is None:
+                with self._lock:
+                    self._unpickled.pop(session_id, None)
+                return None
+            with self._lock:
+                entry = self._unpickled.get(session_id)
+                if entry is not None and entry[0] == raw:
+                    self._unpickled.move_to_end(session_id)
+                    return entry[1]
+            bot = pickle.loads(raw)
+            self._remember(session_id, raw, bot)
+            return bot
+
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._sessions[session_id]
+                return None
+            return entry[1]
+
+    async def set(self, session_id: str, bot: Any) -> None:
+        """Store (or re-store after a turn) the session's bot and restart its TTL."""
+        if self._redis is not None:
+            raw = pickle.dumps(bot)
+            await self._redis.set(self._key(session_id), raw, ex=self.ttl_seconds)
+            self._remember(session_id, raw, bot)
+            return
+
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = (now + self.ttl_seconds, bot)
+            self._sessions.move_to_end(session_id)
+            # Drop sessions that were abandoned, then the least recently active beyond the cap
+            while self._sessions and next(iter(self._sessions.values()))[0] <= now:
+                self._sessions.popitem(last=False)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    async def delete(self, session_id: str) -> None:
+        """Remove a session (finished or failed)."""
+        with self._lock:
+            self._unpickled.pop(session_id, None)
+            self._sessions.pop(session_id, None)
+        if self._redis is not None:
+            await self._redis.delete(self._key(session_id))
+
+    def _remember(self, session_id: str, raw: bytes, bot: Any) -> None:
+        with self._lock:
+            self._unpickled[session_id] = (raw, bot)
+            self._unpickled.move_to_end(session_id)
+            while len(self._unpickled) > self.local_cache_size:
+                self._unpickled.popitem(last=False)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Where sessions are kept and how many this process holds."""
+        with self._lock:
+            return {
+                "backend": "redis" if self._redis is not None else "memory",
+                "local_sessions": len(self._unpickled) if self._redis is not None else len(self._sessions),
+                "ttl_seconds": self.ttl_seconds,
+            }
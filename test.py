@@ -2,6 +2,7 @@
 
 import requests
 import json
+import orjson
 import os
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -24,16 +25,16 @@ os.makedirs(OUT_DIR, exist_ok=True)
 def save_json(data: Dict[str, Any], name: str) -> str:
     """Saves JSON data to a file in OUT_DIR with a timestamp."""
     path = os.path.join(OUT_DIR, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     return path
 
 
-def load_json_file(file_path: str) -> Optional[str]:
-    """Helper to safely load JSON content from a file."""
+def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """Helper to safely load a JSON file into a dict."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         print(f"[ERROR] Required file not found: {file_path}")
         return None
@@ -130,17 +131,17 @@ def quiz(job_data):
 def run_pipeline_test_interactive():
     print("\n\n=== Running Full Interview Pipeline (INTERACTIVE Chat) ===")
     
-    jd_content_str = load_json_file(JD_JSON_PATH)
-    resume_content_str = load_json_file(RESUME_JSON_PATH)
+    jd_content = load_json_file(JD_JSON_PATH)
+    resume_content = load_json_file(RESUME_JSON_PATH)
     
-    if not jd_content_str or not resume_content_str:
+    if not jd_content or not resume_content:
         print("✗ Pipeline test skipped. One or both JSON files are missing or invalid.")
         return None
 
     # 1. START the Interview
     start_payload = {
-        "job_description_json": jd_content_str,
-        "resume_json": resume_content_str
+        "job_description": jd_content,
+        "resume": resume_content
     }
     
     session_id = None